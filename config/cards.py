@@ -31,6 +31,7 @@ CATTLE_DECK_CONFIG = {
 }
 
 # 动作A牌配置 (50张)
+# metadata.category 为事件牌类别（flood/drought/rockfall/tent），决定开局时放到哪条支路
 ACTION_A_DECK_CONFIG = {
     "card_type": "action_a",
     "total_count": 50,
@@ -39,49 +40,57 @@ ACTION_A_DECK_CONFIG = {
             "name": "水灾",
             "description": "水灾牌",
             "special_ability": "-1",
-            "count": 5
+            "count": 5,
+            "metadata": {"category": "flood"}
         },
         {
             "name": "水灾",
             "description": "水灾牌",
             "special_ability": "-2",
-            "count": 5
+            "count": 5,
+            "metadata": {"category": "flood"}
         },
         {
             "name": "旱灾",
             "description": "旱灾牌",
             "special_ability": "-1",
-            "count": 5
+            "count": 5,
+            "metadata": {"category": "drought"}
         },
         {
             "name": "旱灾",
             "description": "旱灾牌",
             "special_ability": "-2",
-            "count": 5
+            "count": 5,
+            "metadata": {"category": "drought"}
         },
         {
             "name": "落石",
             "description": "落石牌",
             "special_ability": "-1",
-            "count": 5
+            "count": 5,
+            "metadata": {"category": "rockfall"}
         },
         {
             "name": "落石",
             "description": "落石牌",
             "special_ability": "-2",
-            "count": 5
+            "count": 5,
+            "metadata": {"category": "rockfall"}
         },
         {
             "name": "蓝帐篷",
             "description": "蓝帐篷",
             "special_ability": "-1",
-            "count": 10
+            "count": 10,
+            "metadata": {"category": "tent"}
         },
         {
             "name": "绿帐篷",
             "description": "绿帐篷",
             "special_ability": "-2",
-            "count": 10
+            "count": 10,
+            "metadata": {"category": "tent"}
         }
     ]
 }
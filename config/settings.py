@@ -1,4 +1,6 @@
 import os
+import secrets
+import socket
 from pathlib import Path
 
 # 基础路径
@@ -6,6 +8,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # 数据库配置
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/data/great_western_trail.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 
 # 应用配置
 DEBUG = os.getenv("DEBUG", "True").lower() == "true"
@@ -19,4 +23,72 @@ DEFAULT_GAME_CONFIG = {
     "difficulty": "normal",
     "turn_time_limit": 90,
     "enable_auto_pass": True
-}
\ No newline at end of file
+}
+
+# 会话内存配置
+SESSION_IDLE_SECONDS = int(os.getenv("SESSION_IDLE_SECONDS", "300"))  # 空闲多久后休眠
+SESSION_MEMORY_BUDGET = int(os.getenv("SESSION_MEMORY_BUDGET", str(256 * 1024 * 1024)))  # 常驻会话内存预算（字节）
+SESSION_SNAPSHOT_TTL = int(os.getenv("SESSION_SNAPSHOT_TTL", "3600"))  # 休眠快照保留时间
+
+# 会话租约配置（多进程部署时每个会话只由持有租约的进程写入）
+SESSION_LEASE_MODE = os.getenv("SESSION_LEASE_MODE", "local")  # local：单进程/测试，本进程拥有全部会话；db：租约存数据库
+SESSION_LEASE_TTL = float(os.getenv("SESSION_LEASE_TTL", "30"))  # 租约有效期（秒），后台按三分之一间隔续约
+WORKER_ID = os.getenv("WORKER_ID", f"{socket.gethostname()}-{os.getpid()}")  # 本进程的租约持有者ID
+WORKER_ADDRESS = os.getenv("WORKER_ADDRESS", "")  # 本进程可被直接访问的地址（如 http://10.0.0.5:8001），用于重定向
+
+# 消息代理配置
+BROKER_BACKEND = os.getenv("BROKER_BACKEND", "memory")  # memory：进程内；sqlite：同一台机器上的多个进程共用事件表
+BROKER_SQLITE_PATH = os.getenv("BROKER_SQLITE_PATH", str(BASE_DIR / "data" / "broker.db"))
+BROKER_POLL_INTERVAL = float(os.getenv("BROKER_POLL_INTERVAL", "0.2"))  # sqlite 代理轮询间隔（秒）
+BROKER_RETENTION_SECONDS = float(os.getenv("BROKER_RETENTION_SECONDS", "60"))  # sqlite 事件表保留时间
+BROKER_QUEUE_SIZE = int(os.getenv("BROKER_QUEUE_SIZE", "256"))  # 每个订阅最多缓存的事件数量
+
+# 准入控制配置（过载时先拒绝可延后的请求，保证玩家行动的延迟）
+ADMISSION_LAG_INTERVAL = float(os.getenv("ADMISSION_LAG_INTERVAL", "0.1"))  # 事件循环延迟采样间隔（秒）
+ADMISSION_LAG_SOFT = float(os.getenv("ADMISSION_LAG_SOFT", "0.05"))  # 超过后拒绝可延后的请求
+ADMISSION_LAG_HARD = float(os.getenv("ADMISSION_LAG_HARD", "0.25"))  # 超过后只接受玩家行动
+ADMISSION_POOL_SOFT = float(os.getenv("ADMISSION_POOL_SOFT", "0.7"))  # 数据库连接池占用比例
+ADMISSION_POOL_HARD = float(os.getenv("ADMISSION_POOL_HARD", "0.9"))
+ADMISSION_SESSION_QUEUE = int(os.getenv("ADMISSION_SESSION_QUEUE", "8"))  # 单个会话同时处理中的请求上限
+
+# 游戏视图配置
+GAME_VIEW_LIMIT = int(os.getenv("GAME_VIEW_LIMIT", "1000"))  # 保留玩家视图和观战视图的会话数量上限
+# 完整游戏状态接口（GET /games/{id}?full=true 返回牌堆顺序和所有手牌，只用于管理和排查问题），默认关闭
+ADMIN_FULL_STATE = os.getenv("ADMIN_FULL_STATE", "false").lower() == "true"
+# 座位令牌签名密钥（玩家凭令牌获取本人视图和执行行动）
+# 所有服务进程必须使用相同的值，否则一个进程发放的令牌在其他进程和重启后都会失效；
+# 未设置时只适用于单进程（每次启动随机生成），SESSION_LEASE_MODE=db 时必须设置
+SEAT_TOKEN_SECRET = os.getenv("SEAT_TOKEN_SECRET") or secrets.token_hex(32)
+if SESSION_LEASE_MODE == "db" and not os.getenv("SEAT_TOKEN_SECRET"):
+    raise RuntimeError("SESSION_LEASE_MODE=db 时必须设置 SEAT_TOKEN_SECRET（所有服务进程使用相同的值）")
+
+# 匹配配置
+MATCHMAKING_INTERVAL = float(os.getenv("MATCHMAKING_INTERVAL", "1"))  # 匹配间隔（秒）
+MATCHMAKING_TABLE_SIZE = int(os.getenv("MATCHMAKING_TABLE_SIZE", "4"))  # 每桌目标人数
+MATCHMAKING_MIN_TABLE_SIZE = int(os.getenv("MATCHMAKING_MIN_TABLE_SIZE", "2"))  # 等待足够久后可接受的最少人数
+MATCHMAKING_SMALL_TABLE_WAIT = float(os.getenv("MATCHMAKING_SMALL_TABLE_WAIT", "30"))  # 等待多久后接受不满员的桌（秒）
+MATCHMAKING_BUCKET_WIDTH = int(os.getenv("MATCHMAKING_BUCKET_WIDTH", "50"))  # 积分分桶宽度
+MATCHMAKING_BASE_WINDOW = float(os.getenv("MATCHMAKING_BASE_WINDOW", "100"))  # 初始积分差范围
+MATCHMAKING_WINDOW_GROWTH = float(os.getenv("MATCHMAKING_WINDOW_GROWTH", "10"))  # 每等待一秒扩大的积分差范围
+MATCHMAKING_MAX_WINDOW = float(os.getenv("MATCHMAKING_MAX_WINDOW", "600"))  # 积分差范围上限
+DEFAULT_RATING = 1200  # 没有玩家记录时的积分
+
+# 开局池配置
+GAME_POOL_SIZE = int(os.getenv("GAME_POOL_SIZE", "0"))  # 预先创建的游戏数量，0 表示不启用
+GAME_POOL_REFILL_INTERVAL = float(os.getenv("GAME_POOL_REFILL_INTERVAL", "1"))  # 补充检查间隔（秒）
+
+# 牌堆配置
+DECK_SHUFFLE_ON_DRAW = os.getenv("DECK_SHUFFLE_ON_DRAW", "false").lower() == "true"  # 抽牌时才洗牌（增量 Fisher-Yates）
+
+# 游戏状态存储配置
+GAME_STATE_CODEC = os.getenv("GAME_STATE_CODEC", "zlib")  # json, zlib, zstd（zstd 需要安装 zstandard 并训练字典）
+GAME_STATE_ZLIB_LEVEL = int(os.getenv("GAME_STATE_ZLIB_LEVEL", "6"))
+GAME_STATE_ZSTD_DICT = os.getenv("GAME_STATE_ZSTD_DICT", str(BASE_DIR / "data" / "zstd" / "game_state.dict"))
+
+# 归档配置
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", str(BASE_DIR / "data" / "archive"))
+ARCHIVE_SEGMENT_SIZE = int(os.getenv("ARCHIVE_SEGMENT_SIZE", str(64 * 1024 * 1024)))  # 单个分段文件大小上限
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", "600"))  # 归档任务执行间隔（秒）
+
+# 性能监控配置
+SLOW_OPERATION_MS = float(os.getenv("SLOW_OPERATION_MS", "100"))  # 超过该耗时的操作写入性能日志
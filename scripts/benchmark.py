@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+引擎基础操作性能基准脚本
+
+运行各项基准并输出 JSON 结果，可与保存的基线比较，超过阈值的变慢视为性能回退。
+
+用法:
+    python scripts/benchmark.py                         # 运行并与基线比较
+    python scripts/benchmark.py --save-baseline         # 运行并保存为新基线
+    python scripts/benchmark.py --filter draw --threshold 0.3 --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.game_state import GameState
+from src.core.models.card_manager import CardManager
+from src.core.models.enums import ActionType, CardType, GamePhase, PlayerColor
+from src.core.models.player import PlayerState, ResourceSet
+from src.core.rules.validator import ActionValidator
+from src.core.setup_template import get_setup_template
+from src.services.catalog import static_catalog
+from src.services.matchmaking import MatchQueue
+from src.services.views import build_session_views
+
+BASELINE_PATH = Path(__file__).parent / "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # 中位数变慢超过25%视为回退
+
+# 基准名称 -> (准备函数, 被测函数)；准备函数在计时之外执行，每次迭代都重新准备
+BENCHMARKS: Dict[str, Tuple[Callable[[], Any], Callable[[Any], Any]]] = {}
+
+
+def benchmark(name: str, setup: Callable[[], Any] = lambda: None):
+    """注册基准"""
+    def decorator(func):
+        BENCHMARKS[name] = (setup, func)
+        return func
+    return decorator
+
+
+def new_game_state() -> GameState:
+    """创建两名玩家、处于玩家回合阶段的游戏状态"""
+    game_state = GameState(session_id="benchmark")
+    game_state.current_phase = GamePhase.PLAYER_TURN
+    game_state.players = [
+        PlayerState(
+            player_id=f"player_00{i}",
+            user_id=f"user_{i}",
+            player_color=color,
+            display_name=f"玩家{i}",
+            resources=ResourceSet(money=20)
+        )
+        for i, color in [(1, PlayerColor.RED), (2, PlayerColor.BLUE)]
+    ]
+    return game_state
+
+
+def new_initialized_state() -> GameState:
+    """创建地图和未来区已初始化的游戏状态"""
+    game_state = new_game_state()
+    game_state.initialize_map()
+    game_state.future_area.initialize(game_state.deck_manager)
+    game_state.board_state.available_locations = [8]
+    game_state.cattle_market = [{"card_id": "cattle_1", "cost": 3}]
+    return game_state
+
+
+# ---- 游戏状态 ----
+
+@benchmark("game_state.init")
+def bench_game_state_init(_):
+    GameState(session_id="benchmark")
+
+
+@benchmark("game_state.initialize_map", setup=new_game_state)
+def bench_initialize_map(game_state):
+    game_state.initialize_map()
+
+
+_shared_state = None
+
+
+def shared_state() -> GameState:
+    """只读基准共用的游戏状态"""
+    global _shared_state
+    if _shared_state is None:
+        _shared_state = new_initialized_state()
+    return _shared_state
+
+
+@benchmark("game_state.to_json", setup=shared_state)
+def bench_to_json(game_state):
+    game_state.to_json()
+
+
+@benchmark("game_state.from_json", setup=lambda: shared_state().to_json())
+def bench_from_json(game_state_json):
+    GameState.from_json(game_state_json)
+
+
+@benchmark("game_state.clone", setup=shared_state)
+def bench_clone(game_state):
+    game_state.clone()
+
+
+# ---- 游戏视图 ----
+
+def view_state(player_count: int) -> Dict[str, Any]:
+    """指定玩家人数、每人持有手牌的游戏状态字典"""
+    static_catalog.ensure_built()
+    game_state = new_initialized_state()
+    colors = list(PlayerColor)
+    game_state.players = [
+        PlayerState(player_id=f"player_00{i}", user_id=f"user_{i}", player_color=colors[i],
+                    display_name=f"玩家{i}", resources=ResourceSet(money=20))
+        for i in range(player_count)
+    ]
+    for player in game_state.players:
+        player.card_manager.hand_cards = [{"card_id": f"{player.player_id}_{n}", "base_value": n} for n in range(4)]
+    return game_state.to_dict()
+
+
+@benchmark("views.build.2_players", setup=lambda: view_state(2))
+def bench_views_2_players(state):
+    build_session_views("benchmark", state)
+
+
+@benchmark("views.build.4_players", setup=lambda: view_state(4))
+def bench_views_4_players(state):
+    build_session_views("benchmark", state)
+
+
+# ---- 匹配 ----
+
+def match_queue(player_count: int) -> MatchQueue:
+    """积分呈正态分布的排队玩家（固定随机种子）"""
+    import random
+
+    rng = random.Random(7)
+    queue = MatchQueue(clock=lambda: 0.0)
+    for index in range(player_count):
+        queue.add(f"user_{index}", f"玩家{index}", int(rng.gauss(1200, 200)))
+    return queue
+
+
+@benchmark("matchmaking.match.5000_players", setup=lambda: match_queue(5000))
+def bench_match_5000_players(queue):
+    queue.match()
+
+
+# ---- 牌堆 ----
+
+@benchmark("deck.draw", setup=lambda: new_game_state().deck_manager.get_deck(CardType.CATTLE))
+def bench_deck_draw(deck):
+    deck.draw(3)
+
+
+@benchmark("deck.create_and_draw", setup=lambda: get_setup_template().new_decks(shuffle_on_draw=False))
+def bench_deck_create_and_draw(decks):
+    decks[CardType.CATTLE].draw(3)
+
+
+@benchmark("deck.create_and_draw.shuffle_on_draw", setup=lambda: get_setup_template().new_decks(shuffle_on_draw=True))
+def bench_deck_create_and_draw_on_draw(decks):
+    decks[CardType.CATTLE].draw(3)
+
+
+def new_card_manager() -> CardManager:
+    """创建有抽牌堆和弃牌堆的卡牌管理器"""
+    cards = [{"card_id": f"card_{i}", "card_type": "cattle"} for i in range(14)]
+    return CardManager(draw_pile=cards[:2], discard_pile=cards[2:])
+
+
+@benchmark("card_manager.draw_cards", setup=new_card_manager)
+def bench_card_manager_draw(card_manager):
+    card_manager.draw_cards(4)
+
+
+def new_labor_market_state() -> GameState:
+    """创建 action_b 牌堆已创建的游戏状态（按需创建牌堆不计入填充耗时）"""
+    game_state = new_game_state()
+    game_state.deck_manager.get_deck(CardType.ACTION_B)
+    return game_state
+
+
+@benchmark("labor_market.fill_next_slot", setup=new_labor_market_state)
+def bench_fill_next_slot(game_state):
+    game_state.labor_market.fill_next_slot(game_state.deck_manager)
+
+
+def new_future_area_state() -> GameState:
+    """创建未来区已初始化的游戏状态"""
+    game_state = new_game_state()
+    game_state.future_area.initialize(game_state.deck_manager)
+    return game_state
+
+
+@benchmark("future_area.take_card", setup=new_future_area_state)
+def bench_take_card(game_state):
+    game_state.future_area.take_card(0, 0, game_state.deck_manager)
+
+
+# ---- 行动验证 ----
+
+VALIDATION_CASES = {
+    ActionType.MOVE: {"player_id": "player_001", "steps": 3, "target_location": 8},
+    ActionType.BUILD: {"player_id": "player_001", "location_id": 8, "building_type": "station"},
+    ActionType.HIRE_WORKER: {"player_id": "player_001", "worker_type": "craftsman"},
+    ActionType.BUY_CATTLE: {"player_id": "player_001", "card_id": "cattle_1"},
+    ActionType.PASS: {"player_id": "player_001"},
+}
+
+for _action_type, _action_data in VALIDATION_CASES.items():
+    benchmark(f"validator.{_action_type.value}", setup=lambda: ActionValidator(shared_state()))(
+        lambda validator, action_type=_action_type, action_data=_action_data:
+        validator.validate_action(action_type, action_data)
+    )
+
+
+def run_benchmark(name: str, min_time: float, max_iterations: int) -> Dict[str, Any]:
+    """运行一个基准，返回耗时统计（微秒）"""
+    setup, func = BENCHMARKS[name]
+    samples: List[float] = []
+    deadline = time.perf_counter() + min_time
+
+    while len(samples) < max_iterations and (len(samples) < 5 or time.perf_counter() < deadline):
+        state = setup()
+        start = time.perf_counter()
+        func(state)
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    samples.sort()
+    return {
+        "iterations": len(samples),
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(samples[0], 3),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1 if len(samples) >= 20 else -1], 3),
+    }
+
+
+def run_all(names: List[str], min_time: float, max_iterations: int) -> Dict[str, Any]:
+    """运行所有基准（屏蔽被测代码的打印输出）"""
+    results = {}
+    for name in names:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = run_benchmark(name, min_time, max_iterations)
+        print(f"  {name:<32} 中位数 {results[name]['median_us']:>12.2f}µs  "
+              f"最小 {results[name]['min_us']:>12.2f}µs  ({results[name]['iterations']}次)")
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """与基线比较，返回性能回退的基准名称"""
+    regressions = []
+    print(f"\n📊 与基线比较（阈值 {threshold:.0%}）:")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"  {name:<32} 基线中没有该基准")
+            continue
+
+        change = result["median_us"] / base["median_us"] - 1
+        regressed = change > threshold
+        marker = "❌" if regressed else "✅"
+        print(f"  {marker} {name:<30} {base['median_us']:>12.2f}µs -> {result['median_us']:>12.2f}µs ({change:+.1%})")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="引擎基础操作性能基准")
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的基准")
+    parser.add_argument("--output", help="结果输出文件（JSON）")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="基线文件")
+    parser.add_argument("--save-baseline", action="store_true", help="将结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="回退阈值（比例）")
+    parser.add_argument("--min-time", type=float, default=0.5, help="每个基准的最短运行时间（秒）")
+    parser.add_argument("--max-iterations", type=int, default=10000, help="每个基准的最大迭代次数")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    print(f"🚀 运行 {len(names)} 个基准")
+    current = run_all(names, args.min_time, args.max_iterations)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2, ensure_ascii=False))
+        print(f"📁 结果已保存: {args.output}")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(current, indent=2, ensure_ascii=False))
+        print(f"✅ 基线已保存: {args.baseline}")
+        return 0
+
+    if not Path(args.baseline).exists():
+        print(f"⚠️ 基线不存在: {args.baseline}，使用 --save-baseline 创建")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} 个基准性能回退: {', '.join(regressions)}")
+        return 1
+
+    print("\n✅ 没有性能回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+本地HTTP压力测试脚本
+
+模拟多局并发游戏，完整走创建、加入、开始和行动接口，报告吞吐量、各接口延迟分位数、
+错误率以及服务端的数据库指标（来自 /metrics）。
+默认在本机用临时 SQLite 文件启动 src.main:app，也可以用 --base-url 指向已运行的服务。
+需要安装 httpx（包含在开发依赖中：pip install -e ".[dev]"）。
+
+用法:
+    python scripts/load_test.py --games 50 --turns 20 --ramp-up 30
+    python scripts/load_test.py --base-url http://127.0.0.1:8000 --games 10 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 每个回合的行动组合及权重：(名称, 权重)
+TURN_MIX = [
+    ("move_then_pass", 50),  # 逐个提交：移动后结束回合
+    ("batch_turn", 30),  # 一次提交整个回合
+    ("hire_then_pass", 10),  # 雇佣工人后结束回合
+    ("build_then_pass", 10),  # 建造（位置可能不可用，会被拒绝）后结束回合
+]
+
+# 报告中包含的服务端指标
+SERVER_METRICS = [
+    "repository_operation_seconds_sum",
+    "repository_operation_seconds_count",
+    "game_state_from_json_seconds_count",
+    "database_lock_errors_total",
+]
+
+
+class LoadStats:
+    """请求统计"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.games_finished = 0
+        self.games_failed = 0
+
+    def record(self, endpoint: str, status: str, latency: float) -> None:
+        self.latencies[endpoint].append(latency)
+        self.statuses[endpoint][status] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """汇总统计结果"""
+        endpoints = {}
+        total_requests = 0
+        total_errors = 0
+        for endpoint, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            statuses = dict(self.statuses[endpoint])
+            errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "4")))
+            rejected = sum(count for status, count in statuses.items() if status.startswith("4"))
+            total_requests += len(latencies)
+            total_errors += errors
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+                "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+                "error_rate": round(errors / len(latencies), 4),
+                "rejected_rate": round(rejected / len(latencies), 4),
+                "statuses": statuses,
+            }
+
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": total_requests,
+            "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0,
+            "games_finished": self.games_finished,
+            "games_failed": self.games_failed,
+            "endpoints": endpoints,
+        }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """分位数（最近秩）"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class GameClient:
+    """模拟一局游戏的客户端"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats, args, game_index: int):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.game_index = game_index
+        self.rng = random.Random(args.seed + game_index)
+
+    async def request(self, method: str, endpoint: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """发送请求并记录延迟，连接错误记为 transport_error"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, "transport_error", time.perf_counter() - start)
+            return None
+        self.stats.record(endpoint, str(response.status_code), time.perf_counter() - start)
+        return response
+
+    async def think(self) -> None:
+        """模拟玩家思考时间"""
+        await asyncio.sleep(self.rng.uniform(self.args.think_min, self.args.think_max) / 1000)
+
+    async def play(self) -> None:
+        """完整进行一局游戏"""
+        players = self.rng.randint(2, self.args.max_players)
+        users = [f"load_{self.game_index}_{i}" for i in range(players)]
+
+        response = await self.request("POST", "POST /lobby/sessions", "/lobby/sessions", json={
+            "creator_id": users[0], "session_name": f"压测_{self.game_index}", "max_players": players
+        })
+        if response is None or response.status_code != 200:
+            self.stats.games_failed += 1
+            return
+        created = response.json()
+        session_id = created["session_id"]
+        # 按加入顺序记录每个座位的玩家ID和座位令牌（与视图中的 seat 对应）
+        seats = [(created["players"][0]["player_id"], created["seat_token"])]
+
+        for user in users[1:]:
+            await self.think()
+            response = await self.request("POST", "POST /lobby/sessions/{id}/join",
+                                          f"/lobby/sessions/{session_id}/join",
+                                          json={"user_id": user, "display_name": user})
+            if response is not None and response.status_code == 200:
+                joined = response.json()
+                seats.append((joined["player_id"], joined["seat_token"]))
+
+        response = await self.request("POST", "POST /lobby/sessions/{id}/start", f"/lobby/sessions/{session_id}/start",
+                                      json={"user_id": users[0]})
+        if response is None or response.status_code != 200:
+            self.stats.games_failed += 1
+            return
+
+        for _ in range(self.args.turns):
+            response = await self.request("GET", "GET /games/{id}", f"/games/{session_id}")
+            if response is None or response.status_code != 200:
+                self.stats.games_failed += 1
+                return
+
+            game_state = response.json()["game_state"]
+            seat = game_state["current_player_index"]
+            await self.think()
+            await self.play_turn(session_id, game_state["players"][seat], *seats[seat])
+
+        self.stats.games_finished += 1
+
+    async def play_turn(self, session_id: str, player: Dict[str, Any], player_id: str, token: str) -> None:
+        """按行动组合执行一个回合（player 为观战视图中的玩家，行动需要该座位的令牌）"""
+        headers = {"X-Seat-Token": token}
+        steps = self.rng.randint(1, 3)
+        move = {"action_type": "move", "action_data": {
+            "player_id": player_id, "steps": steps, "target_location": player["position"] + steps
+        }}
+        pass_turn = {"action_type": "pass", "action_data": {"player_id": player_id}}
+
+        mix = self.rng.choices([name for name, _ in TURN_MIX], weights=[weight for _, weight in TURN_MIX])[0]
+        if mix == "batch_turn":
+            await self.request("POST", "POST /games/{id}/turn", f"/games/{session_id}/turn",
+                               json={"actions": [move, pass_turn]}, headers=headers)
+            return
+
+        if mix == "move_then_pass":
+            first = move
+        elif mix == "hire_then_pass":
+            first = {"action_type": "hire_worker", "action_data": {
+                "player_id": player_id, "worker_type": self.rng.choice(["craftsman", "engineer"])
+            }}
+        else:
+            first = {"action_type": "build", "action_data": {
+                "player_id": player_id, "location_id": self.rng.randint(1, 50), "building_type": "ranch"
+            }}
+
+        await self.request("POST", "POST /games/{id}/actions", f"/games/{session_id}/actions", json=first,
+                           headers=headers)
+        await self.think()
+        await self.request("POST", "POST /games/{id}/actions", f"/games/{session_id}/actions", json=pass_turn,
+                           headers=headers)
+
+
+async def scrape_metrics(client: httpx.AsyncClient) -> Dict[str, float]:
+    """读取服务端指标（按指标名汇总所有标签）"""
+    values: Dict[str, float] = defaultdict(float)
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return values
+
+    for line in response.text.splitlines():
+        match = re.match(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$", line)
+        if match and match.group(1) in SERVER_METRICS:
+            values[match.group(1)] += float(match.group(3))
+    return values
+
+
+async def run_load(args) -> Dict[str, Any]:
+    """运行压力测试"""
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        metrics_before = await scrape_metrics(client)
+        start = time.perf_counter()
+
+        async def start_game(index: int):
+            # 在 ramp_up 时间内均匀地开始各局游戏
+            await asyncio.sleep(args.ramp_up * index / max(1, args.games))
+            await GameClient(client, stats, args, index).play()
+
+        await asyncio.gather(*(start_game(index) for index in range(args.games)))
+        elapsed = time.perf_counter() - start
+        metrics_after = await scrape_metrics(client)
+
+    report = stats.report(elapsed)
+    delta = {name: metrics_after.get(name, 0) - metrics_before.get(name, 0) for name in SERVER_METRICS}
+    report["server"] = {
+        "repository_calls": int(delta["repository_operation_seconds_count"]),
+        "repository_mean_ms": round(delta["repository_operation_seconds_sum"]
+                                    / delta["repository_operation_seconds_count"] * 1000, 3)
+        if delta["repository_operation_seconds_count"] else 0,
+        "game_state_loads": int(delta["game_state_from_json_seconds_count"]),
+        "database_lock_errors": int(delta["database_lock_errors_total"]),
+    }
+    return report
+
+
+def spawn_server(args) -> subprocess.Popen:
+    """用临时 SQLite 文件在本机启动服务"""
+    data_dir = Path(tempfile.mkdtemp(prefix="gwt_load_"))
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{data_dir / 'load_test.db'}",
+        "ARCHIVE_DIR": str(data_dir / "archive"),
+        "DEBUG": "false",
+    }
+    print(f"🚀 启动服务: 127.0.0.1:{args.port}（数据目录 {data_dir}）")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_until_healthy(base_url: str, timeout: float = 30) -> bool:
+    """等待服务可用"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """打印报告"""
+    print(f"\n📊 共 {report['requests']} 个请求，耗时 {report['elapsed_seconds']}s，"
+          f"吞吐量 {report['throughput_rps']} req/s，错误率 {report['error_rate']:.2%}")
+    print(f"🎮 完成 {report['games_finished']} 局，失败 {report['games_failed']} 局")
+    print(f"\n{'接口':<34}{'请求数':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}{'错误率':>9}{'拒绝率':>9}")
+    for endpoint, data in report["endpoints"].items():
+        print(f"{endpoint:<36}{data['requests']:>8}{data['p50_ms']:>10.1f}{data['p90_ms']:>10.1f}"
+              f"{data['p99_ms']:>10.1f}{data['max_ms']:>10.1f}{data['error_rate']:>10.2%}{data['rejected_rate']:>10.2%}")
+
+    server = report["server"]
+    print(f"\n🗄️ 存储库调用 {server['repository_calls']} 次，平均 {server['repository_mean_ms']}ms，"
+          f"状态加载 {server['game_state_loads']} 次，数据库锁超时 {server['database_lock_errors']} 次")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="本地HTTP压力测试")
+    parser.add_argument("--base-url", help="已运行服务的地址，不指定时在本机启动服务")
+    parser.add_argument("--port", type=int, default=8765, help="本机启动服务的端口")
+    parser.add_argument("--games", type=int, default=20, help="并发游戏局数")
+    parser.add_argument("--max-players", type=int, default=4, help="每局最多玩家数（2到该值之间随机）")
+    parser.add_argument("--turns", type=int, default=10, help="每局进行的回合数")
+    parser.add_argument("--ramp-up", type=float, default=10, help="所有游戏在该时间内逐步开始（秒）")
+    parser.add_argument("--think-min", type=float, default=200, help="最短思考时间（毫秒）")
+    parser.add_argument("--think-max", type=float, default=1500, help="最长思考时间（毫秒）")
+    parser.add_argument("--connections", type=int, default=100, help="最大连接数")
+    parser.add_argument("--timeout", type=float, default=30, help="请求超时（秒）")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", help="结果输出文件（JSON）")
+    args = parser.parse_args(argv)
+
+    server = None
+    if not args.base_url:
+        args.base_url = f"http://127.0.0.1:{args.port}"
+        server = spawn_server(args)
+
+    try:
+        if not wait_until_healthy(args.base_url):
+            print(f"❌ 服务不可用: {args.base_url}")
+            return 1
+
+        print(f"🎯 {args.games} 局游戏，每局 {args.turns} 回合，{args.ramp_up}s 内逐步开始")
+        report = asyncio.run(run_load(args))
+        print_report(report)
+
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+            print(f"📁 结果已保存: {args.output}")
+
+        return 0 if report["error_rate"] == 0 else 1
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+训练游戏状态 zstd 字典脚本
+从数据库中读取已保存的游戏状态作为样本，训练字典后设置 GAME_STATE_CODEC=zstd 即可启用
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import GAME_STATE_ZSTD_DICT
+from src.storage.database import SessionLocal
+from src.storage.models import GameSession
+from src.storage.compression import train_zstd_dictionary
+
+
+def train(limit: int = 1000):
+    """使用最近的游戏状态训练字典"""
+    db = SessionLocal()
+    try:
+        sessions = db.query(GameSession).order_by(GameSession.created_at.desc()).limit(limit).all()
+        samples = [session.game_state for session in sessions if session.game_state]
+    finally:
+        db.close()
+
+    print(f"📊 样本数量: {len(samples)}")
+    if len(samples) < 10:
+        print("❌ 样本太少，无法训练字典")
+        return
+
+    codec = train_zstd_dictionary(samples, GAME_STATE_ZSTD_DICT)
+    print(f"✅ 字典已保存: {GAME_STATE_ZSTD_DICT} ({codec})")
+
+
+if __name__ == "__main__":
+    train()
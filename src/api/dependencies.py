@@ -0,0 +1,55 @@
+"""
+接口依赖
+- 准入控制：过载时按请求优先级尽早拒绝（429/503 并附带 Retry-After）
+- 会话写操作的租约检查：请求落到非持有者时重定向到持有租约的进程
+"""
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from src.services.admission import Priority, admission
+from src.services.session_lease import lease_manager
+from src.storage.database import get_db
+
+
+def require_session_owner(session_id: str, request: Request, db: Session = Depends(get_db)) -> None:
+    """
+    确保本进程持有会话租约
+
+    - 持有者登记了地址：307 重定向到持有者（保持请求方法和请求体）
+    - 持有者没有地址：503，Retry-After 为租约剩余时间
+    """
+    owner = lease_manager.check_owner(db, session_id)
+    if owner is None:
+        return
+
+    headers = {"X-Session-Owner": owner.owner_id}
+    if owner.address:
+        location = owner.address.rstrip("/") + request.url.path
+        if request.url.query:
+            location += f"?{request.url.query}"
+        headers["Location"] = location
+        raise HTTPException(status_code=307, detail="游戏会话由其他服务进程处理", headers=headers)
+
+    headers["Retry-After"] = str(owner.retry_after())
+    raise HTTPException(status_code=503, detail="游戏会话由其他服务进程处理，请稍后重试", headers=headers)
+
+
+def admit(priority: Priority):
+    """
+    创建准入控制依赖（放在路由依赖的第一位，在访问数据库之前判断）
+
+    路径中有 session_id 时同时限制该会话处理中的请求数量。
+    """
+    async def dependency(request: Request):
+        session_id = request.path_params.get("session_id")
+        rejection = admission.admit(priority, session_id)
+        if rejection is not None:
+            raise HTTPException(status_code=rejection.status_code, detail=rejection.reason,
+                                headers={"Retry-After": str(rejection.retry_after)})
+        try:
+            yield
+        finally:
+            admission.release(session_id)
+
+    return dependency
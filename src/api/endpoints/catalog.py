@@ -0,0 +1,34 @@
+"""
+静态目录接口
+提供带版本号的地图拓扑、牌原型和建筑物配置，内容不可变，可以被浏览器和CDN长期缓存
+"""
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from src.services.catalog import static_catalog
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+# 带版本号的资源内容不会变化
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("")
+def get_catalog_index(response: Response):
+    """目录索引：当前版本号和各资源地址（每次都需要重新验证）"""
+    response.headers["Cache-Control"] = "no-cache"
+    return static_catalog.index()
+
+
+@router.get("/{version}/{resource}")
+def get_catalog_resource(version: str, resource: str, request: Request):
+    """获取指定版本的目录资源"""
+    payload = static_catalog.get(resource, version)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="目录资源不存在或版本已过期")
+
+    etag = f'"{version}-{resource}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
@@ -0,0 +1,102 @@
+"""
+事件推送接口
+通过 WebSocket 推送会话和大厅事件（事件来自消息代理，与代理的传输方式无关）
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from fastapi import APIRouter, WebSocket
+
+from src.services.broker import Event, LOBBY_TOPIC, broker, session_topic
+from src.services.views import verify_seat_token, view_hub
+
+# 将事件转换为要发送的文本，返回 None 时不发送；连接建立时以 None 调用一次
+EventRenderer = Callable[[Optional[Event]], Awaitable[Optional[str]]]
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+async def _wait_closed(websocket: WebSocket) -> None:
+    """等待客户端断开（忽略客户端发来的消息）"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def forward_topic(websocket: WebSocket, topic: str, render: Optional[EventRenderer] = None) -> None:
+    """将主题的事件转发给 WebSocket 客户端，直到客户端断开"""
+    await websocket.accept()
+    subscription = broker.subscribe(topic)
+    closed = asyncio.create_task(_wait_closed(websocket))
+    try:
+        if render is not None:
+            text = await render(None)
+            if text is not None:
+                await websocket.send_text(text)
+        while True:
+            getter = asyncio.create_task(subscription.get())
+            done, _ = await asyncio.wait({getter, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed in done:
+                getter.cancel()
+                break
+            event = getter.result()
+            if render is None:
+                await websocket.send_json(event.to_dict())
+                continue
+            text = await render(event)
+            if text is not None:
+                await websocket.send_text(text)
+    finally:
+        closed.cancel()
+        subscription.close()
+
+
+@router.websocket("/lobby")
+async def lobby_events(websocket: WebSocket):
+    """大厅事件（会话创建、玩家加入、游戏开始）"""
+    await forward_topic(websocket, LOBBY_TOPIC)
+
+
+@router.websocket("/sessions/{session_id}")
+async def session_events(websocket: WebSocket, session_id: str):
+    """会话事件（游戏状态变化）"""
+    await forward_topic(websocket, session_topic(session_id))
+
+
+@router.websocket("/sessions/{session_id}/view")
+async def view_events(websocket: WebSocket, session_id: str, player_id: Optional[str] = None,
+                      token: Optional[str] = None):
+    """
+    视图推送：连接时发送当前视图，之后每个新版本发送一次
+
+    指定 player_id 时推送该玩家的视图（token 为该玩家的座位令牌，无效时以 1008 关闭连接），
+    否则推送观战视图（同一视图的文本由所有连接共享）
+    """
+    if player_id is not None and not verify_seat_token(session_id, player_id, token):
+        await websocket.close(code=1008)
+        return
+
+    last_version = 0
+
+    async def render(event: Optional[Event]) -> Optional[str]:
+        nonlocal last_version
+        if event is not None and event.event_type != "state_changed":
+            return None
+        views = view_hub.peek(session_id) or await asyncio.to_thread(view_hub.get, session_id)
+        if views is None or views.version <= last_version:
+            return None
+        snapshot = views.for_viewer(player_id)
+        if snapshot is None:
+            return None
+        last_version = views.version
+        return snapshot.text
+
+    await forward_topic(websocket, session_topic(session_id), render)
+
+
+@router.websocket("/sessions/{session_id}/spectate")
+async def spectate_events(websocket: WebSocket, session_id: str):
+    """观战推送（观战视图）"""
+    await view_events(websocket, session_id)
@@ -0,0 +1,147 @@
+"""
+游戏接口
+查询游戏状态、执行行动、提交整个回合和撤销本回合内的行动
+"""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from src.api.dependencies import admit, require_session_owner
+from src.api.endpoints.lobby import check_result
+from config.settings import ADMIN_FULL_STATE
+from src.core.models.enums import ActionType
+from src.services.admission import Priority
+from src.services.game_session import GameSessionService
+from src.services.views import ViewSnapshot, verify_seat_token, view_hub
+from src.storage.database import get_db
+
+router = APIRouter(prefix="/games", tags=["game"])
+
+
+class ActionRequest(BaseModel):
+    """行动请求"""
+    action_type: ActionType
+    action_data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class TurnRequest(BaseModel):
+    """回合请求（按顺序执行的多个行动）"""
+    actions: List[ActionRequest]
+
+
+class UndoRequest(BaseModel):
+    """撤销请求"""
+    player_id: str
+
+
+def view_response(snapshot: ViewSnapshot, request: Request) -> Response:
+    """返回共享的视图内容（客户端已有相同版本时返回304）"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+def require_seat(session_id: str, player_id: Optional[str], token: Optional[str]) -> None:
+    """检查座位令牌，代表玩家的请求都需要该玩家加入会话时发放的令牌"""
+    if not player_id or not verify_seat_token(session_id, player_id, token):
+        raise HTTPException(status_code=403, detail="座位令牌无效")
+
+
+def require_action_seats(session_id: str, actions: List[ActionRequest], token: Optional[str]) -> None:
+    """检查行动中每个玩家的座位令牌"""
+    for player_id in {action.action_data.get("player_id") for action in actions}:
+        require_seat(session_id, player_id, token)
+
+
+def get_view(session_id: str, player_id: Optional[str] = None, token: Optional[str] = None) -> ViewSnapshot:
+    """获取玩家视图（需要该玩家的座位令牌）或观战视图"""
+    if player_id is not None:
+        require_seat(session_id, player_id, token)
+    views = view_hub.get(session_id)
+    if views is None:
+        raise HTTPException(status_code=404, detail="游戏会话不存在")
+    snapshot = views.for_viewer(player_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="玩家不在该游戏会话中")
+    return snapshot
+
+
+@router.get("/{session_id}", dependencies=[Depends(admit(Priority.NORMAL))])
+def get_game(session_id: str, request: Request, player_id: Optional[str] = None, full: bool = False,
+             seat_token: Optional[str] = Header(None, alias="X-Seat-Token"),
+             db: Session = Depends(get_db)):
+    """
+    获取游戏会话和游戏状态
+
+    返回 player_id 对应玩家的视图（只包含本人的手牌，需要在 X-Seat-Token 中提供加入会话时发放的座位令牌），
+    不指定玩家时返回观战视图；
+    视图中的静态部分引用 /catalog（见 catalog_version）。full=true 返回完整状态，只在设置 ADMIN_FULL_STATE 后可用。
+    """
+    if full:
+        if not ADMIN_FULL_STATE:
+            raise HTTPException(status_code=403, detail="完整游戏状态接口未启用")
+        session = GameSessionService(db).get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="游戏会话不存在")
+        return session
+    return view_response(get_view(session_id, player_id, seat_token), request)
+
+
+@router.get("/{session_id}/spectate", dependencies=[Depends(admit(Priority.DEFERRABLE))])
+def spectate_game(session_id: str, request: Request):
+    """观战视图（隐藏牌堆顺序和手牌，每个版本只生成一次并由所有观战者共享）"""
+    return view_response(get_view(session_id), request)
+
+
+@router.post("/{session_id}/actions",
+             dependencies=[Depends(admit(Priority.CRITICAL)), Depends(require_session_owner)])
+def execute_action(session_id: str, request: ActionRequest,
+                   seat_token: Optional[str] = Header(None, alias="X-Seat-Token"),
+                   db: Session = Depends(get_db)):
+    """执行一个游戏行动（需要在 X-Seat-Token 中提供行动玩家的座位令牌）"""
+    require_action_seats(session_id, [request], seat_token)
+    service = GameSessionService(db)
+    try:
+        result = service.execute_action(session_id, request.action_type, request.action_data)
+    except ValueError as e:
+        status_code = 404 if "不存在" in str(e) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+    return check_result(result)
+
+
+@router.post("/{session_id}/preview",
+             dependencies=[Depends(admit(Priority.DEFERRABLE)), Depends(require_session_owner)])
+def preview_action(session_id: str, request: ActionRequest,
+                   seat_token: Optional[str] = Header(None, alias="X-Seat-Token"),
+                   db: Session = Depends(get_db)):
+    """预览行动结果（不修改游戏状态，负载较高时最先被拒绝；需要行动玩家的座位令牌）"""
+    require_action_seats(session_id, [request], seat_token)
+    service = GameSessionService(db)
+    return check_result(service.preview_action(session_id, request.action_type, request.action_data))
+
+
+@router.post("/{session_id}/turn",
+             dependencies=[Depends(admit(Priority.CRITICAL)), Depends(require_session_owner)])
+def execute_turn(session_id: str, request: TurnRequest,
+                 seat_token: Optional[str] = Header(None, alias="X-Seat-Token"),
+                 db: Session = Depends(get_db)):
+    """原子地执行一个回合内的多个行动（需要行动玩家的座位令牌）"""
+    require_action_seats(session_id, request.actions, seat_token)
+    service = GameSessionService(db)
+    actions = [(action.action_type, action.action_data) for action in request.actions]
+    return check_result(service.execute_turn(session_id, actions))
+
+
+@router.post("/{session_id}/undo",
+             dependencies=[Depends(admit(Priority.CRITICAL)), Depends(require_session_owner)])
+def undo_action(session_id: str, request: UndoRequest,
+                seat_token: Optional[str] = Header(None, alias="X-Seat-Token"),
+                db: Session = Depends(get_db)):
+    """撤销当前玩家在本回合内的最近一个行动（需要在 X-Seat-Token 中提供该玩家的座位令牌）"""
+    require_seat(session_id, request.player_id, seat_token)
+    service = GameSessionService(db)
+    return check_result(service.undo_last_action(session_id, request.player_id))
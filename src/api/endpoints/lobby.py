@@ -0,0 +1,100 @@
+"""
+大厅接口
+创建、加入、开始游戏会话以及查询会话列表
+"""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from src.api.dependencies import admit, require_session_owner
+from src.services.admission import Priority
+from src.services.game_session import GameSessionService
+from src.services.matchmaking import matchmaking
+from src.services.session_lease import lease_manager
+from src.storage.database import get_db
+
+router = APIRouter(prefix="/lobby", tags=["lobby"])
+
+
+class CreateSessionRequest(BaseModel):
+    """创建会话请求"""
+    creator_id: str
+    session_name: str
+    max_players: int = Field(default=4, ge=2, le=4)
+
+
+class JoinSessionRequest(BaseModel):
+    """加入会话请求"""
+    user_id: str
+    display_name: str
+
+
+class StartSessionRequest(BaseModel):
+    """开始会话请求"""
+    user_id: str
+
+
+class MatchmakingRequest(BaseModel):
+    """匹配请求"""
+    user_id: str
+    display_name: Optional[str] = None
+
+
+def check_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """将服务层的失败结果转换为HTTP错误"""
+    if result.get("success") is False:
+        status_code = 404 if "不存在" in result["message"] else 400
+        raise HTTPException(status_code=status_code, detail=result["message"])
+    return result
+
+
+@router.post("/sessions", dependencies=[Depends(admit(Priority.NORMAL))])
+def create_session(request: CreateSessionRequest, db: Session = Depends(get_db)):
+    """创建游戏会话（创建会话的进程成为会话的持有者）"""
+    service = GameSessionService(db)
+    result = service.create_session(request.creator_id, request.session_name, request.max_players)
+    lease_manager.check_owner(db, result["session_id"])
+    return result
+
+
+@router.get("/sessions", dependencies=[Depends(admit(Priority.DEFERRABLE))])
+def list_sessions(status: Optional[str] = None, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+    """获取游戏会话列表"""
+    return GameSessionService(db).list_sessions(status)
+
+
+@router.post("/sessions/{session_id}/join",
+             dependencies=[Depends(admit(Priority.CRITICAL)), Depends(require_session_owner)])
+def join_session(session_id: str, request: JoinSessionRequest, db: Session = Depends(get_db)):
+    """加入游戏会话"""
+    service = GameSessionService(db)
+    return check_result(service.join_session(session_id, request.user_id, request.display_name))
+
+
+@router.post("/sessions/{session_id}/start",
+             dependencies=[Depends(admit(Priority.CRITICAL)), Depends(require_session_owner)])
+def start_session(session_id: str, request: StartSessionRequest, db: Session = Depends(get_db)):
+    """开始游戏会话"""
+    service = GameSessionService(db)
+    return check_result(service.start_session(session_id, request.user_id))
+
+
+@router.post("/matchmaking", dependencies=[Depends(admit(Priority.NORMAL))])
+def enqueue_matchmaking(request: MatchmakingRequest, db: Session = Depends(get_db)):
+    """加入匹配队列（匹配成功后自动创建并开始对局），返回匹配票据"""
+    return check_result(matchmaking.enqueue(db, request.user_id, request.display_name))
+
+
+@router.get("/matchmaking/{user_id}", dependencies=[Depends(admit(Priority.DEFERRABLE))])
+def matchmaking_status(user_id: str, ticket: Optional[str] = Header(None, alias="X-Matchmaking-Ticket")):
+    """查询匹配状态（需要匹配票据），匹配成功时返回会话ID、玩家ID和座位令牌"""
+    return check_result(matchmaking.status(user_id, ticket))
+
+
+@router.delete("/matchmaking/{user_id}", dependencies=[Depends(admit(Priority.NORMAL))])
+def cancel_matchmaking(user_id: str, ticket: Optional[str] = Header(None, alias="X-Matchmaking-Ticket")):
+    """退出匹配队列（需要匹配票据）"""
+    return check_result(matchmaking.cancel(user_id, ticket))
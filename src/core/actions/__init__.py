@@ -7,13 +7,38 @@ from .hire_worker import HireWorkerAction
 from .buy_cattle import BuyCattleAction
 from .sell_cattle import SellCattleAction
 from .use_ability import UseAbilityAction
+from .pass_turn import PassAction
+from ..models.enums import ActionType
+
+# 行动类型与行动类的映射
+ACTION_CLASSES = {
+    ActionType.MOVE: MoveAction,
+    ActionType.BUILD: BuildAction,
+    ActionType.HIRE_WORKER: HireWorkerAction,
+    ActionType.BUY_CATTLE: BuyCattleAction,
+    ActionType.SELL_CATTLE: SellCattleAction,
+    ActionType.USE_ABILITY: UseAbilityAction,
+    ActionType.PASS: PassAction,
+}
+
+
+def create_action(action_type: ActionType, action_data) -> GameAction:
+    """根据行动类型创建行动实例"""
+    action_class = ACTION_CLASSES.get(action_type)
+    if not action_class:
+        raise ValueError(f"未知的行动类型: {action_type}")
+    return action_class(action_data)
+
 
 __all__ = [
+    'ACTION_CLASSES',
+    'create_action',
     'GameAction',
     'MoveAction',
     'BuildAction',
     'HireWorkerAction',
     'BuyCattleAction',
     'SellCattleAction',
-    'UseAbilityAction'
+    'UseAbilityAction',
+    'PassAction'
 ]
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ..game_state import GameState
 from ..models.enums import ActionType
+from ..rules.validator import ActionValidator, ActionContext
+from ...utils.metrics import metrics, timer
+
+metrics.histogram("game_action_execute_seconds", "GameAction执行耗时")
+actions_total = metrics.counter("game_actions_total", "GameAction执行次数")
 
 
 class GameAction(ABC):
@@ -17,19 +22,63 @@ class GameAction(ABC):
         """验证行动数据"""
         pass
 
+    def execute(self, game_state: GameState, context: Optional[ActionContext] = None) -> Dict[str, Any]:
+        """
+        执行行动并返回结果
+
+        Args:
+            game_state: 游戏状态
+            context: 已验证的行动上下文，为None时先进行验证
+        """
+        action_type = self.action_type.value
+        with timer("game_action_execute_seconds", action_type=action_type):
+            result = self._execute_with_rollback(game_state, context)
+        actions_total.inc(action_type=action_type, result="success" if result["success"] else "failure")
+        return result
+
+    def _execute_with_rollback(self, game_state: GameState, context: Optional[ActionContext]) -> Dict[str, Any]:
+        """验证并执行行动，失败或异常时原子回滚"""
+        if context is None:
+            context = self.validate(game_state)
+        if not context.is_valid:
+            return {"success": False, "message": context.message}
+
+        # 执行中的修改都记录在变更日志中，失败或异常时原子回滚
+        journal = game_state.journal
+        checkpoint = journal.begin()
+        try:
+            result = self._execute(game_state, context)
+        except Exception:
+            journal.rollback(checkpoint)
+            raise
+        if not result["success"]:
+            journal.rollback(checkpoint)
+        return result
+
+    def dry_run(self, game_state: GameState, context: Optional[ActionContext] = None) -> Dict[str, Any]:
+        """
+        在草稿副本上执行行动（用于预览）
+
+        执行的代码与正式执行相同，但不记录行动指标；传入的游戏状态会被修改，不能是会话的正式状态。
+        """
+        return self._execute_with_rollback(game_state, context)
+
     @abstractmethod
-    def execute(self, game_state: GameState) -> Dict[str, Any]:
-        """执行行动并返回结果"""
+    def _execute(self, game_state: GameState, context: ActionContext) -> Dict[str, Any]:
+        """使用已验证的上下文执行行动（状态修改需通过 game_state.journal 进行）"""
         pass
 
-    @abstractmethod
+    def validate(self, game_state: GameState) -> ActionContext:
+        """验证行动并返回行动上下文"""
+        return ActionValidator(game_state).resolve_action(self.action_type, self.action_data)
+
     def is_valid(self, game_state: GameState) -> bool:
         """检查行动是否合法"""
-        pass
+        return self.validate(game_state).is_valid
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
             "action_type": self.action_type.value,
             "action_data": self.action_data
-        }
\ No newline at end of file
+        }
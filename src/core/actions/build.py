@@ -1,7 +1,9 @@
 from typing import Dict, Any, List
 from .base import GameAction
 from ..game_state import GameState
+from ..models.board import BuildingType
 from ..models.enums import ActionType
+from ..rules.validator import ActionContext
 
 
 class BuildAction(GameAction):
@@ -23,41 +25,31 @@ class BuildAction(GameAction):
         if self.action_data["building_type"] not in valid_building_types:
             raise ValueError(f"无效的建筑类型: {self.action_data['building_type']}")
 
-    def execute(self, game_state: GameState) -> Dict[str, Any]:
+    def _execute(self, game_state: GameState, context: ActionContext) -> Dict[str, Any]:
         """执行建造行动"""
-        if not self.is_valid(game_state):
-            return {"success": False, "message": "建造行动不合法"}
-
         player_id = self.action_data["player_id"]
         location_id = self.action_data["location_id"]
         building_type = self.action_data["building_type"]
 
-        player = game_state.get_player_by_id(player_id)
-        if not player:
-            return {"success": False, "message": "玩家不存在"}
-
-        # 获取建筑成本
-        building_cost = self._get_building_cost(building_type)
-
-        # 检查玩家是否有足够资源
-        if player.resources.money < building_cost:
-            return {"success": False, "message": f"资源不足，需要{building_cost}金钱"}
+        player = context.player
+        building_cost = context.cost
 
         # 检查位置是否可建造
         if not self._is_buildable_location(game_state, location_id, player_id):
             return {"success": False, "message": "该位置不可建造"}
 
         # 扣除资源
-        player.resources.money -= building_cost
+        journal = game_state.journal
+        journal.add(player.resources, "money", -building_cost)
 
         # 更新版图状态 - 在指定位置建造建筑
         self._update_board_state(game_state, location_id, player_id, building_type)
 
         # 更新玩家统计
-        player.buildings_built_count += 1
+        journal.add(player, "buildings_built_count", 1)
 
         # 根据建筑类型给予额外奖励
-        self._apply_building_bonus(player, building_type)
+        self._apply_building_bonus(game_state, player, building_type)
 
         # 更新游戏状态版本
         game_state.increment_version()
@@ -73,28 +65,6 @@ class BuildAction(GameAction):
             "buildings_built": player.buildings_built_count
         }
 
-    def is_valid(self, game_state: GameState) -> bool:
-        """验证行动是否合法"""
-        from ..rules.validator import ActionValidator
-        validator = ActionValidator(game_state)
-        is_valid, _ = validator.validate_action(self.action_type, self.action_data)
-        return is_valid
-
-    def _get_building_cost(self, building_type: str) -> int:
-        """获取建筑成本"""
-        costs = {
-            "station": 3,
-            "ranch": 2,
-            "hazard": 1,
-            "telegraph": 4,
-            "church": 3,
-            # 新增建筑物的建造成本（注意：这是建造成本，不是使用成本）
-            "building_type_1": 2,  # 建筑物1建造成本2金钱
-            "building_type_2": 3,  # 建筑物2建造成本3金钱
-            "building_type_3": 2  # 建筑物3建造成本2金钱
-        }
-        return costs.get(building_type, 2)
-
     def _is_buildable_location(self, game_state: GameState, location_id: int, player_id: str) -> bool:
         """检查位置是否可建造"""
         # 简化实现：检查位置是否在可用位置列表中
@@ -104,28 +74,17 @@ class BuildAction(GameAction):
         return True  # 如果没有可用位置列表，默认允许建造
 
     def _update_board_state(self, game_state: GameState, location_id: int, player_id: str, building_type: str):
-        """更新版图状态"""
-        # 简化实现：在实际游戏中需要更新版图的具体位置状态
-        # 这里只是记录到玩家建筑列表中
-        if not hasattr(game_state.board_state, 'player_buildings'):
-            game_state.board_state.player_buildings = {}
-
-        if player_id not in game_state.board_state.player_buildings:
-            game_state.board_state.player_buildings[player_id] = []
-
-        building_info = {
-            "location_id": location_id,
-            "building_type": building_type,
-            "built_by": player_id
-        }
-        game_state.board_state.player_buildings[player_id].append(building_info)
+        """更新版图状态：在指定位置放置玩家建筑"""
+        journal = game_state.journal
+        game_state.board_state.place_building(location_id, BuildingType(building_type), owner_id=player_id,
+                                              journal=journal)
 
         # 从可用位置中移除（如果有）
         if hasattr(game_state.board_state,
                    'available_locations') and location_id in game_state.board_state.available_locations:
-            game_state.board_state.available_locations.remove(location_id)
+            journal.remove(game_state.board_state.available_locations, location_id)
 
-    def _apply_building_bonus(self, player, building_type: str):
+    def _apply_building_bonus(self, game_state: GameState, player, building_type: str):
         """应用建筑奖励"""
         bonuses = {
             "station": {"victory_points": 1},  # 车站给1胜利点
@@ -138,8 +97,7 @@ class BuildAction(GameAction):
         bonus = bonuses.get(building_type, {})
         for resource, amount in bonus.items():
             if hasattr(player.resources, resource):
-                current_value = getattr(player.resources, resource)
-                setattr(player.resources, resource, current_value + amount)
+                game_state.journal.add(player.resources, resource, amount)
 
     def _get_building_actions(self, building_type: str) -> List[Dict[str, Any]]:
         """获取建筑物提供的动作配置"""
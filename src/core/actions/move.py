@@ -2,6 +2,7 @@ from typing import Dict, Any
 from .base import GameAction
 from ..game_state import GameState
 from ..models.enums import ActionType
+from ..rules.validator import ActionContext
 
 
 class MoveAction(GameAction):
@@ -23,18 +24,12 @@ class MoveAction(GameAction):
             # 如果没有提供steps，则根据当前位置和目标位置计算
             pass  # 在执行时计算
 
-    def execute(self, game_state: GameState) -> Dict[str, Any]:
+    def _execute(self, game_state: GameState, context: ActionContext) -> Dict[str, Any]:
         """执行移动行动"""
-        if not self.is_valid(game_state):
-            return {"success": False, "message": "移动行动不合法"}
-
         player_id = self.action_data["player_id"]
         target_location = self.action_data["target_location"]
 
-        player = game_state.get_player_by_id(player_id)
-        if not player:
-            return {"success": False, "message": "玩家不存在"}
-
+        player = context.player
         previous_position = player.position
 
         # 计算实际移动步数
@@ -54,12 +49,12 @@ class MoveAction(GameAction):
             steps = 1  # 强制设置为1步
 
         # 验证移动合法性
-        if not self._is_valid_move(game_state, previous_position, target_location, steps):
+        if not self._is_valid_move(context):
             return {"success": False, "message": "移动路径不合法"}
 
         # 更新玩家位置
-        player.previous_position = previous_position
-        player.position = target_location
+        game_state.journal.set_attr(player, "previous_position", previous_position)
+        game_state.journal.set_attr(player, "position", target_location)
 
         # 如果是普通移动（非建筑物提供的固定移动），可能需要消耗资源
         if not is_fixed_one_step:
@@ -80,17 +75,8 @@ class MoveAction(GameAction):
             "is_fixed_one_step": is_fixed_one_step
         }
 
-    def is_valid(self, game_state: GameState) -> bool:
-        """验证行动是否合法"""
-        from ..rules.validator import ActionValidator
-        validator = ActionValidator(game_state)
-        is_valid, _ = validator.validate_action(self.action_type, self.action_data)
-        return is_valid
-
-    def _is_valid_move(self, game_state: GameState, from_pos: int, to_pos: int, steps: int) -> bool:
+    def _is_valid_move(self, context: ActionContext) -> bool:
         """验证移动是否合法"""
         # 这里实现路径验证逻辑
-        # 简化实现：检查目标位置是否在地图节点中
-        if hasattr(game_state.board_state, 'nodes'):
-            return to_pos in game_state.board_state.nodes
-        return 0 <= to_pos <= 50
\ No newline at end of file
+        # 简化实现：检查目标位置是否在地图节点中（节点已在验证阶段解析）
+        return context.target_node is not None
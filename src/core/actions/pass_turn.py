@@ -0,0 +1,38 @@
+from typing import Dict, Any
+from .base import GameAction
+from ..game_state import GameState
+from ..models.enums import ActionType
+from ..rules.validator import ActionContext
+
+
+class PassAction(GameAction):
+    """跳过回合行动 - 结束当前玩家的回合（回合超时时由计时器自动执行）"""
+
+    def __init__(self, action_data: Dict[str, Any]):
+        super().__init__(ActionType.PASS, action_data)
+
+    def _validate_data(self):
+        """验证跳过回合行动数据"""
+        if "player_id" not in self.action_data:
+            raise ValueError("跳过回合行动缺少必要字段: player_id")
+
+    def _execute(self, game_state: GameState, context: ActionContext) -> Dict[str, Any]:
+        """执行跳过回合行动"""
+        journal = game_state.journal
+
+        # 切换到下一个玩家
+        next_index = (game_state.current_player_index + 1) % len(game_state.players)
+        journal.set_attr(game_state, "current_player_index", next_index)
+        if next_index == 0:
+            journal.add(game_state, "current_round", 1)
+
+        # 更新游戏状态版本
+        game_state.increment_version()
+
+        return {
+            "success": True,
+            "message": "自动跳过回合" if self.action_data.get("auto") else "跳过回合",
+            "player_id": context.player.player_id,
+            "next_player_index": next_index,
+            "auto": self.action_data.get("auto", False)
+        }
@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
+import copy
 import json
+from collections import deque
 from uuid import uuid4
 import random
 from .models.board import LocationType, BuildingType
@@ -10,12 +12,19 @@ from .models.card import Card
 # 使用相对导入
 from .models.enums import GamePhase, PlayerColor
 from .models.player import PlayerState, ResourceSet, CattleCard
-from .models.board import BoardState, MapNode, BuildingType
+from .models.board import BoardState, MapNode, BuildingType, NodeAction
 from .models.labor_market import LaborMarket
-from .models.deck_manager import DeckManager, DeckConfig
-from .models.enums import CardType
-from config.cards import DECK_CONFIGS
+from .models.deck_manager import DeckManager
+from .models.enums import CardType, EventCategory
 from .models.future_area import FutureArea
+from .journal import MutationJournal
+from ..utils.metrics import timed
+from ..utils.logging import get_logger
+from .setup_template import (
+    get_setup_template, build_map_topology, event_category, EVENT_LABELS, EVENT_SLOTS, HAZARD_EVENTS
+)
+
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -60,12 +69,23 @@ class GameState:
     future_area: FutureArea = field(default_factory=FutureArea)
 
     def __init__(self, session_id: str):
-        if not hasattr(self, 'session_id') or not self.session_id:
-            self.session_id = str(uuid4())
+        self.session_id = session_id or str(uuid4())
+
+        # 自定义__init__不会执行dataclass的default_factory，这里显式初始化
+        self.players = []
+        self.player_order = []
+        self.cattle_market = []
+        self.available_workers = {}
+        self.game_config = {}
+        self.last_updated = datetime.now()
+        self.action_history = []
+
+        # 变更日志（不参与序列化），用于回滚和撤销
+        self.journal = MutationJournal()
 
         self.board_state = BoardState()
         self.deck_manager = DeckManager()  # 初始化牌堆管理器
-        self._initialize_decks()  # 初始化所有牌堆
+        self.deck_manager.decks = get_setup_template().new_decks()  # 按需从开局模板创建牌堆
         self.labor_market = LaborMarket()  # 初始化人才市场
 
         # # 初始化未来区
@@ -73,20 +93,6 @@ class GameState:
 
 
 
-    def _initialize_decks(self):
-        """初始化所有牌堆"""
-        # 将配置转换为DeckConfig对象
-        deck_configs = {}
-        for card_type_str, config in DECK_CONFIGS.items():
-            card_type = CardType(card_type_str)
-            deck_configs[card_type] = DeckConfig(
-                card_type=card_type,
-                total_count=config["total_count"],
-                card_prototypes=config["card_prototypes"]
-            )
-
-        self.deck_manager.initialize_decks(deck_configs)
-
     def take_card_from_future_area(self, row: int, col: int, player_id: str) -> Dict[str, Any]:
         """
         从未来区取走一张牌
@@ -141,6 +147,11 @@ class GameState:
         """游戏是否已结束"""
         return self.current_phase == GamePhase.END_GAME
 
+    @property
+    def board_ready(self) -> bool:
+        """版图是否已布置（地图、人才市场和未来区）"""
+        return bool(self.board_state.nodes)
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式（用于序列化）"""
         return {
@@ -150,10 +161,10 @@ class GameState:
             "current_round": self.current_round,
             "current_player_index": self.current_player_index,
             "turn_start_time": self.turn_start_time.isoformat() if self.turn_start_time else None,
-            # "players": [self._player_to_dict(p) for p in self.players],
-            # "player_order": self.player_order,
+            "players": [p.to_dict() for p in self.players],
+            "player_order": self.player_order,
             "board_state": self._board_to_dict(),
-            # "cattle_market": self.cattle_market,
+            "cattle_market": list(self.cattle_market),
             # "available_workers": self.available_workers,
             "max_players": self.max_players,
             # "game_config": self.game_config,
@@ -181,24 +192,7 @@ class GameState:
             game_state.turn_start_time = datetime.fromisoformat(data["turn_start_time"])
 
         # 重建玩家
-        game_state.players = []
-        for player_data in data.get("players", []):
-            player = PlayerState(
-                player_id=player_data["player_id"],
-                user_id=player_data["user_id"],
-                player_color=PlayerColor(player_data["player_color"]),
-                display_name=player_data["display_name"],
-                resources=ResourceSet(**player_data["resources"])
-            )
-            # 设置其他玩家属性
-            player.hand_cards = player_data.get("hand_cards", [])
-            player.victory_points = player_data.get("victory_points", 0)
-            player.stations_built = player_data.get("stations_built", 0)
-            player.cattle_sold_count = player_data.get("cattle_sold_count", 0)
-            player.buildings_built_count = player_data.get("buildings_built_count", 0)
-            player.workers_hired_count = player_data.get("workers_hired_count", 0)
-
-            game_state.players.append(player)
+        game_state.players = [PlayerState.from_dict(player_data) for player_data in data.get("players", [])]
 
         # 重建版图状态
         game_state.board_state = BoardState.from_dict(data.get("board_state", {}))
@@ -219,9 +213,9 @@ class GameState:
         if "labor_market" in data:
             game_state.labor_market = LaborMarket.from_dict(data["labor_market"])
 
-        # 重建牌堆管理器
+        # 重建牌堆（未序列化的牌堆从未被使用，仍按需创建）
         if "deck_manager" in data:
-            game_state.deck_manager = DeckManager.from_dict(data["deck_manager"])
+            game_state.deck_manager.decks.update(DeckManager.from_dict(data["deck_manager"]).decks)
 
         # 反序列化未来区
         if "future_area" in data:
@@ -266,8 +260,7 @@ class GameState:
             # 使用nodes结构的序列化
             return {
                 "nodes": {k: self._node_to_dict(v) for k, v in self.board_state.nodes.items()},
-                "neutral_buildings": getattr(self.board_state, 'neutral_buildings', []),
-                "player_buildings": getattr(self.board_state, 'player_buildings', {}),
+                "buildings": {k: v.to_dict() for k, v in self.board_state.buildings.items()},
                 "available_locations": getattr(self.board_state, 'available_locations', []),
                 "kansas_city_state": getattr(self.board_state, 'kansas_city_state', {})
             }
@@ -283,26 +276,12 @@ class GameState:
 
     def _node_to_dict(self, node: MapNode) -> Dict[str, Any]:
         """将地图节点转换为字典"""
-        return {
-            "node_id": node.node_id,
-            "name": node.name,
-            "location_type": node.location_type.value,
-            "building_type": node.building_type.value if node.building_type else None,
-            "next_nodes": node.next_nodes,
-            "previous_nodes": node.previous_nodes,
-            "x": node.x,
-            "y": node.y,
-            "actions": node.actions,
-            # 移除 owner_id 属性，因为 MapNode 没有这个属性
-            # "owner_id": node.owner_id,
-        }
-
-
+        return node.to_dict()
 
     # 牌堆相关方法
     def draw_cards(self, card_type: CardType, count: int = 1) -> List[Card]:
         """抽取牌"""
-        return self.deck_manager.draw_cards(card_type, count)
+        return self.deck_manager.draw_cards(card_type, count, self.journal)
 
     def get_deck_status(self) -> Dict[CardType, Dict[str, int]]:
         """获取牌堆状态"""
@@ -316,13 +295,16 @@ class GameState:
         """重新洗牌"""
         self.deck_manager.reshuffle_deck(card_type)
     def clone(self) -> 'GameState':
-        """创建游戏状态的深拷贝"""
-        return GameState.from_dict(self.to_dict())
+        """创建游戏状态的深拷贝（与原状态不共享可变对象，可以作为预览等试执行的草稿）
+
+        to_dict 会直接返回手牌、市场等内部列表，这里深拷贝一次再重建，避免副本和原状态互相影响。
+        """
+        return GameState.from_dict(copy.deepcopy(self.to_dict()))
 
     def increment_version(self) -> None:
-        """递增版本号"""
-        self.version += 1
-        self.last_updated = datetime.now()
+        """递增版本号（记录到变更日志中，回滚时一并恢复）"""
+        self.journal.set_attr(self, "version", self.version + 1)
+        self.journal.set_attr(self, "last_updated", datetime.now())
 
     def get_player_by_id(self, player_id: str) -> Optional[PlayerState]:
         """根据玩家ID获取玩家状态"""
@@ -338,144 +320,54 @@ class GameState:
                 return i
         return None
 
+    @timed("game_state_to_json_seconds", "GameState序列化耗时")
     def to_json(self) -> str:
         """将游戏状态序列化为 JSON 字符串"""
         return json.dumps(self.to_dict())
 
     @classmethod
+    @timed("game_state_from_json_seconds", "GameState反序列化耗时")
     def from_json(cls, json_str: str):
         """从 JSON 字符串反序列化游戏状态"""
-        data = json.loads(json_str)
-        state = cls(data["session_id"])
-        state.current_phase = GamePhase(data["current_phase"])
-        # state.players = [PlayerState.from_dict(player_data) for player_data in data["players"]]
-        state.board_state = BoardState.from_dict(data["board_state"])
-        # state.cattle_market = data["cattle_market"]
-        return state
+        # 完整恢复玩家、当前玩家和回合开始时间等字段（回合计时依赖这些字段）
+        return cls.from_dict(json.loads(json_str))
 
     # 在GameState类中添加地图初始化方法
+    @timed("game_state_initialize_map_seconds", "地图初始化耗时")
     def initialize_map(self):
         """初始化游戏地图 - 创建50个节点的有向图结构"""
-        # 确保board_state已初始化
-        if not hasattr(self.board_state, 'nodes') or not self.board_state.nodes:
-            self.board_state.initialize_nodes()
-
-        # 创建基础线性路径 (0->1->2->...->29)
-        for i in range(29):
-            self.board_state.connect_nodes(i, i + 1)
-
-        # 水灾支路
-        self.board_state.connect_nodes(1, 51)
-        self.board_state.connect_nodes(51, 52)
-        self.board_state.connect_nodes(52, 53)
-        self.board_state.connect_nodes(53, 54)
-        self.board_state.connect_nodes(54, 55)
-        self.board_state.connect_nodes(55, 56)
-        self.board_state.connect_nodes(56, 5)
-
-        # 旱灾支路
-        self.board_state.connect_nodes(5, 61)
-        self.board_state.connect_nodes(61, 62)
-        self.board_state.connect_nodes(62, 63)
-        self.board_state.connect_nodes(63, 64)
-        self.board_state.connect_nodes(64, 65)
-        self.board_state.connect_nodes(65, 9)
-
-        # 分支1
-        self.board_state.connect_nodes(9, 71)
-        self.board_state.connect_nodes(71, 72)
-        self.board_state.connect_nodes(72, 12)
-
-        # 落石支路
-        self.board_state.connect_nodes(12, 81)
-        self.board_state.connect_nodes(81, 82)
-        self.board_state.connect_nodes(82, 83)
-        self.board_state.connect_nodes(83, 84)
-        self.board_state.connect_nodes(84, 85)
-        self.board_state.connect_nodes(85, 86)
-        self.board_state.connect_nodes(86, 15)
-
-        # 分支2
-        self.board_state.connect_nodes(15, 91)
-        self.board_state.connect_nodes(91, 17)
-
-        # 分支3
-        self.board_state.connect_nodes(17, 92)
-        self.board_state.connect_nodes(92, 19)
-
-        # 帐篷支路
-        self.board_state.connect_nodes(10, 104)
-        self.board_state.connect_nodes(104, 105)
-        self.board_state.connect_nodes(105, 106)
-        self.board_state.connect_nodes(106, 107)
-        self.board_state.connect_nodes(107, 108)
-        self.board_state.connect_nodes(108, 109)
-        self.board_state.connect_nodes(109, 110)
-        self.board_state.connect_nodes(110, 111)
-        self.board_state.connect_nodes(111, 12)
-
-        # 设置特殊地点的动作
-        self.board_state.nodes[0].location_type = LocationType.START
-        self.board_state.nodes[0].name = "起点"
-        self.board_state.nodes[0].actions = ["move", "start_turn"]
-
-        self.board_state.nodes[29].location_type = LocationType.KANSAS_CITY
-        self.board_state.nodes[29].name = "堪萨斯城"
-        self.board_state.nodes[29].actions = ["cattle_sale", "end_turn"]
+        # 地图拓扑来自开局模板；已有节点时直接在现有节点上连线
+        if not getattr(self.board_state, 'nodes', None):
+            self.board_state.nodes = get_setup_template().new_nodes()
+        else:
+            build_map_topology(self.board_state)
 
         # 放置建筑物
         self._place_buildings()
 
         self.place_action_a_cards()
 
-        # 创建铁路路径 (200->201->202->...->239)
-        for i in range(200, 240):
-            self.board_state.connect_nodes(i, i + 1)
-
-        # 设置车站
-        self.board_state.connect_nodes(4, 241)
-        self.board_state.connect_nodes(241, 5)
-
-        self.board_state.connect_nodes(7, 242)
-        self.board_state.connect_nodes(242, 8)
-
-        self.board_state.connect_nodes(10, 243)
-        self.board_state.connect_nodes(243, 11)
-
-        self.board_state.connect_nodes(13, 244)
-        self.board_state.connect_nodes(244, 14)
-
-        self.board_state.connect_nodes(16, 245)
-        self.board_state.connect_nodes(245, 17)
-
-        self.board_state.connect_nodes(21, 246)
-        self.board_state.connect_nodes(246, 22)
-
-        self.board_state.connect_nodes(25, 247)
-        self.board_state.connect_nodes(247, 26)
-
-        self.board_state.connect_nodes(29, 248)
-        self.board_state.connect_nodes(248, 30)
-
-        self.board_state.connect_nodes(33, 249)
-        self.board_state.connect_nodes(249, 34)
-
-
         # 放置站长标记
         self._place_stations()
 
+    def setup_board(self):
+        """布置版图：初始化地图，从牌堆发牌填充人才市场和未来区"""
+        self.initialize_map()
+        self.labor_market.initialize_from_action_b_deck(self.deck_manager)
+        self.future_area.initialize(self.deck_manager)
+
     def _place_stations(self):
         """
                 在铁路初始化时放置站长标记
                 在指定节点241/242/243/244/245放置站长标记
                 """
-        print("=== 放置站长标记 ===")
+        logger.debug("=== 放置站长标记 ===")
 
         # 从站长标记牌堆抽取5张牌
         building_cards = self.deck_manager.draw_cards(CardType.PUBLIC_BUILDING, 5)
 
         if len(building_cards) < 7:
-            print(f"⚠️ 公有建筑物牌不足7张，只有{len(building_cards)}张")
+            logger.debug(f"⚠️ 公有建筑物牌不足7张，只有{len(building_cards)}张")
 
         # 将卡牌的特殊能力映射到建筑物类型
         ability_to_building = {
@@ -499,24 +391,24 @@ class GameState:
                 if building_type:
                     self._place_public_building(node_id, building_type, card)
                 else:
-                    print(f"❌ 未知的建筑类型: {card.special_ability}")
+                    logger.debug(f"❌ 未知的建筑类型: {card.special_ability}")
             else:
-                print(f"⚠️ 节点{node_id}：没有足够的建筑物牌")
+                logger.debug(f"⚠️ 节点{node_id}：没有足够的建筑物牌")
 
-        print("✅ 公有建筑物放置完成")
+        logger.debug("✅ 公有建筑物放置完成")
 
     def _place_buildings(self):
         """
                 在地图初始化时放置公有建筑物
                 在指定节点1/5/9/10/12/15/17放置建筑物
                 """
-        print("=== 放置公有建筑物 ===")
+        logger.debug("=== 放置公有建筑物 ===")
 
         # 从公有建筑物牌堆抽取7张牌
         building_cards = self.deck_manager.draw_cards(CardType.PUBLIC_BUILDING, 7)
 
         if len(building_cards) < 7:
-            print(f"⚠️ 公有建筑物牌不足7张，只有{len(building_cards)}张")
+            logger.debug(f"⚠️ 公有建筑物牌不足7张，只有{len(building_cards)}张")
 
         # 将卡牌的特殊能力映射到建筑物类型
         ability_to_building = {
@@ -540,27 +432,27 @@ class GameState:
                 if building_type:
                     self._place_public_building(node_id, building_type, card)
                 else:
-                    print(f"❌ 未知的建筑类型: {card.special_ability}")
+                    logger.debug(f"❌ 未知的建筑类型: {card.special_ability}")
             else:
-                print(f"⚠️ 节点{node_id}：没有足够的建筑物牌")
+                logger.debug(f"⚠️ 节点{node_id}：没有足够的建筑物牌")
 
-        print("✅ 公有建筑物放置完成")
+        logger.debug("✅ 公有建筑物放置完成")
 
     def _place_public_building(self, node_id: int, building_type: BuildingType, card):
         """在指定节点放置公有建筑物"""
         if node_id not in self.board_state.nodes:
-            print(f"❌ 节点{node_id}不存在")
+            logger.debug(f"❌ 节点{node_id}不存在")
             return
 
         node = self.board_state.nodes[node_id]
 
         # 检查节点是否可以建造
         if not node.is_buildable():
-            print(f"❌ 节点{node_id}不可建造")
+            logger.debug(f"❌ 节点{node_id}不可建造")
             return
 
-        # 放置建筑物
-        node.building_type = building_type
+        # 放置中立建筑物
+        self.board_state.place_building(node_id, building_type)
 
         # 根据建筑类型添加特定动作
         if building_type == BuildingType.STATION:
@@ -583,107 +475,50 @@ class GameState:
         # 添加通用建筑动作
         node.add_action("use_public_building")
 
-        print(f"✅ 节点{node_id}：放置{card.name}")
+        logger.debug(f"✅ 节点{node_id}：放置{card.name}")
 
     def place_action_a_cards(self):
         """
-        从动作A牌堆抽取7张牌，根据牌属性放置到对应支路
+        从动作A牌堆抽取7张牌，按事件牌类别放置到对应支路的下一个空位
         """
-        print("=== 放置动作A牌到对应支路 ===")
+        logger.debug("=== 放置动作A牌到对应支路 ===")
 
         # 从动作A牌堆抽取7张牌
         action_a_cards = self.deck_manager.draw_cards(CardType.ACTION_A, 7)
-        print(f"从动作A牌堆抽取了 {len(action_a_cards)} 张牌")
-
-        # 定义支路节点范围
-        flood_nodes = [51, 52, 53, 54]  # 水灾支路
-        drought_nodes = [61, 62, 63, 64]  # 旱灾支路
-        rockfall_nodes = [81, 82, 83, 84]  # 落石支路
-        tent_nodes = [101, 102, 103, 104, 105, 106, 107, 108, 109]  # 帐篷支路
-
-        # 初始化支路状态（记录每个支路已放置的牌数）
-        flood_count = 0
-        drought_count = 0
-        rockfall_count = 0
-        tent_count = 0
-
-        for i, card in enumerate(action_a_cards):
-            print(f"\n处理第 {i + 1} 张牌: {card.name}")
-            print(f"  特殊能力: {card.special_ability}")
-
-            placed = False
-
-            # 根据牌的特殊能力判断放置位置
-            if "水灾" in card.description:
-                # 水灾牌放在水灾支路
-                if flood_count < len(flood_nodes):
-                    target_node_id = flood_nodes[flood_count]
-                    placed = self._place_card_on_node(card, target_node_id, "水灾")
-                    if placed:
-                        flood_count += 1
-                        print(f"  ✅ 放置到水灾支路节点 {target_node_id}")
-                else:
-                    print("  ❌ 水灾支路已满，丢弃")
-
-            elif "旱灾" in card.name or card.special_ability in ["-1", "-2"] and "旱灾" in card.description:
-                # 旱灾牌放在旱灾支路
-                if drought_count < len(drought_nodes):
-                    target_node_id = drought_nodes[drought_count]
-                    placed = self._place_card_on_node(card, target_node_id, "旱灾")
-                    if placed:
-                        drought_count += 1
-                        print(f"  ✅ 放置到旱灾支路节点 {target_node_id}")
-                else:
-                    print("  ❌ 旱灾支路已满，丢弃")
-
-            elif "落石" in card.name or card.special_ability in ["-1", "-2"] and "落石" in card.description:
-                # 落石牌放在落石支路
-                if rockfall_count < len(rockfall_nodes):
-                    target_node_id = rockfall_nodes[rockfall_count]
-                    placed = self._place_card_on_node(card, target_node_id, "落石")
-                    if placed:
-                        rockfall_count += 1
-                        print(f"  ✅ 放置到落石支路节点 {target_node_id}")
-                else:
-                    print("  ❌ 落石支路已满，丢弃")
-
-            elif "帐篷" in card.name or "帐篷" in card.description:
-                # 帐篷牌放在帐篷支路
-                if tent_count < len(tent_nodes):
-                    target_node_id = tent_nodes[tent_count]
-                    placed = self._place_card_on_node(card, target_node_id, "帐篷")
-                    if placed:
-                        tent_count += 1
-                        print(f"  ✅ 放置到帐篷支路节点 {target_node_id}")
-                else:
-                    print("  ❌ 帐篷支路已满，丢弃")
+        logger.debug(f"从动作A牌堆抽取了 {len(action_a_cards)} 张牌")
 
-            else:
-                print(f"  ⚠️ 未知牌类型，丢弃: {card.name}")
+        # 每条支路的空位队列
+        free_slots = {category: deque(node_ids) for category, node_ids in EVENT_SLOTS.items()}
+
+        for card in action_a_cards:
+            category = event_category(card)
+            slots = free_slots.get(category)
+            if not slots:
+                logger.debug(f"  🗑️ 丢弃牌: {card.name}（{'支路已满' if slots is not None else '不是事件牌'}）")
+                continue
 
-            if not placed:
-                print(f"  🗑️ 丢弃牌: {card.name}")
+            node_id = slots.popleft()
+            if self._place_card_on_node(card, node_id, category):
+                logger.debug(f"  ✅ {card.name} 放置到{EVENT_LABELS[category]}支路节点 {node_id}")
 
-        print(f"\n✅ 放置完成统计:")
-        print(f"  水灾支路: {flood_count}/{len(flood_nodes)} 张牌")
-        print(f"  旱灾支路: {drought_count}/{len(drought_nodes)} 张牌")
-        print(f"  落石支路: {rockfall_count}/{len(rockfall_nodes)} 张牌")
-        print(f"  帐篷支路: {tent_count}/{len(tent_nodes)} 张牌")
+        logger.debug(f"✅ 放置完成统计:")
+        for category, node_ids in EVENT_SLOTS.items():
+            logger.debug(f"  {EVENT_LABELS[category]}支路: {len(node_ids) - len(free_slots[category])}/{len(node_ids)} 张牌")
 
-    def _place_card_on_node(self, card, node_id, event_type):
+    def _place_card_on_node(self, card, node_id: int, category: EventCategory) -> bool:
         """
-        将牌放置到指定节点上
+        将事件牌放置到指定节点上
         """
         # 检查节点是否存在
         if node_id not in self.board_state.nodes:
-            print(f"  ❌ 节点 {node_id} 不存在")
+            logger.debug(f"  ❌ 节点 {node_id} 不存在")
             return False
 
         node = self.board_state.nodes[node_id]
 
         # 设置节点的事件类型和牌信息
         node.name = card.name
-        node.event_type = event_type
+        node.event_type = EVENT_LABELS[category]
         node.event_card = {
             "card_id": card.card_id,
             "name": card.name,
@@ -692,12 +527,10 @@ class GameState:
         }
 
         # 添加事件相关动作
-        if event_type in ["水灾", "旱灾", "落石"]:
-            node.add_action("avoid_hazard")
-            node.add_action("pay_toll")
-        elif event_type == "帐篷":
-            node.add_action("rest")
-            node.add_action("trade")
+        if category in HAZARD_EVENTS:
+            node.add_action(NodeAction.AVOID_HAZARD | NodeAction.PAY_TOLL)
+        else:
+            node.add_action(NodeAction.REST | NodeAction.TRADE)
 
         return True
 
@@ -708,12 +541,12 @@ class GameState:
     def can_use_building(self, location_id: int, player_id: str) -> bool:
         """检查玩家是否可以使用指定位置的建筑物"""
         building = self.board_state.get_building_at_location(location_id)
-        if not building:
+        if not building or not building.is_usable:
             return False
 
-        # 检查工人数量
+        # 检查工人（工匠）数量
         player = self.get_player_by_id(player_id)
-        if not player or player.resources.workers < building.worker_cost:
+        if not player or player.resources.builders < building.worker_cost:
             return False
 
         # 检查建筑物所有权
@@ -730,8 +563,8 @@ class GameState:
         building = self.board_state.get_building_at_location(location_id)
         player = self.get_player_by_id(player_id)
 
-        # 扣除工人
-        player.resources.workers -= building.worker_cost
+        # 扣除工人（工匠）
+        self.journal.add(player.resources, "builders", -building.worker_cost)
 
         # 更新游戏状态
         self.increment_version()
@@ -743,5 +576,5 @@ class GameState:
             "location_id": location_id,
             "building_type": building.building_type.value,
             "worker_cost": building.worker_cost,
-            "remaining_workers": player.resources.workers
+            "remaining_workers": player.resources.builders
         }
@@ -0,0 +1,95 @@
+from typing import Any, Callable, List
+
+
+class MutationJournal:
+    """
+    变更日志 - 记录每次状态修改的逆操作
+
+    行动对游戏状态的修改都通过日志进行，日志按顺序保存逆操作，
+    回滚时倒序执行即可恢复状态，无需克隆整个游戏状态。
+    用于执行失败时的原子回滚、回合内撤销以及机器人搜索回溯。
+    """
+
+    def __init__(self):
+        self._entries: List[Callable[[], None]] = []  # 逆操作列表
+        self._marks: List[int] = []  # 每个可撤销步骤开始时的日志位置
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # 记录修改
+    def set_attr(self, obj: Any, name: str, value: Any) -> None:
+        """设置对象属性"""
+        old_value = getattr(obj, name)
+        self._entries.append(lambda: setattr(obj, name, old_value))
+        setattr(obj, name, value)
+
+    def add(self, obj: Any, name: str, delta: int) -> None:
+        """在对象的数值属性上增加指定数量（负数表示减少）"""
+        self.set_attr(obj, name, getattr(obj, name) + delta)
+
+    def set_item(self, container: Any, key: Any, value: Any) -> None:
+        """设置字典键或列表元素"""
+        try:
+            old_value = container[key]
+            self._entries.append(lambda: container.__setitem__(key, old_value))
+        except (KeyError, IndexError):
+            self._entries.append(lambda: container.pop(key, None))
+        container[key] = value
+
+    def append(self, items: List[Any], item: Any) -> None:
+        """向列表末尾添加元素"""
+        items.append(item)
+        self._entries.append(items.pop)
+
+    def remove(self, items: List[Any], item: Any) -> None:
+        """从列表中移除元素"""
+        index = items.index(item)
+        del items[index]
+        self._entries.append(lambda: items.insert(index, item))
+
+    def pop(self, items: List[Any], index: int = -1) -> Any:
+        """弹出列表元素"""
+        if index < 0:
+            index += len(items)
+        item = items.pop(index)
+        self._entries.append(lambda: items.insert(index, item))
+        return item
+
+    def record(self, undo: Callable[[], None]) -> None:
+        """记录自定义逆操作（修改由调用方完成，例如同时维护多个索引）"""
+        self._entries.append(undo)
+
+    # 回滚与撤销
+    def checkpoint(self) -> int:
+        """获取当前日志位置，用于之后回滚到此处"""
+        return len(self._entries)
+
+    def begin(self) -> int:
+        """标记一个可撤销步骤的开始，返回其日志位置"""
+        checkpoint = self.checkpoint()
+        self._marks.append(checkpoint)
+        return checkpoint
+
+    def rollback(self, checkpoint: int = 0) -> None:
+        """倒序执行逆操作，将状态恢复到指定日志位置"""
+        while len(self._entries) > checkpoint:
+            self._entries.pop()()
+        while self._marks and self._marks[-1] >= checkpoint:
+            self._marks.pop()
+
+    def undo(self) -> bool:
+        """撤销最近一个步骤，没有可撤销的步骤时返回False"""
+        if not self._marks:
+            return False
+        self.rollback(self._marks[-1])
+        return True
+
+    def can_undo(self) -> bool:
+        """是否有可撤销的步骤"""
+        return bool(self._marks)
+
+    def clear(self) -> None:
+        """清空日志（例如回合结束后不再允许撤销）"""
+        self._entries.clear()
+        self._marks.clear()
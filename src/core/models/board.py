@@ -1,9 +1,13 @@
 # src/core/models/board.py
-from typing import Dict, List, Optional, Any, ClassVar
+from typing import Dict, Iterable, List, Optional, Any, ClassVar, Set, Union
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntFlag, auto
 
 from src.core.models import ActionType
+from ..journal import MutationJournal
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class LocationType(Enum):
@@ -18,6 +22,55 @@ class LocationType(Enum):
     CITY = "city"
 
 
+class NodeAction(IntFlag):
+    """
+    节点动作位标志 - 节点可执行的动作集合用按位或组合
+
+    序列化保存的是位值，新动作只能追加在末尾，不能调整已有动作的顺序。
+    """
+    NONE = 0
+    MOVE = auto()
+    START_TURN = auto()
+    CATTLE_SALE = auto()
+    END_TURN = auto()
+    TRAIN_MOVE = auto()
+    BUILD = auto()
+    BUY_CATTLE = auto()
+    HIRE_WORKER = auto()
+    AVOID_HAZARD = auto()
+    GAIN_CERTIFICATE = auto()
+    SEND_MESSAGE = auto()
+    REMOTE_TRADE = auto()
+    PRAY = auto()
+    BLESSING = auto()
+    USE_PUBLIC_BUILDING = auto()
+    PAY_TOLL = auto()
+    REST = auto()
+    TRADE = auto()
+
+    @classmethod
+    def parse(cls, action: Union['NodeAction', str]) -> 'NodeAction':
+        """将动作名称（如 "buy_cattle"）转换为位标志"""
+        if isinstance(action, cls):
+            return action
+        try:
+            return cls[action.upper()]
+        except KeyError:
+            raise ValueError(f"未知的节点动作: {action}")
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> 'NodeAction':
+        """将动作名称列表转换为位标志组合"""
+        flags = cls.NONE
+        for name in names:
+            flags |= cls.parse(name)
+        return flags
+
+    def names(self) -> List[str]:
+        """位标志组合对应的动作名称列表（按定义顺序）"""
+        return [member.name.lower() for member in NodeAction if member & self]
+
+
 class BuildingType(Enum):
     """建筑物类型枚举"""
     STATION = "station"
@@ -114,34 +167,39 @@ class Building:
     is_neutral: bool = False  # 是否是中立建筑
 
     @property
-    def config(self) -> BuildingConfig:
-        """获取建筑物配置"""
-        return BuildingConfig.CONFIG_MAP[self.building_type]
+    def config(self) -> Optional[BuildingConfig]:
+        """获取建筑物配置（险地、电报站、教堂等公有建筑没有配置，返回 None）"""
+        return BuildingConfig.CONFIG_MAP.get(self.building_type)
+
+    @property
+    def is_usable(self) -> bool:
+        """建筑物是否可以使用（只有有配置的建筑物才能使用）"""
+        return self.config is not None
 
     @property
     def name(self) -> str:
         """建筑物名称"""
-        return self.config.name
+        return self.config.name if self.config else self.building_type.value
 
     @property
-    def worker_cost(self) -> int:
+    def worker_cost(self) -> Optional[int]:
         """需要的工人数量"""
-        return self.config.worker_cost
+        return self.config.worker_cost if self.config else None
 
     @property
     def victory_points(self) -> int:
         """胜利分数"""
-        return self.config.victory_points
+        return self.config.victory_points if self.config else 0
 
     @property
     def actions(self) -> List[str]:
         """可执行的动作列表"""
-        return self.config.actions
+        return self.config.actions if self.config else []
 
     @property
     def description(self) -> str:
         """建筑物描述"""
-        return self.config.description
+        return self.config.description if self.config else ""
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -170,7 +228,7 @@ class Building:
         return building
 
 
-@dataclass
+@dataclass(slots=True)
 class MapNode:
     """
     地图节点类 - 代表地图上的一个具体位置
@@ -183,7 +241,8 @@ class MapNode:
     - next_nodes: 可前往的后继节点ID列表
     - previous_nodes: 可返回的前驱节点ID列表
     - x, y: 可视化坐标 (用于前端展示)
-    - actions: 在该节点可执行的动作列表
+    - action_flags: 在该节点可执行的动作 (NodeAction位标志)
+    - event_type, event_card: 放置在该节点的事件牌
     """
     node_id: int
     name: str = ""
@@ -193,7 +252,14 @@ class MapNode:
     previous_nodes: List[int] = field(default_factory=list)
     x: float = 0.0
     y: float = 0.0
-    actions: List[str] = field(default_factory=list)
+    action_flags: NodeAction = NodeAction.NONE
+    event_type: Optional[str] = None
+    event_card: Optional[Dict[str, Any]] = None
+
+    @property
+    def actions(self) -> List[str]:
+        """在该节点可执行的动作名称列表"""
+        return self.action_flags.names()
 
     def add_next_node(self, node_id: int):
         """添加一个后继节点"""
@@ -205,25 +271,50 @@ class MapNode:
         if node_id not in self.previous_nodes:
             self.previous_nodes.append(node_id)
 
-    def add_action(self, action: str):
+    def add_action(self, action: Union[NodeAction, str]):
         """添加一个可执行动作"""
-        if action not in self.actions:
-            self.actions.append(action)
+        self.action_flags |= NodeAction.parse(action)
 
-    def remove_action(self, action: str):
+    def remove_action(self, action: Union[NodeAction, str]):
         """移除一个动作"""
-        if action in self.actions:
-            self.actions.remove(action)
+        self.action_flags &= ~NodeAction.parse(action)
+
+    def has_action(self, action: Union[NodeAction, str]) -> bool:
+        """检查节点是否可执行指定动作（传入组合时要求全部可执行）"""
+        flags = NodeAction.parse(action)
+        return self.action_flags & flags == flags
 
     def has_building(self) -> bool:
         """检查节点是否有建筑"""
-        return self.building_type is not None
+        return self.building_type not in (None, BuildingType.EMPTY)
 
     def is_buildable(self) -> bool:
         """检查节点是否可以建造建筑"""
         return (self.location_type == LocationType.NORMAL and
                 not self.has_building())
 
+    def copy(self) -> 'MapNode':
+        """复制节点（连线列表和事件牌各自独立）"""
+        return MapNode(
+            self.node_id, self.name, self.location_type, self.building_type,
+            list(self.next_nodes), list(self.previous_nodes), self.x, self.y, self.action_flags,
+            self.event_type, dict(self.event_card) if self.event_card is not None else None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（动作保存为 NodeAction 位值）"""
+        return {
+            "node_id": self.node_id,
+            "name": self.name,
+            "location_type": self.location_type.value,
+            "building_type": self.building_type.value if self.building_type else None,
+            "next_nodes": self.next_nodes,
+            "previous_nodes": self.previous_nodes,
+            "x": self.x,
+            "y": self.y,
+            "actions": int(self.action_flags),
+        }
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MapNode':
         """从字典创建节点实例"""
@@ -231,6 +322,13 @@ class MapNode:
         location_type = LocationType(data["location_type"]) if data.get("location_type") else LocationType.NORMAL
         building_type = BuildingType(data["building_type"]) if data.get("building_type") else None
 
+        # 动作保存为 NodeAction 位值，兼容旧数据中的动作名称列表
+        actions = data.get("actions", 0)
+        if isinstance(actions, int):
+            action_flags = NodeAction(actions)
+        else:
+            action_flags = NodeAction.from_names(actions)
+
         return cls(
             node_id=data["node_id"],
             name=data.get("name", ""),
@@ -240,21 +338,29 @@ class MapNode:
             previous_nodes=data.get("previous_nodes", []),
             x=data.get("x", 0),
             y=data.get("y", 0),
-            actions=data.get("actions", [])
+            action_flags=action_flags
         )
 
 
 @dataclass
 class BoardState:
-    """版图状态"""
+    """
+    版图状态
+
+    建筑物按位置保存在 buildings 中，同时维护拥有者和建筑类型到位置集合的索引，
+    所有放置和移除都通过 place_building/remove_building 进行，保证索引一致。
+    """
 
     def __init__(self):
         self.nodes = {}
-        self.neutral_buildings = []
-        self.player_buildings = {}
         self.available_locations = []
         self.kansas_city_state = {}
 
+        # 建筑物索引：位置 -> 建筑物，拥有者 -> 位置集合（中立建筑为 None），建筑类型 -> 位置集合
+        self.buildings: Dict[int, Building] = {}
+        self.owner_locations: Dict[Optional[str], Set[int]] = {}
+        self.type_locations: Dict[BuildingType, Set[int]] = {}
+
     def initialize_nodes(self):
         """初始化所有地图节点"""
         # 清空现有节点
@@ -315,7 +421,7 @@ class BoardState:
         #         y=150 + (node_id // 10) * 30
         #     )
 
-        print(f"已初始化 {len(self.nodes)} 个地图节点")
+        logger.debug(f"已初始化 {len(self.nodes)} 个地图节点")
 
     # 其他现有方法保持不变...
     def connect_nodes(self, from_id: int, to_id: int):
@@ -326,21 +432,92 @@ class BoardState:
             if from_id not in self.nodes[to_id].previous_nodes:
                 self.nodes[to_id].previous_nodes.append(from_id)
 
-    def place_building(self, node_id: int, building_type: BuildingType, owner_id: Optional[str] = None):
-        """在指定节点放置建筑"""
-        if node_id in self.nodes:
-            self.nodes[node_id].building_type = building_type
-            print(f"在节点 {node_id} 放置了 {building_type.value}")
-        else:
-            print(f"错误：节点 {node_id} 不存在")
+    def nodes_with_action(self, action: Union[NodeAction, str]) -> List[int]:
+        """获取可执行指定动作的节点ID列表"""
+        flags = NodeAction.parse(action)
+        return [node_id for node_id, node in self.nodes.items() if node.action_flags & flags == flags]
+
+    def place_building(self, node_id: int, building_type: BuildingType, owner_id: Optional[str] = None,
+                       journal: Optional[MutationJournal] = None) -> Optional[Building]:
+        """
+        在指定节点放置建筑（替换节点上原有的建筑）
+
+        Args:
+            node_id: 节点ID
+            building_type: 建筑类型
+            owner_id: 拥有者ID，为空时是中立建筑
+            journal: 变更日志，提供时放置可以回滚
+        """
+        if node_id not in self.nodes:
+            logger.warning(f"错误：节点 {node_id} 不存在")
+            return None
+
+        building = Building(building_type=building_type, location_id=node_id,
+                            owner_id=owner_id, is_neutral=owner_id is None)
+        self._replace_building(node_id, building, journal)
+        logger.debug(f"在节点 {node_id} 放置了 {building_type.value}")
+        return building
+
+    def remove_building(self, location_id: int, journal: Optional[MutationJournal] = None) -> Optional[Building]:
+        """移除指定位置的建筑，返回被移除的建筑"""
+        if location_id not in self.buildings:
+            return None
+        return self._replace_building(location_id, None, journal)
+
+    def _replace_building(self, location_id: int, building: Optional[Building],
+                          journal: Optional[MutationJournal] = None) -> Optional[Building]:
+        """替换位置上的建筑并同步节点的建筑类型，返回原来的建筑"""
+        node = self.nodes.get(location_id)
+        if node is not None:
+            building_type = building.building_type if building else BuildingType.EMPTY
+            if journal is not None:
+                journal.set_attr(node, "building_type", building_type)
+            else:
+                node.building_type = building_type
+
+        previous = self._index_building(location_id, building)
+        if journal is not None:
+            journal.record(lambda: self._index_building(location_id, previous))
+        return previous
+
+    def _index_building(self, location_id: int, building: Optional[Building]) -> Optional[Building]:
+        """更新位置上的建筑及拥有者、类型索引，返回原来的建筑"""
+        previous = self.buildings.pop(location_id, None)
+        if previous is not None:
+            for index, key in ((self.owner_locations, previous.owner_id), (self.type_locations, previous.building_type)):
+                locations = index[key]
+                locations.discard(location_id)
+                if not locations:
+                    del index[key]
+
+        if building is not None:
+            self.buildings[location_id] = building
+            self.owner_locations.setdefault(building.owner_id, set()).add(location_id)
+            self.type_locations.setdefault(building.building_type, set()).add(location_id)
+        return previous
 
     def get_building_at_location(self, location_id: int) -> Optional[Building]:
         """获取指定位置的建筑物"""
         return self.buildings.get(location_id)
 
     def get_player_buildings(self, player_id: str) -> List[Building]:
-        """获取玩家的所有建筑物"""
-        return self.player_buildings.get(player_id, [])
+        """获取玩家的所有建筑物（按位置排序）"""
+        return [self.buildings[location_id] for location_id in sorted(self.owner_locations.get(player_id, ()))]
+
+    def get_buildings_by_type(self, building_type: BuildingType) -> List[Building]:
+        """获取指定类型的所有建筑物（按位置排序）"""
+        return [self.buildings[location_id] for location_id in sorted(self.type_locations.get(building_type, ()))]
+
+    @property
+    def neutral_buildings(self) -> List[Building]:
+        """中立建筑物列表"""
+        return self.get_player_buildings(None)
+
+    @property
+    def player_buildings(self) -> Dict[str, List[Building]]:
+        """玩家 -> 建筑物列表"""
+        return {owner_id: self.get_player_buildings(owner_id)
+                for owner_id in self.owner_locations if owner_id is not None}
 
     def get_available_actions_at_location(self, location_id: int, player_id: str) -> List[Dict[str, Any]]:
         """获取在指定位置可用的动作"""
@@ -386,8 +563,6 @@ class BoardState:
         return {
             "nodes": {k: self._node_to_dict(v) for k, v in self.nodes.items()},
             "buildings": {k: v.to_dict() for k, v in self.buildings.items()},
-            "neutral_buildings": [b.to_dict() for b in self.neutral_buildings],
-            "player_buildings": {k: [b.to_dict() for b in v] for k, v in self.player_buildings.items()},
             "available_locations": self.available_locations,
             "kansas_city_state": self.kansas_city_state
         }
@@ -403,18 +578,18 @@ class BoardState:
                 node_id = int(node_id_str)
                 board.nodes[node_id] = MapNode.from_dict(node_data)
 
-        # 重建建筑物
-        if "buildings" in data:
-            for location_str, building_data in data["buildings"].items():
-                location_id = int(location_str)
-                board.buildings[location_id] = Building.from_dict(building_data)
+        # 重建建筑物和索引（兼容旧数据中分开保存的中立建筑和玩家建筑）
+        buildings = [Building.from_dict(b) for b in data.get("buildings", {}).values()]
+        buildings += [Building.from_dict(b) for b in data.get("neutral_buildings", [])]
+        for player_id, player_buildings in data.get("player_buildings", {}).items():
+            for building_data in player_buildings:
+                building = Building.from_dict(building_data)
+                building.owner_id = building.owner_id or building_data.get("built_by", player_id)
+                buildings.append(building)
+        for building in buildings:
+            board._index_building(building.location_id, building)
 
         # 重建其他数据
-        board.neutral_buildings = [Building.from_dict(b) for b in data.get("neutral_buildings", [])]
-        board.player_buildings = {
-            player_id: [Building.from_dict(b) for b in buildings]
-            for player_id, buildings in data.get("player_buildings", {}).items()
-        }
         board.available_locations = data.get("available_locations", [])
         board.kansas_city_state = data.get("kansas_city_state", {})
 
@@ -1,8 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Mapping, Optional, Any
 import random
 from .enums import CardType
 from .card import Card
+from ..journal import MutationJournal
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -26,11 +30,18 @@ class DeckConfig:
 
 @dataclass
 class Deck:
-    """牌堆类 - 管理一种类型的牌"""
+    """
+    牌堆类 - 管理一种类型的牌
+
+    抽牌时洗牌模式（shuffle_on_draw）下不预先洗牌，cards 为无序的剩余牌，
+    每次抽牌从剩余牌中随机取一张（增量 Fisher-Yates），抽牌顺序的分布与预先洗牌相同。
+    """
 
     card_type: CardType
     cards: List[Card] = field(default_factory=list)
     discarded: List[Card] = field(default_factory=list)
+    shuffle_on_draw: bool = False
+    rng: Optional[random.Random] = field(default=None, repr=False, compare=False)  # 为空时使用 random 模块
 
     def initialize_from_config(self, config: DeckConfig):
         """根据配置初始化牌堆"""
@@ -52,25 +63,51 @@ class Deck:
 
         # 洗牌
         self.shuffle()
-        print(f"✅ 初始化 {self.card_type.value} 牌堆: {len(self.cards)} 张牌")
+        logger.debug(f"✅ 初始化 {self.card_type.value} 牌堆: {len(self.cards)} 张牌")
 
     def shuffle(self):
-        """洗牌"""
-        random.shuffle(self.cards)
-
-    def draw(self, count: int = 1) -> List[Card]:
-        """从牌堆顶部抽取指定数量的牌（无放回）"""
+        """洗牌（抽牌时洗牌模式下推迟到抽牌时进行）"""
+        if not self.shuffle_on_draw:
+            (self.rng or random).shuffle(self.cards)
+
+    def draw(self, count: int = 1, journal: Optional[MutationJournal] = None) -> List[Card]:
+        """
+        从牌堆顶部抽取指定数量的牌（无放回）
+
+        Args:
+            count: 抽牌数量
+            journal: 变更日志，提供时抽牌可以回滚
+        """
         if count > len(self.cards):
             # 如果牌不够，可以尝试从弃牌堆重新洗牌（如果需要）
             available = len(self.cards)
-            print(f"⚠️ 牌堆不足: 需要{count}张，但只有{available}张可用")
+            logger.debug(f"⚠️ 牌堆不足: 需要{count}张，但只有{available}张可用")
             count = available
 
+        if self.shuffle_on_draw:
+            return [self._draw_random(journal) for _ in range(count)]
+
         drawn_cards = self.cards[:count]
-        self.cards = self.cards[count:]
+        if journal is not None:
+            journal.set_attr(self, "cards", self.cards[count:])
+        else:
+            self.cards = self.cards[count:]
 
         return drawn_cards
 
+    def _draw_random(self, journal: Optional[MutationJournal] = None) -> Card:
+        """从剩余牌中随机抽一张：用最后一张牌填补空位后弹出末尾"""
+        cards = self.cards
+        index = (self.rng or random).randrange(len(cards))
+        card = cards[index]
+        if journal is not None:
+            journal.set_item(cards, index, cards[-1])
+            journal.pop(cards)
+        else:
+            cards[index] = cards[-1]
+            cards.pop()
+        return card
+
     def discard(self, cards: List[Card]):
         """将牌放入弃牌堆"""
         self.discarded.extend(cards)
@@ -81,7 +118,7 @@ class Deck:
             self.cards.extend(self.discarded)
             self.discarded = []
             self.shuffle()
-            print(f"✅ 已重新洗牌: {len(self.cards)} 张牌")
+            logger.debug(f"✅ 已重新洗牌: {len(self.cards)} 张牌")
 
     def get_remaining_count(self) -> int:
         """获取剩余牌数量"""
@@ -93,16 +130,19 @@ class Deck:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典（用于序列化）"""
-        return {
+        data = {
             "card_type": self.card_type.value,
             "cards": [card.to_dict() for card in self.cards],
             "discarded": [card.to_dict() for card in self.discarded]
         }
+        if self.shuffle_on_draw:
+            data["shuffle_on_draw"] = True
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Deck':
         """从字典创建实例"""
-        deck = cls(card_type=CardType(data["card_type"]))
+        deck = cls(card_type=CardType(data["card_type"]), shuffle_on_draw=data.get("shuffle_on_draw", False))
 
         # 重建牌堆
         for card_data in data.get("cards", []):
@@ -119,6 +159,40 @@ class Deck:
         return deck
 
 
+class LazyDecks(dict):
+    """
+    按需创建的牌堆映射 - 某类牌堆第一次被访问时才由工厂创建
+
+    未创建的牌堆只记录牌数，不创建牌对象，也不参与序列化；
+    这样的牌堆从未被抽过牌，反序列化后再次访问时重新创建即可。
+    """
+
+    def __init__(self, factory: Callable[[CardType], Deck], sizes: Mapping[CardType, int]):
+        super().__init__()
+        self.factory = factory
+        self.sizes = sizes
+
+    def __missing__(self, card_type: CardType) -> Deck:
+        if card_type not in self.sizes:
+            raise KeyError(card_type)
+        deck = self[card_type] = self.factory(card_type)
+        return deck
+
+    def __contains__(self, card_type) -> bool:
+        return super().__contains__(card_type) or card_type in self.sizes
+
+    def get(self, card_type: CardType, default=None) -> Optional[Deck]:
+        try:
+            return self[card_type]
+        except KeyError:
+            return default
+
+    def pending_sizes(self) -> Dict[CardType, int]:
+        """尚未创建的牌堆及其牌数"""
+        return {card_type: size for card_type, size in self.sizes.items()
+                if not dict.__contains__(self, card_type)}
+
+
 @dataclass
 class DeckManager:
     """牌堆管理器 - 管理所有类型的牌堆"""
@@ -134,19 +208,20 @@ class DeckManager:
             deck.initialize_from_config(config)
             self.decks[card_type] = deck
 
-        print("✅ 所有牌堆初始化完成")
+        logger.debug("✅ 所有牌堆初始化完成")
 
     def get_deck(self, card_type: CardType) -> Optional[Deck]:
         """获取指定类型的牌堆"""
         return self.decks.get(card_type)
 
-    def draw_cards(self, card_type: CardType, count: int = 1) -> List[Card]:
+    def draw_cards(self, card_type: CardType, count: int = 1,
+                   journal: Optional[MutationJournal] = None) -> List[Card]:
         """从指定牌堆抽取牌"""
         deck = self.get_deck(card_type)
         if deck:
-            return deck.draw(count)
+            return deck.draw(count, journal)
         else:
-            print(f"❌ 未找到牌堆: {card_type.value}")
+            logger.warning(f"❌ 未找到牌堆: {card_type.value}")
             return []
 
     def discard_cards(self, card_type: CardType, cards: List[Card]):
@@ -155,7 +230,7 @@ class DeckManager:
         if deck:
             deck.discard(cards)
         else:
-            print(f"❌ 未找到牌堆: {card_type.value}")
+            logger.warning(f"❌ 未找到牌堆: {card_type.value}")
 
     def reshuffle_deck(self, card_type: CardType):
         """重新洗牌指定牌堆的弃牌"""
@@ -163,7 +238,7 @@ class DeckManager:
         if deck:
             deck.reshuffle_discarded()
         else:
-            print(f"❌ 未找到牌堆: {card_type.value}")
+            logger.warning(f"❌ 未找到牌堆: {card_type.value}")
 
     def get_deck_status(self) -> Dict[CardType, Dict[str, int]]:
         """获取所有牌堆的状态"""
@@ -174,6 +249,9 @@ class DeckManager:
                 "discarded": deck.get_discarded_count(),
                 "total": deck.get_remaining_count() + deck.get_discarded_count()
             }
+        if isinstance(self.decks, LazyDecks):
+            for card_type, size in self.decks.pending_sizes().items():
+                status[card_type] = {"remaining": size, "discarded": 0, "total": size}
         return status
 
     def to_dict(self) -> Dict[str, Any]:
@@ -24,6 +24,7 @@ class ActionType(Enum):
     BUY_CATTLE = "buy_cattle"  # 购买牛牌
     SELL_CATTLE = "sell_cattle"  # 卖出牛群
     USE_ABILITY = "use_ability"  # 使用能力
+    PASS = "pass"  # 跳过回合（回合超时时自动执行）
 
 
 
@@ -45,6 +46,14 @@ class CardType(Enum):
     STATION_FLAG = "station_flag"  # 站长标记
 
 
+class EventCategory(Enum):
+    """事件牌（动作A牌）类别 - 决定开局时放到哪条支路"""
+    FLOOD = "flood"  # 水灾
+    DROUGHT = "drought"  # 旱灾
+    ROCKFALL = "rockfall"  # 落石
+    TENT = "tent"  # 帐篷
+
+
 class AuxiliaryAbility(Enum):
     GOLD_1 = "gold_1"      # 1金币
     GOLD_2 = "gold_2"      # 2金币
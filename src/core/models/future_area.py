@@ -7,6 +7,9 @@ import random
 
 from .enums import CardType
 from .deck_manager import DeckManager, DeckConfig
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class FutureAreaColumnType(Enum):
@@ -51,7 +54,7 @@ class FutureArea:
         Args:
             deck_manager: 牌堆管理器
         """
-        print("=== 初始化未来区 ===")
+        logger.debug("=== 初始化未来区 ===")
 
         # 清空网格
         self.grid = [[None, None, None], [None, None, None]]
@@ -60,7 +63,7 @@ class FutureArea:
         for col in range(3):
             self._fill_column(col, deck_manager)
 
-        print("✅ 未来区初始化完成")
+        logger.debug("✅ 未来区初始化完成")
 
     def _fill_column(self, col: int, deck_manager: DeckManager):
         """
@@ -90,7 +93,7 @@ class FutureArea:
         for row in range(2):
             if row < len(cards):
                 self.grid[row][col] = self._card_to_dict(cards[row])
-                print(f"  未来区[{row}][{col}]: {cards[row].name} ({card_type.value})")
+                logger.debug(f"  未来区[{row}][{col}]: {cards[row].name} ({card_type.value})")
             else:
                 self.grid[row][col] = None
 
@@ -179,7 +182,7 @@ class FutureArea:
         # 填充到指定位置
         if cards:
             self.grid[row][col] = self._card_to_dict(cards[0])
-            print(f"  补充未来区[{row}][{col}]: {cards[0].name}")
+            logger.debug(f"  补充未来区[{row}][{col}]: {cards[0].name}")
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典 (用于序列化)"""
@@ -207,8 +210,8 @@ class FutureArea:
 
     def display(self):
         """显示未来区状态 (用于调试)"""
-        print("\n=== 未来区状态 ===")
-        print("    列0(动作A)  列1(动作B)  列2(动作C)")
+        logger.debug("=== 未来区状态 ===")
+        logger.debug("    列0(动作A)  列1(动作B)  列2(动作C)")
 
         for row in range(2):
             row_display = f"行{row}: "
@@ -220,4 +223,4 @@ class FutureArea:
                     row_display += f"{name_abbr:^12}"
                 else:
                     row_display += f"{'空':^12}"
-            print(row_display)
\ No newline at end of file
+            logger.debug(row_display)
\ No newline at end of file
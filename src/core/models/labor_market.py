@@ -1,11 +1,15 @@
 # src/core/models/labor_market.py
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import random
 from .enums import WorkerType
 from .deck_manager import DeckManager
 from .enums import CardType
+from ..journal import MutationJournal
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -29,19 +33,19 @@ class LaborMarket:
         """初始化后自动创建空矩阵"""
         # 初始化空矩阵
         self.workers_matrix = [[None for _ in range(self.columns)] for _ in range(self.rows)]
-        print("✅ 人才市场空矩阵初始化完成")
+        logger.debug("✅ 人才市场空矩阵初始化完成")
 
     def initialize_from_action_b_deck(self, deck_manager):
         """
         从action_b牌堆中抽取工人来初始化人才市场的前7个格子
         """
-        print("=== 从action_b牌堆初始化人才市场前7个格子 ===")
+        logger.debug("=== 从action_b牌堆初始化人才市场前7个格子 ===")
 
         # 从action_b牌堆抽取7张牌
         action_b_cards = deck_manager.draw_cards(CardType.ACTION_B, 7)
 
         if len(action_b_cards) < 7:
-            print(f"⚠️ action_b牌堆不足7张牌，只有{len(action_b_cards)}张")
+            logger.debug(f"⚠️ action_b牌堆不足7张牌，只有{len(action_b_cards)}张")
 
         # 将action_b卡牌映射为工人类型
         worker_mapping = {
@@ -61,7 +65,7 @@ class LaborMarket:
                 col = i % self.columns
 
                 self.workers_matrix[row][col] = worker_type
-                print(f"  位置[{row},{col}]：{card.name} -> {worker_type.value}")
+                logger.debug(f"  位置[{row},{col}]：{card.name} -> {worker_type.value}")
             else:
                 # 如果卡牌名称不匹配，使用随机工人类型
                 random_worker = random.choice(list(WorkerType))
@@ -69,11 +73,11 @@ class LaborMarket:
                 col = i % self.columns
 
                 self.workers_matrix[row][col] = random_worker
-                print(f"  位置[{row},{col}]：{card.name}（未映射）-> 随机{random_worker.value}")
+                logger.debug(f"  位置[{row},{col}]：{card.name}（未映射）-> 随机{random_worker.value}")
 
         # 设置下一个要填充的格子索引
         self.next_fill_index = min(7, len(action_b_cards))
-        print(f"✅ 人才市场初始化完成：已填充{self.next_fill_index}个格子，下一个填充索引: {self.next_fill_index}")
+        logger.debug(f"✅ 人才市场初始化完成：已填充{self.next_fill_index}个格子，下一个填充索引: {self.next_fill_index}")
 
         # 显示初始化后的状态
         self.display_market()
@@ -83,14 +87,14 @@ class LaborMarket:
         按照顺序填充下一个格子
         """
         if self.next_fill_index >= self.rows * self.columns:
-            print("⚠️ 人才市场已满，无法继续填充")
+            logger.debug("⚠️ 人才市场已满，无法继续填充")
             return False
 
         # 从action_b牌堆抽取1张牌
         action_b_cards = deck_manager.draw_cards(CardType.ACTION_B, 1)
 
         if not action_b_cards:
-            print("⚠️ action_b牌堆为空，无法填充")
+            logger.debug("⚠️ action_b牌堆为空，无法填充")
             return False
 
         card = action_b_cards[0]
@@ -110,30 +114,42 @@ class LaborMarket:
 
         if worker_type:
             self.workers_matrix[row][col] = worker_type
-            print(f"✅ 填充位置[{row},{col}]：{card.name} -> {worker_type.value}")
+            logger.debug(f"✅ 填充位置[{row},{col}]：{card.name} -> {worker_type.value}")
         else:
             # 如果卡牌名称不匹配，使用随机工人类型
             random_worker = random.choice(list(WorkerType))
             self.workers_matrix[row][col] = random_worker
-            print(f"✅ 填充位置[{row},{col}]：{card.name}（未映射）-> 随机{random_worker.value}")
+            logger.debug(f"✅ 填充位置[{row},{col}]：{card.name}（未映射）-> 随机{random_worker.value}")
 
         # 更新下一个要填充的格子索引
         self.next_fill_index += 1
-        print(f"下一个填充索引: {self.next_fill_index}")
+        logger.debug(f"下一个填充索引: {self.next_fill_index}")
 
         return True
 
-    def hire_worker(self, row: int, column: int) -> Optional[WorkerType]:
-        """雇佣指定位置的工人(返回工人类型,并将位置设为空)"""
+    def hire_worker(self, row: int, column: int,
+                    journal: Optional[MutationJournal] = None) -> Optional[WorkerType]:
+        """雇佣指定位置的工人(返回工人类型,并将位置设为空；提供变更日志时可回滚)"""
         if 0 <= row < self.rows and 0 <= column < self.columns:
             worker = self.workers_matrix[row][column]
-            self.workers_matrix[row][column] = None
+            if journal is not None:
+                journal.set_item(self.workers_matrix[row], column, None)
+            else:
+                self.workers_matrix[row][column] = None
             return worker
         return None
 
+    def find_worker(self, worker_type: WorkerType) -> Optional[Tuple[int, int]]:
+        """查找指定类型的工人所在位置(按行号从小到大,即价格从低到高),没有时返回 None"""
+        for row in range(self.rows):
+            for column in range(self.columns):
+                if self.workers_matrix[row][column] == worker_type:
+                    return row, column
+        return None
+
     def refill_market(self, deck_manager):
         """补充市场空缺 - 按照顺序填充下一个格子"""
-        print("=== 按照顺序补充人才市场 ===")
+        logger.debug("=== 按照顺序补充人才市场 ===")
         return self.fill_next_slot(deck_manager)
 
     def get_worker(self, row: int, column: int) -> Optional[WorkerType]:
@@ -150,9 +166,9 @@ class LaborMarket:
 
     def display_market(self):
         """显示人才市场状态(用于调试)"""
-        print("\n=== 人才市场当前状态 ===")
-        print("行号 | 价格 | 工人类型")
-        print("-" * 40)
+        logger.debug("=== 人才市场当前状态 ===")
+        logger.debug("行号 | 价格 | 工人类型")
+        logger.debug("-" * 40)
 
         for i in range(self.rows):
             price = self.get_row_price(i)
@@ -162,7 +178,7 @@ class LaborMarket:
                 workers.append(worker.value if worker else "空")
 
             workers_str = " | ".join(workers)
-            print(f"{i:2d} | ${price:2d} | {workers_str}")
+            logger.debug(f"{i:2d} | ${price:2d} | {workers_str}")
 
     def to_dict(self) -> Dict[str, any]:
         """转换为字典(用于序列化)"""
@@ -88,6 +88,11 @@ class PlayerState:
     # 16种辅助能力
     auxiliary_abilities: List[AuxiliaryAbilityState] = field(default_factory=list)
 
+    @property
+    def hand_cards(self) -> List[Dict[str, Any]]:
+        """手牌（保存在卡牌管理器中，行动通过变更日志直接修改该列表）"""
+        return self.card_manager.hand_cards
+
     def __post_init__(self):
         """初始化后设置默认的辅助能力"""
         if not self.auxiliary_abilities:
@@ -3,6 +3,6 @@
 """
 
 from .engine import RuleEngine
-from .validator import ActionValidator
+from .validator import ActionValidator, ActionContext
 
-__all__ = ['RuleEngine', 'ActionValidator']
\ No newline at end of file
+__all__ = ['RuleEngine', 'ActionValidator', 'ActionContext']
\ No newline at end of file
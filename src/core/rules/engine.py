@@ -1,7 +1,17 @@
-from typing import Dict, Any
-from .validator import ActionValidator
+from typing import Dict, Any, List, Optional
+from .validator import ActionValidator, ActionContext
 from ..game_state import GameState
 from ..models.enums import ActionType, GamePhase
+from ..models.player import PlayerState
+from ...utils.metrics import metrics, timer
+
+metrics.histogram("rule_engine_execute_action_seconds", "RuleEngine执行行动耗时")
+
+# 预览时比较的玩家字段
+PREVIEW_PLAYER_FIELDS = [
+    "position", "previous_position", "victory_points", "stations_built",
+    "cattle_sold_count", "buildings_built_count", "workers_hired_count"
+]
 
 class RuleEngine:
     """游戏规则引擎 - 执行游戏规则"""
@@ -21,53 +31,127 @@ class RuleEngine:
         Returns:
             执行结果
         """
-        # 1. 验证行动
-        is_valid, message = self.validator.validate_action(action_type, action_data)
-        if not is_valid:
-            return {
-                "success": False,
-                "message": message,
-                "action_type": action_type.value
-            }
-
-        # 2. 执行行动
+        with timer("rule_engine_execute_action_seconds", action_type=action_type.value):
+            # 1. 验证行动（解析出的玩家、成本等保存在上下文中，执行时直接使用）
+            context = self.validator.resolve_action(action_type, action_data)
+            if not context.is_valid:
+                return {
+                    "success": False,
+                    "message": context.message,
+                    "action_type": action_type.value
+                }
+
+            # 2. 执行行动（所有修改记录在变更日志中，失败时原子回滚）
+            journal = self.game_state.journal
+            checkpoint = journal.begin()
+            try:
+                result = self._execute_validated_action(context)
+                result["success"] = True
+                result["message"] = "行动执行成功"
+                result["action_type"] = action_type.value
+
+                # 3. 更新游戏状态
+                self._update_game_state(action_type, action_data)
+
+                return result
+            except Exception as e:
+                journal.rollback(checkpoint)
+                return {
+                    "success": False,
+                    "message": f"行动执行失败: {str(e)}",
+                    "action_type": action_type.value
+                }
+
+    def preview_action(self, action_type: ActionType, action_data: Dict[str, Any],
+                       scratch: bool = False) -> Dict[str, Any]:
+        """
+        预览行动结果（不修改游戏状态，不持久化）
+
+        在游戏状态的草稿副本上执行与正式执行相同的 GameAction，原状态不会被修改，也不需要会话锁。
+
+        Args:
+            action_type: 行动类型
+            action_data: 行动数据
+            scratch: 引擎的游戏状态本身就是可以丢弃的副本（例如刚从数据库解码），直接在其上执行，不再复制
+
+        Returns:
+            预览结果，包含成本、玩家状态变化和可到达的节点
+        """
+        from ..actions import create_action
+
+        failure = {"success": False, "preview": True, "action_type": action_type.value}
         try:
-            result = self._execute_validated_action(action_type, action_data)
-            result["success"] = True
-            result["message"] = "行动执行成功"
-            result["action_type"] = action_type.value
+            action = create_action(action_type, action_data)
+        except ValueError as e:
+            return {**failure, "message": str(e)}
 
-            # 3. 更新游戏状态
-            self._update_game_state(action_type, action_data)
+        game_state = self.game_state if scratch else self.game_state.clone()
+        context = action.validate(game_state)
+        if not context.is_valid:
+            return {**failure, "message": context.message}
 
-            return result
+        player = context.player
+        before = self._snapshot_player(player)
+        try:
+            result = action.dry_run(game_state, context)
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"行动执行失败: {str(e)}",
-                "action_type": action_type.value
-            }
+            return {**failure, "message": f"行动预览失败: {str(e)}"}
+        if not result["success"]:
+            return {**failure, "message": result["message"]}
 
-    def _execute_validated_action(self, action_type: ActionType, action_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "preview": True,
+            "message": "行动预览成功",
+            "action_type": action_type.value,
+            "cost": context.cost,
+            "money": player.resources.money,
+            "changes": self._diff_player(before, self._snapshot_player(player)),
+            "reachable_nodes": self._get_reachable_nodes(game_state, player.position),
+            "result": result
+        }
+
+    @staticmethod
+    def _snapshot_player(player: PlayerState) -> Dict[str, Any]:
+        """记录预览比较的玩家字段和资源"""
+        snapshot = {field_name: getattr(player, field_name) for field_name in PREVIEW_PLAYER_FIELDS}
+        snapshot.update(player.resources.to_dict())
+        return snapshot
+
+    @staticmethod
+    def _diff_player(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """比较玩家状态变化"""
+        return {key: {"before": old_value, "after": after[key]}
+                for key, old_value in before.items() if after[key] != old_value}
+
+    @staticmethod
+    def _get_reachable_nodes(game_state: GameState, position: int) -> List[int]:
+        """获取从指定位置可以前往的节点"""
+        node = game_state.board_state.nodes.get(position)
+        return list(node.next_nodes) if node else []
+
+    def _execute_validated_action(self, context: ActionContext) -> Dict[str, Any]:
         """执行已验证的行动"""
-        executor_method = getattr(self, f"_execute_{action_type.value}", None)
+        executor_method = getattr(self, f"_execute_{context.action_type.value}", None)
         if executor_method:
-            return executor_method(action_data)
+            return executor_method(context)
         else:
-            raise NotImplementedError(f"行动类型 {action_type} 未实现")
+            raise NotImplementedError(f"行动类型 {context.action_type} 未实现")
 
-    def _execute_move(self, action_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_move(self, context: ActionContext) -> Dict[str, Any]:
         """执行移动行动"""
+        action_data = context.action_data
         player_id = action_data["player_id"]
         steps = action_data["steps"]
         target_location = action_data["target_location"]
 
-        player = self.game_state.get_player_by_id(player_id)
+        player = context.player
         previous_position = player.position
 
         # 更新玩家位置
-        player.previous_position = previous_position
-        player.position = target_location
+        journal = self.game_state.journal
+        journal.set_attr(player, "previous_position", previous_position)
+        journal.set_attr(player, "position", target_location)
 
         return {
             "player_id": player_id,
@@ -77,17 +161,19 @@ class RuleEngine:
             "new_position": target_location
         }
 
-    def _execute_build(self, action_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_build(self, context: ActionContext) -> Dict[str, Any]:
         """执行建造行动"""
+        action_data = context.action_data
         player_id = action_data["player_id"]
         location_id = action_data["location_id"]
         building_type = action_data["building_type"]
 
-        player = self.game_state.get_player_by_id(player_id)
+        player = context.player
 
         # 消耗资源（简化）
-        building_cost = self._get_building_cost(building_type)
-        player.resources.money -= building_cost
+        building_cost = context.cost
+        journal = self.game_state.journal
+        journal.add(player.resources, "money", -building_cost)
 
         # 更新版图状态
         # TODO: 实际实现需要更新版图状态
@@ -95,7 +181,7 @@ class RuleEngine:
         # location.owner_id = player_id
 
         # 更新玩家统计
-        player.buildings_built_count += 1
+        journal.add(player, "buildings_built_count", 1)
 
         return {
             "player_id": player_id,
@@ -104,10 +190,17 @@ class RuleEngine:
             "cost": building_cost
         }
 
+    def _execute_pass(self, context: ActionContext) -> Dict[str, Any]:
+        """执行跳过回合行动（切换玩家由回合结束逻辑处理）"""
+        return {
+            "player_id": context.player.player_id,
+            "auto": context.action_data.get("auto", False)
+        }
+
     def _update_game_state(self, action_type: ActionType, action_data: Dict[str, Any]):
         """更新游戏状态"""
         # 记录行动历史
-        self.game_state.action_history.append({
+        self.game_state.journal.append(self.game_state.action_history, {
             "action_type": action_type.value,
             "action_data": action_data,
             "timestamp": self.game_state.last_updated.isoformat(),
@@ -120,11 +213,24 @@ class RuleEngine:
         # 检查是否需要切换回合
         if self._should_end_turn(action_type):
             self._advance_to_next_player()
+            # 回合结束后不能再撤销
+            self.game_state.journal.clear()
+
+    def undo_last_action(self) -> Dict[str, Any]:
+        """撤销当前回合内最近一次行动（通过变更日志恢复，不克隆状态）"""
+        if not self.game_state.journal.undo():
+            return {"success": False, "message": "没有可撤销的行动"}
+
+        return {
+            "success": True,
+            "message": "已撤销上一次行动",
+            "version": self.game_state.version
+        }
 
     def _should_end_turn(self, action_type: ActionType) -> bool:
         """检查是否应该结束当前回合"""
         # 某些行动会自动结束回合
-        end_turn_actions = [ActionType.MOVE, ActionType.BUILD]
+        end_turn_actions = [ActionType.MOVE, ActionType.BUILD, ActionType.PASS]
         return action_type in end_turn_actions
 
     def _advance_to_next_player(self):
@@ -132,16 +238,9 @@ class RuleEngine:
         current_index = self.game_state.current_player_index
         next_index = (current_index + 1) % len(self.game_state.players)
 
-        self.game_state.current_player_index = next_index
-        self.game_state.current_round += 1 if next_index == 0 else 0
+        journal = self.game_state.journal
+        journal.set_attr(self.game_state, "current_player_index", next_index)
+        if next_index == 0:
+            journal.add(self.game_state, "current_round", 1)
 
         # TODO: 检查游戏结束条件
-
-    def _get_building_cost(self, building_type: str) -> int:
-        """获取建筑成本（简化）"""
-        costs = {
-            "station": 3,
-            "ranch": 2,
-            "hazard": 1
-        }
-        return costs.get(building_type, 1)
\ No newline at end of file
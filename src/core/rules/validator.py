@@ -1,9 +1,75 @@
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any, Tuple
 from ..game_state import GameState
-from ..models.enums import ActionType, GamePhase
+from ..models.board import MapNode
+from ..models.enums import ActionType, GamePhase, WorkerType
 from ..models.player import PlayerState
 
 
+# 建筑建造成本（BuildAction、RuleEngine 与验证器共用）
+BUILDING_COSTS = {
+    "station": 3,
+    "ranch": 2,
+    "hazard": 1,
+    "telegraph": 4,
+    "church": 3,
+    # 新增建筑物的建造成本（注意：这是建造成本，不是使用成本）
+    "building_type_1": 2,  # 建筑物1建造成本2金钱
+    "building_type_2": 3,  # 建筑物2建造成本3金钱
+    "building_type_3": 2  # 建筑物3建造成本2金钱
+}
+
+# 工人雇佣成本
+WORKER_COSTS = {
+    "craftsman": 2,
+    "engineer": 3,
+    "brakeman": 1,
+    "telegrapher": 4
+}
+
+# 工人类型对应的玩家资源字段（ResourceSet 中没有的类型暂不支持雇佣）
+WORKER_RESOURCE_FIELDS = {
+    "craftsman": "builders",  # 工匠
+    "engineer": "drivers",  # 工程师
+}
+
+# 工人类型对应的人才市场工人类型（雇佣时从人才市场中取走一个该类型的工人）
+WORKER_MARKET_TYPES = {
+    "craftsman": WorkerType.BUILDER,
+    "engineer": WorkerType.DRIVER,
+}
+
+
+def get_building_cost(building_type: str) -> int:
+    """获取建筑成本"""
+    return BUILDING_COSTS.get(building_type, 2)
+
+
+def get_worker_cost(worker_type: str) -> int:
+    """获取工人雇佣成本"""
+    return WORKER_COSTS.get(worker_type, 2)  # 默认成本为2
+
+
+@dataclass
+class ActionContext:
+    """
+    行动上下文 - 验证阶段解析出的对象
+
+    验证时查找到的玩家、成本、目标节点和卡牌都保存在这里，
+    执行阶段直接使用，不再重复查找或计算。
+    """
+    action_type: ActionType
+    action_data: Dict[str, Any]
+    is_valid: bool = False
+    message: str = ""
+    player: Optional[PlayerState] = None
+    cost: int = 0
+    target_node: Optional[MapNode] = None
+    card: Optional[Dict[str, Any]] = None
+    resource_field: Optional[str] = None
+    market_slot: Optional[Tuple[int, int]] = None
+
+
 class ActionValidator:
     """行动验证器 - 验证游戏行动的合法性"""
 
@@ -13,24 +79,43 @@ class ActionValidator:
     def validate_action(self, action_type: ActionType, action_data: Dict) -> Tuple[bool, str]:
         """
         验证行动的合法性
-        
+
         Args:
             action_type: 行动类型
             action_data: 行动数据
-            
+
         Returns:
             (是否合法, 错误消息)
         """
+        context = self.resolve_action(action_type, action_data)
+        return context.is_valid, context.message
+
+    def resolve_action(self, action_type: ActionType, action_data: Dict[str, Any]) -> ActionContext:
+        """
+        验证行动并返回解析后的行动上下文
+
+        Args:
+            action_type: 行动类型
+            action_data: 行动数据
+
+        Returns:
+            行动上下文（包含验证结果和执行所需的对象）
+        """
+        context = ActionContext(action_type=action_type, action_data=action_data)
+
         # 基础验证
         if not self._validate_basic_conditions(action_type):
-            return False, "基础条件不满足"
+            context.message = "基础条件不满足"
+            return context
 
         # 根据行动类型进行具体验证
         validator_method = getattr(self, f"_validate_{action_type.value}", None)
         if validator_method:
-            return validator_method(action_data)
+            context.is_valid, context.message = validator_method(context)
         else:
-            return False, f"未知的行动类型: {action_type}"
+            context.message = f"未知的行动类型: {action_type}"
+
+        return context
 
     def _validate_basic_conditions(self, action_type: ActionType) -> bool:
         """验证基础游戏条件"""
@@ -48,8 +133,9 @@ class ActionValidator:
 
         return True
 
-    def _validate_move(self, action_data: Dict) -> Tuple[bool, str]:
+    def _validate_move(self, context: ActionContext) -> Tuple[bool, str]:
         """验证移动行动"""
+        action_data = context.action_data
         player_id = action_data.get("player_id")
         steps = action_data.get("steps")
         target_location = action_data.get("target_location")
@@ -58,6 +144,7 @@ class ActionValidator:
         player = self.game_state.get_player_by_id(player_id)
         if not player:
             return False, "玩家不存在"
+        context.player = player
 
         # 验证当前玩家
         if player_id != self.game_state.current_player.player_id:
@@ -70,6 +157,7 @@ class ActionValidator:
         # 验证目标位置（简化验证，实际游戏需要更复杂的路径验证）
         if not isinstance(target_location, int) or target_location < 0:
             return False, "无效的目标位置"
+        context.target_node = self.game_state.board_state.nodes.get(target_location)
 
         # 简化版路径验证 - 实际游戏中需要更复杂的逻辑
         current_pos = player.position
@@ -78,8 +166,9 @@ class ActionValidator:
 
         return True, "移动行动合法"
 
-    def _validate_build(self, action_data: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validate_build(self, context: ActionContext) -> Tuple[bool, str]:
         """验证建造行动"""
+        action_data = context.action_data
         player_id = action_data.get("player_id")
         location_id = action_data.get("location_id")
         building_type = action_data.get("building_type")
@@ -90,41 +179,56 @@ class ActionValidator:
         player = self.game_state.get_player_by_id(player_id)
         if not player:
             return False, "玩家不存在"
+        context.player = player
 
         # 检查建筑类型是否有效
         valid_building_types = ["station", "ranch", "hazard", "telegraph", "church"]
         if building_type not in valid_building_types:
             return False, f"无效的建筑类型: {building_type}"
 
-        # 检查玩家是否有足够资源（简化检查）
-        building_cost = self._get_building_cost(building_type)
-        if player.resources.money < building_cost:
-            return False, f"资源不足，需要{building_cost}金钱"
+        # 检查玩家是否有足够资源
+        context.cost = get_building_cost(building_type)
+        if player.resources.money < context.cost:
+            return False, f"资源不足，需要{context.cost}金钱"
 
         # 检查位置是否可建造
+        context.target_node = self.game_state.board_state.nodes.get(location_id)
         if not self._is_buildable_location(location_id, player_id):
             return False, "该位置不可建造"
 
         return True, "验证通过"
 
-    def _get_building_cost(self, building_type: str) -> int:
-        """获取建筑成本（与BuildAction中保持一致）"""
-        costs = {
-            "station": 3,
-            "ranch": 2,
-            "hazard": 1,
-            "telegraph": 4,
-            "church": 3
-        }
-        return costs.get(building_type, 2)
+    def _validate_hire_worker(self, context: ActionContext) -> Tuple[bool, str]:
+        """验证雇佣工人行动"""
+        action_data = context.action_data
+        player_id = action_data.get("player_id")
+        worker_type = action_data.get("worker_type")
 
-    def _is_buildable_location(self, location_id: int, player_id: str) -> bool:
-        """检查位置是否可建造"""
-        # 简化实现
-        return True
+        if not player_id or not worker_type:
+            return False, "缺少必要参数"
 
-    def _validate_buy_cattle(self, action_data: Dict[str, Any]) -> Tuple[bool, str]:
+        player = self.game_state.get_player_by_id(player_id)
+        if not player:
+            return False, "玩家不存在"
+        context.player = player
+
+        context.resource_field = WORKER_RESOURCE_FIELDS.get(worker_type)
+        if not context.resource_field:
+            return False, f"暂不支持雇佣该工人类型: {worker_type}"
+
+        context.market_slot = self.game_state.labor_market.find_worker(WORKER_MARKET_TYPES[worker_type])
+        if context.market_slot is None:
+            return False, f"人才市场中没有可雇佣的{worker_type}"
+
+        context.cost = get_worker_cost(worker_type)
+        if player.resources.money < context.cost:
+            return False, f"资源不足，需要{context.cost}金钱"
+
+        return True, "验证通过"
+
+    def _validate_buy_cattle(self, context: ActionContext) -> Tuple[bool, str]:
         """验证购买牛牌行动"""
+        action_data = context.action_data
         player_id = action_data.get("player_id")
         card_id = action_data.get("card_id")
 
@@ -134,17 +238,23 @@ class ActionValidator:
         player = self.game_state.get_player_by_id(player_id)
         if not player:
             return False, "玩家不存在"
+        context.player = player
 
         # 检查卡牌是否在牛牌市场中
-        card_exists = any(card.get("card_id") == card_id for card in self.game_state.cattle_market)
-        if not card_exists:
+        card = next((card for card in self.game_state.cattle_market if card.get("card_id") == card_id), None)
+        if not card:
             return False, "牛牌不存在"
+        context.card = card
+
+        # 获取卡牌成本（假设卡牌有cost属性）
+        context.cost = card.get("cost", 5)  # 默认成本5
 
-        # 检查玩家是否有足够金钱（具体成本需要在执行时计算）
+        # 金钱是否足够由执行阶段检查并返回具体提示
         return True, "验证通过"
 
-    def _validate_sell_cattle(self, action_data: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validate_sell_cattle(self, context: ActionContext) -> Tuple[bool, str]:
         """验证卖出牛群行动"""
+        action_data = context.action_data
         player_id = action_data.get("player_id")
         card_id = action_data.get("card_id")
 
@@ -154,16 +264,19 @@ class ActionValidator:
         player = self.game_state.get_player_by_id(player_id)
         if not player:
             return False, "玩家不存在"
+        context.player = player
 
         # 检查卡牌是否在玩家手牌中
-        card_exists = any(card.get("card_id") == card_id for card in player.hand_cards)
-        if not card_exists:
+        card = next((card for card in player.hand_cards if card.get("card_id") == card_id), None)
+        if not card:
             return False, "牛牌不在手牌中"
+        context.card = card
 
         return True, "验证通过"
 
-    def _validate_use_ability(self, action_data: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validate_use_ability(self, context: ActionContext) -> Tuple[bool, str]:
         """验证使用能力行动"""
+        action_data = context.action_data
         player_id = action_data.get("player_id")
         card_id = action_data.get("card_id")
 
@@ -173,11 +286,13 @@ class ActionValidator:
         player = self.game_state.get_player_by_id(player_id)
         if not player:
             return False, "玩家不存在"
+        context.player = player
 
         # 检查卡牌是否在玩家手牌中
         card = next((card for card in player.hand_cards if card.get("card_id") == card_id), None)
         if not card:
             return False, "牛牌不在手牌中"
+        context.card = card
 
         # 检查卡牌是否有特殊能力
         if not card.get("special_ability"):
@@ -185,25 +300,20 @@ class ActionValidator:
 
         return True, "验证通过"
 
-    def _validate_build(self, action_data: Dict) -> Tuple[bool, str]:
-        """验证建造行动"""
-        player_id = action_data.get("player_id")
-        location_id = action_data.get("location_id")
-        building_type = action_data.get("building_type")
+    def _validate_pass(self, context: ActionContext) -> Tuple[bool, str]:
+        """验证跳过回合行动"""
+        player_id = context.action_data.get("player_id")
 
         player = self.game_state.get_player_by_id(player_id)
         if not player:
             return False, "玩家不存在"
+        context.player = player
 
-        # 验证资源
-        if not self._has_sufficient_resources(player, building_type):
-            return False, "资源不足"
-
-        # 验证位置是否可建造
-        if not self._is_buildable_location(location_id, player_id):
-            return False, "位置不可建造"
+        # 只有当前玩家的回合可以被跳过
+        if player_id != self.game_state.current_player.player_id:
+            return False, "不是当前玩家的回合"
 
-        return True, "建造行动合法"
+        return True, "验证通过"
 
     def _is_valid_path(self, start: int, end: int, steps: int) -> bool:
         """验证移动路径是否合法（简化实现）"""
@@ -212,11 +322,6 @@ class ActionValidator:
         distance = abs(end - start)
         return steps >= distance
 
-    def _has_sufficient_resources(self, player: PlayerState, action_type: str) -> bool:
-        """检查玩家是否有足够资源"""
-        # TODO: 根据行动类型检查具体资源需求
-        return player.resources.money > 0  # 简化实现
-
     def _is_buildable_location(self, location_id: int, player_id: str) -> bool:
         """检查位置是否可建造"""
         # TODO: 实现实际的位置验证逻辑
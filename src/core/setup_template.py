@@ -0,0 +1,208 @@
+"""
+开局模板模块
+进程内只构建一次的不可变开局数据：地图拓扑、牌堆原型和建筑物配置。
+新游戏从模板复制节点和牌，再各自洗牌和放置，避免每局重新构建。
+"""
+
+import random
+import threading
+import uuid
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from config.cards import DECK_CONFIGS
+from config.settings import DECK_SHUFFLE_ON_DRAW
+from .models.board import BoardState, BuildingConfig, LocationType, MapNode, NodeAction
+from .models.card import Card
+from .models.deck_manager import Deck, DeckConfig, LazyDecks
+from .models.enums import CardType, EventCategory
+
+# 地图连线：(起点, 终点) 列表
+MAP_EDGES: Tuple[Tuple[int, int], ...] = tuple(
+    # 基础线性路径 (0->1->2->...->29)
+    [(i, i + 1) for i in range(29)]
+    # 水灾支路
+    + [(1, 51), (51, 52), (52, 53), (53, 54), (54, 55), (55, 56), (56, 5)]
+    # 旱灾支路
+    + [(5, 61), (61, 62), (62, 63), (63, 64), (64, 65), (65, 9)]
+    # 分支1
+    + [(9, 71), (71, 72), (72, 12)]
+    # 落石支路
+    + [(12, 81), (81, 82), (82, 83), (83, 84), (84, 85), (85, 86), (86, 15)]
+    # 分支2、分支3
+    + [(15, 91), (91, 17), (17, 92), (92, 19)]
+    # 帐篷支路
+    + [(10, 104), (104, 105), (105, 106), (106, 107), (107, 108), (108, 109), (109, 110), (110, 111), (111, 12)]
+    # 铁路路径 (200->201->202->...->239)
+    + [(i, i + 1) for i in range(200, 240)]
+    # 车站
+    + [(4, 241), (241, 5), (7, 242), (242, 8), (10, 243), (243, 11), (13, 244), (244, 14),
+       (16, 245), (245, 17), (21, 246), (246, 22), (25, 247), (247, 26), (29, 248), (248, 30),
+       (33, 249), (249, 34)]
+)
+
+# 特殊地点：节点ID -> (地点类型, 名称, 动作)
+SPECIAL_NODES = {
+    0: (LocationType.START, "起点", NodeAction.MOVE | NodeAction.START_TURN),
+    29: (LocationType.KANSAS_CITY, "堪萨斯城", NodeAction.CATTLE_SALE | NodeAction.END_TURN),
+}
+
+# 事件牌支路：类别 -> 可放置的节点（按放置顺序）
+EVENT_SLOTS: Dict[EventCategory, Tuple[int, ...]] = {
+    EventCategory.FLOOD: (51, 52, 53, 54),
+    EventCategory.DROUGHT: (61, 62, 63, 64),
+    EventCategory.ROCKFALL: (81, 82, 83, 84),
+    EventCategory.TENT: (101, 102, 103, 104, 105, 106, 107, 108, 109),
+}
+
+# 事件牌类别在节点上显示的事件名称
+EVENT_LABELS: Dict[EventCategory, str] = {
+    EventCategory.FLOOD: "水灾",
+    EventCategory.DROUGHT: "旱灾",
+    EventCategory.ROCKFALL: "落石",
+    EventCategory.TENT: "帐篷",
+}
+
+HAZARD_EVENTS = frozenset({EventCategory.FLOOD, EventCategory.DROUGHT, EventCategory.ROCKFALL})
+
+
+def event_category(card: Card) -> Optional[EventCategory]:
+    """事件牌类别（来自牌配置的 metadata.category），不是事件牌时返回 None"""
+    category = card.metadata.get("category")
+    return EventCategory(category) if category else None
+
+
+def build_map_topology(board_state: BoardState) -> None:
+    """在版图上建立地图连线并设置特殊地点"""
+    for from_id, to_id in MAP_EDGES:
+        board_state.connect_nodes(from_id, to_id)
+
+    for node_id, (location_type, name, actions) in SPECIAL_NODES.items():
+        node = board_state.nodes[node_id]
+        node.location_type = location_type
+        node.name = name
+        node.action_flags = actions
+
+
+def _clone_card(prototype: Dict[str, Any], card_id: str) -> Card:
+    """按牌原型创建牌（跳过 dataclass 的 __init__，元数据各自独立）"""
+    card = object.__new__(Card)
+    state = prototype.copy()
+    state["card_id"] = card_id
+    state["metadata"] = prototype["metadata"].copy()
+    card.__dict__ = state
+    return card
+
+
+class SetupTemplate:
+    """
+    开局模板 - 只读的开局数据
+
+    - nodes: 已连线的地图节点（新游戏复制后再放置建筑物和事件牌）
+    - deck_prototypes: 每种牌堆按数量展开后的牌属性
+    - building_configs: 建筑物配置表
+    """
+
+    def __init__(self):
+        board_state = BoardState()
+        board_state.initialize_nodes()
+        build_map_topology(board_state)
+        self.nodes: Mapping[int, MapNode] = MappingProxyType(board_state.nodes)
+
+        self.deck_prototypes: Mapping[CardType, Tuple[Dict[str, Any], ...]] = MappingProxyType({
+            card_type: tuple(self._expand_prototypes(card_type, config))
+            for card_type, config in self._deck_configs().items()
+        })
+
+        self.building_configs = MappingProxyType(dict(BuildingConfig.CONFIG_MAP))
+
+        # 构建模板时校验每张动作A牌的事件牌类别（类别无效时抛出 ValueError）
+        for prototype in self.deck_prototypes[CardType.ACTION_A]:
+            EventCategory(prototype["metadata"].get("category"))
+
+        self.deck_sizes: Mapping[CardType, int] = MappingProxyType({
+            card_type: len(prototypes) for card_type, prototypes in self.deck_prototypes.items()
+        })
+
+        # 牌ID后缀（与每局的随机前缀拼接，8位十六进制序号），每种牌堆使用其中不重叠的一段；
+        # 序号与牌原型一一对应，客户端可以通过牌目录由牌ID查到牌原型
+        self._card_serials = tuple(f"{serial:08x}" for serial in range(sum(self.deck_sizes.values())))
+        serial_offsets = {}
+        offset = 0
+        for card_type, size in self.deck_sizes.items():
+            serial_offsets[card_type] = offset
+            offset += size
+        self.serial_offsets: Mapping[CardType, int] = MappingProxyType(serial_offsets)
+
+    def new_nodes(self) -> Dict[int, MapNode]:
+        """复制地图节点（列表字段各自独立，互不影响）"""
+        return {node_id: node.copy() for node_id, node in self.nodes.items()}
+
+    def new_decks(self, shuffle_on_draw: bool = DECK_SHUFFLE_ON_DRAW,
+                  rng: Optional[random.Random] = None) -> LazyDecks:
+        """
+        创建本局的牌堆映射（每种牌堆在第一次使用时才创建和洗牌）
+
+        Args:
+            shuffle_on_draw: 是否使用抽牌时洗牌模式
+            rng: 随机数生成器，传入固定种子的生成器时洗牌和抽牌结果可复现
+        """
+        prefix = uuid.uuid4().hex[:24]
+        factory = partial(self.new_deck, prefix=prefix, shuffle_on_draw=shuffle_on_draw, rng=rng)
+        return LazyDecks(factory, self.deck_sizes)
+
+    def new_deck(self, card_type: CardType, prefix: str, shuffle_on_draw: bool = DECK_SHUFFLE_ON_DRAW,
+                 rng: Optional[random.Random] = None) -> Deck:
+        """创建洗好的牌堆（牌ID为本局前缀加序号，本局内唯一）"""
+        offset = self.serial_offsets[card_type]
+        serials = self._card_serials[offset:offset + self.deck_sizes[card_type]]
+        cards = [_clone_card(prototype, prefix + serial)
+                 for prototype, serial in zip(self.deck_prototypes[card_type], serials)]
+
+        deck = Deck(card_type=card_type, cards=cards, shuffle_on_draw=shuffle_on_draw, rng=rng)
+        deck.shuffle()
+        return deck
+
+    @staticmethod
+    def _deck_configs() -> Dict[CardType, DeckConfig]:
+        """将牌堆配置转换为DeckConfig对象（同时校验配置）"""
+        return {
+            CardType(card_type_str): DeckConfig(
+                card_type=CardType(card_type_str),
+                total_count=config["total_count"],
+                card_prototypes=config["card_prototypes"]
+            )
+            for card_type_str, config in DECK_CONFIGS.items()
+        }
+
+    @staticmethod
+    def _expand_prototypes(card_type: CardType, config: DeckConfig) -> List[Dict[str, Any]]:
+        """按数量展开牌原型（与 Deck.initialize_from_config 创建的牌属性一致）"""
+        expanded = []
+        for prototype in config.card_prototypes:
+            card_state = Card(
+                card_type=card_type,
+                name=prototype.get("name", f"{card_type.value}_card"),
+                description=prototype.get("description", ""),
+                base_value=prototype.get("base_value", 0),
+                cost=prototype.get("cost", 0),
+                special_ability=prototype.get("special_ability"),
+                metadata=prototype.get("metadata", {})
+            ).__dict__
+            expanded.extend(card_state for _ in range(prototype.get("count", 1)))
+        return expanded
+
+
+_template: Optional[SetupTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_setup_template() -> SetupTemplate:
+    """获取进程内共用的开局模板（首次调用时构建）"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = SetupTemplate()
+    return _template
@@ -1,7 +1,9 @@
 import sys
 from pathlib import Path
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 # 添加项目根目录到 Python 路径
@@ -10,6 +12,18 @@ sys.path.insert(0, str(project_root))
 
 # 现在可以正常导入
 from src.storage.database import init_db
+from src.services.turn_timer import restore_turn_timers, turn_scheduler
+from src.services.session_cache import session_cache
+from src.services.archive_job import archive_job
+from src.services.game_pool import game_pool
+from src.services.catalog import static_catalog
+from src.services.session_lease import lease_manager
+from src.services.broker import broker
+from src.services.admission import admission
+from src.services.views import view_hub
+from src.services.matchmaking import matchmaking
+from src.utils.metrics import metrics
+from src.api.endpoints import catalog, events, game, lobby
 from config.settings import HOST, PORT, DEBUG
 from src.utils.logging import setup_default_logging, get_logger
 
@@ -26,8 +40,34 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("✅ 数据库初始化完成")
 
+    static_catalog.build()
+    logger.info(f"✅ 静态目录已编码（版本 {static_catalog.version}）")
+
+    await admission.start()
+    await broker.start()
+    broker.add_handler(session_cache.on_broker_event)
+    broker.add_handler(view_hub.on_broker_event)
+    await turn_scheduler.start()
+    await session_cache.start()
+    await archive_job.start()
+    await game_pool.start()
+    await lease_manager.start()
+    await asyncio.to_thread(restore_turn_timers)
+    await matchmaking.start()
+
     yield
 
+    await matchmaking.stop()
+    await lease_manager.stop()
+    await game_pool.stop()
+    await archive_job.stop()
+    await session_cache.stop()
+    await turn_scheduler.stop()
+    broker.remove_handler(view_hub.on_broker_event)
+    broker.remove_handler(session_cache.on_broker_event)
+    await broker.stop()
+    await admission.stop()
+
     # 关闭时清理资源
     logger.info("🛑 服务关闭完成")
 
@@ -39,6 +79,11 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+app.include_router(lobby.router)
+app.include_router(game.router)
+app.include_router(catalog.router)
+app.include_router(events.router)
+
 
 @app.get("/")
 async def root():
@@ -59,6 +104,25 @@ async def database_stats():
     stats = get_db_stats()
     return stats or {"error": "无法获取数据库统计信息"}
 
+
+@app.get("/sessions/stats")
+async def session_stats():
+    """会话缓存统计信息端点（常驻会话数量和内存占用、开局池余量、本进程持有的会话租约、消息代理订阅、负载、视图缓存）"""
+    return {**session_cache.stats(), "game_pool": game_pool.stats(), "lease": lease_manager.stats(),
+            "broker": broker.stats(), "admission": admission.stats(), "views": view_hub.stats(),
+            "matchmaking": matchmaking.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 指标端点"""
+    cache_stats = session_cache.stats()
+    metrics.gauge("session_cache_resident_sessions", "常驻内存的会话数量").set(cache_stats["resident_sessions"])
+    metrics.gauge("session_cache_resident_bytes", "常驻会话的内存占用估算").set(cache_stats["resident_bytes"])
+    metrics.gauge("session_cache_hibernated_sessions", "休眠的会话数量").set(cache_stats["hibernated_sessions"])
+    metrics.gauge("game_pool_available", "开局池中可用的游戏数量").set(len(game_pool))
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     logger.info(f"启动服务器: {HOST}:{PORT}")
     uvicorn.run(
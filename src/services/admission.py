@@ -0,0 +1,183 @@
+"""
+准入控制模块
+根据事件循环延迟、数据库连接池占用和单个会话的排队请求数判断负载，
+过载时按优先级尽早拒绝请求（429/503 并附带 Retry-After），玩家行动最后才受影响。
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, DefaultDict, Dict, Optional
+
+from config.settings import (ADMISSION_LAG_HARD, ADMISSION_LAG_INTERVAL, ADMISSION_LAG_SOFT,
+                             ADMISSION_POOL_HARD, ADMISSION_POOL_SOFT, ADMISSION_SESSION_QUEUE,
+                             DB_MAX_OVERFLOW, DB_POOL_SIZE)
+from src.utils.logging import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+admission_rejected = metrics.counter("admission_rejected_total", "准入控制拒绝的请求数量")
+loop_lag_gauge = metrics.gauge("event_loop_lag_seconds", "事件循环延迟（衰减最大值）")
+
+# 事件循环延迟的衰减系数：峰值立即生效，之后每次采样按比例回落
+LAG_DECAY = 0.8
+
+
+class Priority(IntEnum):
+    """请求优先级（数值越大越先被拒绝）"""
+    CRITICAL = 0  # 玩家行动、加入和开始游戏
+    NORMAL = 1  # 创建会话、查询游戏状态
+    DEFERRABLE = 2  # 行动预览、大厅列表刷新、观战轮询
+
+
+class LoadLevel(IntEnum):
+    """负载等级"""
+    NORMAL = 0
+    ELEVATED = 1  # 拒绝可延后的请求
+    OVERLOADED = 2  # 只接受玩家行动
+
+
+@dataclass
+class Rejection:
+    """拒绝原因"""
+    status_code: int
+    reason: str
+    retry_after: int
+
+
+def db_pool_usage() -> float:
+    """数据库连接池占用比例（已借出的连接 / 连接池容量）"""
+    from src.storage.database import engine
+
+    pool = engine.pool
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    return checked_out / max(1, DB_POOL_SIZE + DB_MAX_OVERFLOW)
+
+
+class AdmissionController:
+    """
+    准入控制 - 按负载等级和请求优先级决定是否接受请求
+
+    - 负载等级由事件循环延迟和数据库连接池占用中较高的一项决定
+    - ELEVATED 时拒绝可延后的请求，OVERLOADED 时只接受玩家行动（503）
+    - 同一会话处理中的请求超过上限时拒绝新请求（429），不论优先级
+    """
+
+    def __init__(self, lag_soft: float = ADMISSION_LAG_SOFT, lag_hard: float = ADMISSION_LAG_HARD,
+                 pool_soft: float = ADMISSION_POOL_SOFT, pool_hard: float = ADMISSION_POOL_HARD,
+                 session_queue: int = ADMISSION_SESSION_QUEUE, lag_interval: float = ADMISSION_LAG_INTERVAL,
+                 pool_usage: Callable[[], float] = db_pool_usage):
+        self.lag_soft = lag_soft
+        self.lag_hard = lag_hard
+        self.pool_soft = pool_soft
+        self.pool_hard = pool_hard
+        self.session_queue = session_queue
+        self.lag_interval = lag_interval
+        self.pool_usage = pool_usage
+
+        self.loop_lag = 0.0
+        self._in_flight: DefaultDict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def load_level(self) -> LoadLevel:
+        """当前负载等级"""
+        pool_usage = self.pool_usage()
+        if self.loop_lag >= self.lag_hard or pool_usage >= self.pool_hard:
+            return LoadLevel.OVERLOADED
+        if self.loop_lag >= self.lag_soft or pool_usage >= self.pool_soft:
+            return LoadLevel.ELEVATED
+        return LoadLevel.NORMAL
+
+    def admit(self, priority: Priority, session_id: Optional[str] = None) -> Optional[Rejection]:
+        """
+        判断是否接受请求，接受时登记会话的处理中请求（处理完成后调用 release）
+
+        Returns:
+            接受时返回 None，否则返回拒绝原因
+        """
+        rejection = self._check_load(priority)
+        if rejection is None and session_id:
+            with self._lock:
+                if self._in_flight[session_id] >= self.session_queue:
+                    rejection = Rejection(429, "会话请求过多，请稍后重试", 1)
+                else:
+                    self._in_flight[session_id] += 1
+
+        if rejection is not None:
+            admission_rejected.inc(priority=priority.name.lower(), status=str(rejection.status_code))
+        return rejection
+
+    def release(self, session_id: Optional[str]) -> None:
+        """请求处理完成"""
+        if not session_id:
+            return
+        with self._lock:
+            remaining = self._in_flight.get(session_id, 0) - 1
+            if remaining > 0:
+                self._in_flight[session_id] = remaining
+            else:
+                self._in_flight.pop(session_id, None)
+
+    def queue_depth(self, session_id: str) -> int:
+        """会话处理中的请求数量"""
+        return self._in_flight.get(session_id, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """准入控制统计"""
+        return {
+            "load_level": self.load_level().name.lower(),
+            "event_loop_lag_seconds": round(self.loop_lag, 4),
+            "db_pool_usage": round(self.pool_usage(), 3),
+            "busy_sessions": len(self._in_flight),
+            "max_session_queue": max(self._in_flight.values(), default=0),
+        }
+
+    def record_lag(self, lag: float) -> None:
+        """记录一次事件循环延迟采样"""
+        self.loop_lag = max(lag, self.loop_lag * LAG_DECAY)
+        loop_lag_gauge.set(self.loop_lag)
+
+    async def start(self) -> None:
+        """启动事件循环延迟采样任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("✅ 准入控制已启动")
+
+    async def stop(self) -> None:
+        """停止采样任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.loop_lag = 0.0
+            logger.info("🛑 准入控制已停止")
+
+    async def _run(self) -> None:
+        """定期采样：实际睡眠时间超出预期的部分即为事件循环延迟"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.record_lag(max(0.0, time.perf_counter() - started - self.lag_interval))
+
+    def _check_load(self, priority: Priority) -> Optional[Rejection]:
+        """按负载等级拒绝低优先级的请求"""
+        if priority == Priority.CRITICAL:
+            return None
+        level = self.load_level()
+        if priority == Priority.DEFERRABLE and level >= LoadLevel.ELEVATED:
+            return Rejection(503, "服务繁忙，请稍后刷新", 5 if level == LoadLevel.OVERLOADED else 2)
+        if level >= LoadLevel.OVERLOADED:
+            return Rejection(503, "服务繁忙，请稍后重试", 2)
+        return None
+
+
+# 进程内唯一的准入控制
+admission = AdmissionController()
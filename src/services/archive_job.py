@@ -0,0 +1,128 @@
+"""
+归档任务模块
+定期将已结束（finished/aborted）的游戏会话从数据库移入归档文件，保持会话表精简
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from config.settings import ARCHIVE_INTERVAL
+from src.storage.archive import SessionArchive
+from src.storage.models import GameSession as GameSessionModel
+from src.storage.repositories import GameSessionRepository
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVED_STATUSES = ["finished", "aborted"]
+
+# 随游戏状态一起归档的会话字段
+ARCHIVED_FIELDS = [
+    "id", "session_code", "session_name", "session_type", "max_players", "current_players",
+    "game_config", "session_status", "created_by", "host_player_id", "winner_player_id",
+    "final_scores", "started_at", "ended_at", "created_at", "version", "game_state_codec"
+]
+
+
+def session_metadata(session: GameSessionModel) -> Dict[str, Any]:
+    """提取会话元数据（时间字段转为ISO格式）"""
+    metadata = {}
+    for field in ARCHIVED_FIELDS:
+        value = getattr(session, field)
+        metadata[field] = value.isoformat() if hasattr(value, "isoformat") else value
+    return metadata
+
+
+def archive_finished_sessions(db: Session, archive: SessionArchive, batch_size: int = 100) -> Dict[str, Any]:
+    """
+    将已结束的会话移入归档
+
+    每批先写入归档（同步到磁盘）再从数据库删除；中途失败时会话仍留在数据库中，
+    下次执行时已归档的会话不会重复写入。
+
+    Args:
+        db: 数据库会话
+        archive: 会话归档
+        batch_size: 每批处理的会话数量
+
+    Returns:
+        归档结果统计
+    """
+    repository = GameSessionRepository(db)
+    archived = 0
+
+    while True:
+        sessions = repository.list_by_status(ARCHIVED_STATUSES, limit=batch_size)
+        if not sessions:
+            break
+
+        for session in sessions:
+            if archive.append(session.id, session_metadata(session), session.game_state_data or b""):
+                archived += 1
+
+        repository.delete_many(sessions)
+
+    if archived:
+        logger.info(f"📦 已归档 {archived} 个已结束的游戏会话（归档总数 {len(archive)}）")
+
+    return {"success": True, "archived": archived, "total_archived": len(archive)}
+
+
+class ArchiveJob:
+    """归档后台任务 - 按固定间隔执行归档"""
+
+    def __init__(self, interval: float = ARCHIVE_INTERVAL):
+        self.interval = interval
+        self._archive: Optional[SessionArchive] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def archive(self) -> SessionArchive:
+        """会话归档（首次使用时打开）"""
+        if self._archive is None:
+            self._archive = SessionArchive()
+        return self._archive
+
+    def run_once(self) -> Dict[str, Any]:
+        """执行一次归档"""
+        from src.storage.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return archive_finished_sessions(db, self.archive)
+        finally:
+            db.close()
+
+    async def start(self) -> None:
+        """启动后台归档任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("✅ 归档任务已启动")
+
+    async def stop(self) -> None:
+        """停止后台归档任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 归档任务已停止")
+        if self._archive is not None:
+            self._archive.close()
+
+    async def _run(self) -> None:
+        """定期执行归档"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"❌ 归档任务执行失败: {e}")
+
+
+# 进程内唯一的归档任务
+archive_job = ArchiveJob()
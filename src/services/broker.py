@@ -0,0 +1,331 @@
+"""
+消息代理模块
+按主题发布和订阅会话事件（会话主题 session:<id>、大厅主题 lobby）。
+WebSocket 推送、会话缓存失效等订阅方只依赖 Broker 接口，不关心事件如何在进程间传递：
+
+- memory: 进程内 asyncio 分发（单进程部署和测试）
+- sqlite: 多进程共用一个 SQLite 事件表并轮询，不需要外部服务
+以后接入 Redis 等外部代理时只需增加一个 Broker 子类。
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set
+
+from config.settings import (BROKER_BACKEND, BROKER_POLL_INTERVAL, BROKER_QUEUE_SIZE,
+                             BROKER_RETENTION_SECONDS, BROKER_SQLITE_PATH, WORKER_ID)
+from src.utils.logging import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+LOBBY_TOPIC = "lobby"
+
+events_published = metrics.counter("broker_events_published_total", "发布的事件数量")
+events_dropped = metrics.counter("broker_events_dropped_total", "订阅队列已满时丢弃的事件数量")
+
+
+def session_topic(session_id: str) -> str:
+    """会话主题"""
+    return f"session:{session_id}"
+
+
+@dataclass
+class Event:
+    """会话事件"""
+    topic: str
+    event_type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    origin: str = WORKER_ID  # 发布事件的进程
+    published_at: float = field(default_factory=time.time)
+    remote: bool = False  # 是否来自其他进程（接收方设置，不参与传输）
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可发送给客户端的字典"""
+        data = asdict(self)
+        data.pop("remote")
+        return data
+
+
+EventHandler = Callable[[Event], None]
+
+
+class Subscription:
+    """
+    主题订阅 - 有界的事件队列
+
+    队列已满时丢弃最旧的事件，慢速订阅方不会拖慢发布方。
+    """
+
+    def __init__(self, broker: "Broker", topic: str, maxsize: int = BROKER_QUEUE_SIZE):
+        self.broker = broker
+        self.topic = topic
+        self._queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, event: Event) -> None:
+        """放入事件（在事件循环线程中调用）"""
+        if self._queue.full():
+            self._queue.get_nowait()
+            events_dropped.inc()
+        self._queue.put_nowait(event)
+
+    async def get(self) -> Event:
+        """等待下一个事件"""
+        return await self._queue.get()
+
+    def close(self) -> None:
+        """取消订阅"""
+        self.broker.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        return await self.get()
+
+
+class Broker:
+    """
+    消息代理接口
+
+    publish 可以在任意线程中调用（服务层运行在线程池中），
+    订阅队列和事件处理函数都在事件循环线程中收到事件。
+    """
+
+    def __init__(self):
+        self._subscriptions: DefaultDict[str, Set[Subscription]] = defaultdict(set)
+        self._handlers: List[EventHandler] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def publish(self, topic: str, event_type: str, data: Optional[Dict[str, Any]] = None) -> Event:
+        """发布事件"""
+        event = Event(topic=topic, event_type=event_type, data=data or {})
+        events_published.inc(topic=topic.split(":", 1)[0])
+        self._send(event)
+        self._dispatch(event)
+        return event
+
+    def subscribe(self, topic: str) -> Subscription:
+        """订阅主题（在事件循环线程中调用）"""
+        subscription = Subscription(self, topic)
+        self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """取消订阅"""
+        subscriptions = self._subscriptions.get(subscription.topic)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.topic]
+
+    def add_handler(self, handler: EventHandler) -> None:
+        """注册处理全部事件的回调（例如会话缓存失效）"""
+        self._handlers.append(handler)
+
+    def remove_handler(self, handler: EventHandler) -> None:
+        """移除事件回调"""
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def subscriber_count(self) -> int:
+        """当前订阅数量"""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """代理统计"""
+        return {
+            "backend": type(self).__name__,
+            "topics": len(self._subscriptions),
+            "subscriptions": self.subscriber_count(),
+        }
+
+    async def start(self) -> None:
+        """记录事件循环，之后其他线程发布的事件转到该循环中分发"""
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        """停止分发"""
+        self._loop = None
+
+    def _send(self, event: Event) -> None:
+        """将事件传递给其他进程（进程内代理不需要）"""
+
+    def _dispatch(self, event: Event) -> None:
+        """在事件循环线程中分发事件；未启动时直接在当前线程分发"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            self._deliver(event)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: Event) -> None:
+        """分发给本进程的订阅方"""
+        for handler in list(self._handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"❌ 事件处理失败 {event.event_type}: {e}")
+        for subscription in list(self._subscriptions.get(event.topic, ())):
+            subscription.put(event)
+
+
+class InMemoryBroker(Broker):
+    """进程内消息代理"""
+
+
+class SqliteBroker(Broker):
+    """
+    SQLite 消息代理 - 同一台机器上的多个进程共用一个事件表
+
+    发布时写入事件表，并立即分发给本进程；后台任务轮询其他进程写入的新事件，
+    超过保留时间的事件定期删除。
+    """
+
+    def __init__(self, path: str = BROKER_SQLITE_PATH, poll_interval: float = BROKER_POLL_INTERVAL,
+                 retention_seconds: float = BROKER_RETENTION_SECONDS, worker_id: str = WORKER_ID):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.worker_id = worker_id
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def connect(self) -> None:
+        """打开事件表，从当前最新的事件之后开始接收"""
+        with self._lock:
+            if self._conn is not None:
+                return
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS broker_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    origin TEXT NOT NULL,
+                    published_at REAL NOT NULL
+                )
+            """)
+            self._last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM broker_events").fetchone()[0]
+            self._conn = conn
+
+    def close(self) -> None:
+        """关闭事件表"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def poll(self) -> List[Event]:
+        """读取其他进程发布的新事件（不分发）"""
+        self.connect()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, topic, event_type, data, origin, published_at FROM broker_events "
+                "WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+
+            now = time.time()
+            if now - self._last_prune >= self.retention_seconds:
+                self._conn.execute("DELETE FROM broker_events WHERE published_at < ?",
+                                   (now - self.retention_seconds,))
+                self._last_prune = now
+
+        return [
+            Event(topic=topic, event_type=event_type, data=json.loads(data), origin=origin,
+                  published_at=published_at, remote=True)
+            for _, topic, event_type, data, origin, published_at in rows
+            if origin != self.worker_id
+        ]
+
+    def poll_once(self) -> int:
+        """读取并分发其他进程的新事件，返回事件数量"""
+        events = self.poll()
+        for event in events:
+            self._dispatch(event)
+        return len(events)
+
+    async def start(self) -> None:
+        """打开事件表并启动轮询任务"""
+        await super().start()
+        await asyncio.to_thread(self.connect)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"✅ SQLite 消息代理已启动（{self.path}）")
+
+    async def stop(self) -> None:
+        """停止轮询任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 SQLite 消息代理已停止")
+        await super().stop()
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """代理统计"""
+        return {**super().stats(), "path": self.path, "last_event_id": self._last_id}
+
+    def _send(self, event: Event) -> None:
+        """写入事件表"""
+        self.connect()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO broker_events (topic, event_type, data, origin, published_at) VALUES (?, ?, ?, ?, ?)",
+                (event.topic, event.event_type, json.dumps(event.data, ensure_ascii=False, default=str),
+                 self.worker_id, event.published_at)
+            )
+
+    async def _run(self) -> None:
+        """定期轮询新事件"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.to_thread(self.poll_once)
+            except Exception as e:
+                logger.error(f"❌ 消息代理轮询失败: {e}")
+
+
+BROKER_BACKENDS = {
+    "memory": InMemoryBroker,
+    "sqlite": SqliteBroker,
+}
+
+
+def create_broker(backend: str = BROKER_BACKEND) -> Broker:
+    """按名称创建消息代理"""
+    if backend not in BROKER_BACKENDS:
+        raise ValueError(f"未知的消息代理: {backend}")
+    return BROKER_BACKENDS[backend]()
+
+
+# 进程内唯一的消息代理
+broker = create_broker()
@@ -0,0 +1,153 @@
+"""
+静态目录模块
+地图拓扑、牌原型和建筑物配置在进程内不会变化，启动时编码一次并按内容生成版本号，
+由目录接口以长期缓存的方式提供；游戏状态接口只返回与目录不同的部分。
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from config.cards import DECK_CONFIGS
+from src.core.models.enums import CardType
+from src.core.setup_template import EVENT_LABELS, EVENT_SLOTS, get_setup_template
+
+# 目录中的资源名称
+CATALOG_RESOURCES = ("board", "cards", "buildings")
+
+# 牌ID末尾的8位十六进制序号（开局模板分配），对应牌目录中原型的 serial_start/count 区间
+CARD_SERIAL_DIGITS = 8
+
+
+def build_board_catalog() -> Dict[str, Any]:
+    """地图拓扑：开局时的节点（连线、坐标、类型、动作）和事件牌支路"""
+    template = get_setup_template()
+    return {
+        "nodes": {node_id: node.to_dict() for node_id, node in template.nodes.items()},
+        "event_slots": {category.value: {"label": EVENT_LABELS[category], "nodes": list(node_ids)}
+                        for category, node_ids in EVENT_SLOTS.items()},
+    }
+
+
+def build_card_catalog() -> Dict[str, Any]:
+    """牌原型目录：每个原型附带其牌ID序号区间"""
+    template = get_setup_template()
+    catalog = {}
+    for card_type_str, config in DECK_CONFIGS.items():
+        serial = template.serial_offsets[CardType(card_type_str)]
+        prototypes = []
+        for prototype in config["card_prototypes"]:
+            prototypes.append({**prototype, "serial_start": serial})
+            serial += prototype.get("count", 1)
+        catalog[card_type_str] = {"total_count": config["total_count"], "prototypes": prototypes}
+    return {"card_id_serial_digits": CARD_SERIAL_DIGITS, "decks": catalog}
+
+
+def build_building_catalog() -> Dict[str, Any]:
+    """建筑物配置表"""
+    return {
+        building_type.value: {
+            "name": config.name,
+            "worker_cost": config.worker_cost,
+            "victory_points": config.victory_points,
+            "actions": config.actions,
+            "description": config.description,
+        }
+        for building_type, config in get_setup_template().building_configs.items()
+    }
+
+
+class StaticCatalog:
+    """
+    静态目录 - 预先编码的目录资源
+
+    版本号由全部资源内容计算，内容不变时版本号不变，因此带版本号的资源可以永久缓存。
+    """
+
+    def __init__(self):
+        self.version = ""
+        self.payloads: Dict[str, bytes] = {}
+        self._board_nodes: Dict[int, Dict[str, Any]] = {}
+
+    def build(self) -> None:
+        """构建并编码全部目录资源"""
+        resources = {
+            "board": build_board_catalog(),
+            "cards": build_card_catalog(),
+            "buildings": build_building_catalog(),
+        }
+        encoded = {name: json.dumps(data, ensure_ascii=False, sort_keys=True) for name, data in resources.items()}
+
+        digest = hashlib.sha256()
+        for name in CATALOG_RESOURCES:
+            digest.update(encoded[name].encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+        self.payloads = {name: data.encode("utf-8") for name, data in encoded.items()}
+        self._board_nodes = resources["board"]["nodes"]
+
+    def ensure_built(self) -> "StaticCatalog":
+        """首次使用时构建"""
+        if not self.version:
+            with _catalog_lock:
+                if not self.version:
+                    self.build()
+        return self
+
+    def get(self, resource: str, version: str) -> Optional[bytes]:
+        """获取指定版本的目录资源，版本不匹配或资源不存在时返回 None"""
+        self.ensure_built()
+        if version != self.version:
+            return None
+        return self.payloads.get(resource)
+
+    def index(self) -> Dict[str, Any]:
+        """目录索引（当前版本和各资源地址）"""
+        self.ensure_built()
+        return {
+            "version": self.version,
+            "resources": {name: f"/catalog/{self.version}/{name}" for name in CATALOG_RESOURCES},
+        }
+
+    def compact_game_state(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        精简游戏状态：节点只保留与目录不同的字段，牌堆中的牌只保留牌ID
+
+        Args:
+            game_state: GameState.to_dict() 的结果（不会被修改）
+        """
+        self.ensure_built()
+        compact = dict(game_state)
+
+        board_state = dict(game_state.get("board_state", {}))
+        nodes = {}
+        for node_id, node in board_state.get("nodes", {}).items():
+            base = self._board_nodes.get(int(node_id))
+            if base is None:
+                nodes[node_id] = node
+                continue
+            changed = {key: value for key, value in node.items() if base.get(key) != value}
+            if changed:
+                nodes[node_id] = changed
+        board_state["nodes"] = nodes
+        compact["board_state"] = board_state
+
+        if "deck_manager" in game_state:
+            compact["deck_manager"] = {"decks": {
+                card_type: {
+                    **deck,
+                    "cards": [card["card_id"] for card in deck.get("cards", [])],
+                    "discarded": [card["card_id"] for card in deck.get("discarded", [])],
+                }
+                for card_type, deck in game_state["deck_manager"].get("decks", {}).items()
+            }}
+
+        compact["catalog_version"] = self.version
+        return compact
+
+
+_catalog_lock = threading.Lock()
+
+# 进程内唯一的静态目录
+static_catalog = StaticCatalog()
@@ -0,0 +1,107 @@
+"""
+开局池模块
+后台预先创建已布置好版图（地图、牌堆、人才市场、未来区）的游戏状态，
+创建会话时直接取用，避免集中开局时在请求路径上初始化游戏。
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from config.settings import GAME_POOL_SIZE, GAME_POOL_REFILL_INTERVAL
+from src.core.game_state import GameState
+from src.utils.logging import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+pool_requests = metrics.counter("game_pool_requests_total", "从开局池取游戏状态的次数")
+
+
+def build_ready_game(session_id: str = "") -> GameState:
+    """创建已布置好版图的游戏状态"""
+    game_state = GameState(session_id=session_id)
+    game_state.setup_board()
+    return game_state
+
+
+class GamePool:
+    """
+    开局池 - 预先创建的游戏状态队列
+
+    取用在请求线程中进行，补充由后台任务在线程池中完成；池为空时调用方自行创建。
+    size 为 0 时不启用。
+    """
+
+    def __init__(self, size: int = GAME_POOL_SIZE, refill_interval: float = GAME_POOL_REFILL_INTERVAL):
+        self.size = size
+        self.refill_interval = refill_interval
+        self._games: Deque[GameState] = deque()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def acquire(self, session_id: str) -> Optional[GameState]:
+        """取出一个预先创建的游戏状态并分配会话ID，池为空时返回 None"""
+        try:
+            game_state = self._games.popleft()
+        except IndexError:
+            pool_requests.inc(result="miss")
+            return None
+
+        pool_requests.inc(result="hit")
+        game_state.session_id = session_id
+        return game_state
+
+    def refill(self) -> int:
+        """补充到目标数量，返回新创建的数量"""
+        created = 0
+        while len(self._games) < self.size:
+            self._games.append(build_ready_game())
+            created += 1
+        return created
+
+    def clear(self) -> None:
+        """清空开局池"""
+        self._games.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """开局池统计"""
+        return {
+            "size": self.size,
+            "available": len(self._games),
+            "hits": pool_requests.value(result="hit"),
+            "misses": pool_requests.value(result="miss"),
+        }
+
+    async def start(self) -> None:
+        """启动后台补充任务"""
+        if self.size > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"✅ 开局池已启动（目标数量 {self.size}）")
+
+    async def stop(self) -> None:
+        """停止后台补充任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 开局池已停止")
+        self.clear()
+
+    async def _run(self) -> None:
+        """定期补充开局池"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refill)
+            except Exception as e:
+                logger.error(f"❌ 开局池补充失败: {e}")
+            await asyncio.sleep(self.refill_interval)
+
+
+# 进程内唯一的开局池
+game_pool = GamePool()
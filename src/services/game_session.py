@@ -1,15 +1,32 @@
-from typing import Dict, Any, List, Optional
+import functools
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from ..core.game_state import GameState
+from ..core.rules.engine import RuleEngine
 from ..core.models.enums import GamePhase, PlayerColor
 from ..core.models.player import PlayerState, ResourceSet
 from ..storage.models import GameSession as GameSessionModel
 from ..storage.repositories import GameSessionRepository
 from ..core.models.enums import ActionType
-from ..core.game_flow import GameFlowController
+from ..core.actions import GameAction, create_action
+from .turn_timer import turn_scheduler
+from .session_cache import session_cache
+from .game_pool import game_pool
+from .broker import LOBBY_TOPIC, broker, session_topic
+from .views import seat_token, view_hub
+from config.settings import DEFAULT_GAME_CONFIG
+
+def with_session_lock(method):
+    """在会话锁内执行服务方法（第一个参数为会话ID），同一会话的加载、执行和保存串行进行"""
+    @functools.wraps(method)
+    def wrapper(self, session_id: str, *args, **kwargs):
+        with self.session_cache.lock(session_id):
+            return method(self, session_id, *args, **kwargs)
+    return wrapper
 
 
 class GameSessionService:
@@ -18,25 +35,19 @@ class GameSessionService:
     def __init__(self, db: Session):
         self.db = db
         self.repository = GameSessionRepository(db)
+        self.session_cache = session_cache
 
     def create_session(self, creator_id: str, session_name: str, max_players: int = 4) -> Dict[str, Any]:
         """创建新游戏会话"""
-        # 创建游戏状态
-        game_state = GameState(session_id=str(uuid4()))
+        # 创建游戏状态（优先从开局池取已布置好版图的游戏）
+        session_id = str(uuid4())
+        game_state = game_pool.acquire(session_id) or GameState(session_id=session_id)
         game_state.session_name = session_name
         game_state.max_players = max_players
         game_state.created_by = creator_id
 
         # 添加创建者为第一个玩家
-        player = PlayerState(
-            player_id=str(uuid4()),
-            user_id=creator_id,
-            player_color=PlayerColor.RED,
-            display_name=f"玩家_{creator_id[:8]}",
-            resources=ResourceSet(money=10, workers=3)
-        )
-        game_state.players.append(player)
-        game_state.player_order.append(0)
+        self._seat_player(game_state, creator_id, f"玩家_{creator_id[:8]}", PlayerColor.RED)
 
         # 保存到数据库 - 传递字典而不是对象
         session_data = {
@@ -52,15 +63,22 @@ class GameSessionService:
         }
 
         session_model = self.repository.create(session_data)
+        broker.publish(LOBBY_TOPIC, "session_created", {
+            "session_id": game_state.session_id,
+            "session_name": session_name,
+            "max_players": max_players,
+        })
 
         return {
             "session_id": game_state.session_id,
             "session_name": session_name,
             "max_players": max_players,
             "current_players": 1,
-            "players": [player.to_dict() for player in game_state.players]
+            "players": [player.to_dict() for player in game_state.players],
+            "seat_token": seat_token(game_state.session_id, game_state.players[0].player_id)
         }
 
+    @with_session_lock
     def join_session(self, session_id: str, user_id: str, display_name: str) -> Dict[str, Any]:
         """玩家加入游戏会话"""
         from ..core.models.enums import PlayerColor  # 导入枚举
@@ -70,41 +88,110 @@ class GameSessionService:
             return {"success": False, "message": "游戏会话不存在"}
 
         # 反序列化游戏状态
-        game_state = GameState.from_json(session.game_state)
+        game_state = self._load_game_state(session)
 
         # 检查会话是否已满
         if len(game_state.players) >= session.max_players:
             return {"success": False, "message": "游戏会话已满"}
 
         # 获取下一个可用颜色
-        from uuid import uuid4
         available_colors = self._get_available_colors(game_state.players)
         if not available_colors:
             return {"success": False, "message": "没有可用的玩家颜色"}
 
         # 创建新玩家
-        player = PlayerState(
-            player_id=str(uuid4()),
-            user_id=user_id,
-            player_color=available_colors[0],
-            display_name=display_name,
-            resources=ResourceSet(money=10, workers=3)
-        )
-        game_state.players.append(player)
-        game_state.player_order.append(len(game_state.players) - 1)
+        player = self._seat_player(game_state, user_id, display_name, available_colors[0])
+        game_state.increment_version()
 
         # 更新数据库
-        session.game_state = game_state.to_json()
         session.current_players = len(game_state.players)
-        self.repository.update(session)
+        self._save_game_state(session, game_state)
+        broker.publish(LOBBY_TOPIC, "player_joined", {
+            "session_id": session_id,
+            "current_players": session.current_players,
+        })
 
         return {
             "success": True,
             "message": "加入游戏成功",
             "session_id": session_id,
-            "player_id": player.player_id
+            "player_id": player.player_id,
+            "seat_token": seat_token(session_id, player.player_id)
         }
 
+    def create_matched_sessions(self, tables: List[List[Tuple[str, str]]]) -> List[Dict[str, Any]]:
+        """
+        批量创建匹配成功的对局并直接开始（全部会话一次提交）
+
+        Args:
+            tables: 每桌的 (用户ID, 显示名称) 列表，第一位为房主
+
+        Returns:
+            每桌的会话ID和各用户的玩家ID
+        """
+        now = datetime.utcnow()
+        game_states = []
+        sessions_data = []
+        for seats in tables:
+            session_id = str(uuid4())
+            game_state = game_pool.acquire(session_id) or GameState(session_id=session_id)
+            if not game_state.board_ready:
+                game_state.setup_board()
+
+            host_id = seats[0][0]
+            session_name = f"匹配对局（{len(seats)}人）"
+            game_state.session_name = session_name
+            game_state.max_players = len(seats)
+            game_state.created_by = host_id
+            for (user_id, display_name), color in zip(seats, PlayerColor):
+                self._seat_player(game_state, user_id, display_name, color)
+
+            game_state.current_phase = GamePhase.PLAYER_TURN
+            game_state.turn_start_time = datetime.now()
+            game_state.increment_version()
+
+            game_states.append(game_state)
+            sessions_data.append({
+                "id": session_id,
+                "session_name": session_name,
+                "session_type": "ranked",
+                "max_players": len(seats),
+                "current_players": len(seats),
+                "game_state": game_state.to_json(),
+                "session_status": "playing",
+                "created_by": host_id,
+                "host_player_id": host_id,
+                "created_at": now,
+                "started_at": now
+            })
+
+        sessions = self.repository.create_many(sessions_data)
+
+        results = []
+        for session, game_state in zip(sessions, game_states):
+            self._arm_turn_timer(session, game_state)
+            broker.publish(LOBBY_TOPIC, "session_started", {"session_id": game_state.session_id})
+            results.append({
+                "session_id": game_state.session_id,
+                "players": {player.user_id: player.player_id for player in game_state.players}
+            })
+        return results
+
+    @staticmethod
+    def _seat_player(game_state: GameState, user_id: str, display_name: str,
+                     color: PlayerColor) -> PlayerState:
+        """添加玩家并加入行动顺序"""
+        player = PlayerState(
+            player_id=str(uuid4()),
+            user_id=user_id,
+            player_color=color,
+            display_name=display_name,
+            resources=ResourceSet(money=10)
+        )
+        game_state.players.append(player)
+        game_state.player_order.append(len(game_state.players) - 1)
+        return player
+
     def _get_available_colors(self, players: List[PlayerState]) -> List[PlayerColor]:
         """获取可用的玩家颜色"""
         from ..core.models.enums import PlayerColor
@@ -114,6 +201,7 @@ class GameSessionService:
         return available_colors
 
     # 在GameSessionService的start_session方法中添加地图初始化
+    @with_session_lock
     def start_session(self, session_id: str, user_id: str) -> Dict[str, Any]:
         """开始游戏会话"""
         session = self.repository.get_by_id(session_id)
@@ -125,23 +213,29 @@ class GameSessionService:
             return {"success": False, "message": "只有房主可以开始游戏"}
 
         # 反序列化游戏状态
-        game_state = GameState.from_json(session.game_state)
+        game_state = self._load_game_state(session)
 
         # 检查玩家数量
         if len(game_state.players) < 2:
             return {"success": False, "message": "至少需要2名玩家才能开始游戏"}
 
-        # 初始化游戏地图
-        game_state.initialize_map()  # 新增：初始化地图
+        # 布置版图（来自开局池的游戏已布置好）
+        if not game_state.board_ready:
+            game_state.setup_board()
 
         # 更新游戏状态
         game_state.current_phase = GamePhase.PLAYER_TURN
+        game_state.turn_start_time = datetime.now()
+        game_state.increment_version()
 
         # 更新数据库
         session.session_status = "playing"
-        session.game_state = game_state.to_json()
         session.started_at = datetime.utcnow()
-        self.repository.update(session)
+        self._save_game_state(session, game_state)
+
+        # 开始第一个玩家的回合计时
+        self._arm_turn_timer(session, game_state)
+        broker.publish(LOBBY_TOPIC, "session_started", {"session_id": session_id})
 
         return {
             "session_id": session_id,
@@ -151,20 +245,20 @@ class GameSessionService:
             "current_player": game_state.current_player.to_dict() if game_state.current_player else None
         }
 
+    @with_session_lock
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """获取游戏会话信息"""
+        """获取游戏会话信息（包含完整的游戏状态，对外接口使用 views 模块的玩家视图）"""
         session = self.repository.get_by_id(session_id)
         if not session:
             return None
 
-        game_state = GameState.from_json(session.game_state)
+        game_state = self._load_game_state(session)
 
         return {
             "session_id": session.id,
             "session_name": session.session_name,
             "max_players": session.max_players,
             "current_players": session.current_players,
-            "session_status": session.session_status,
             "created_by": session.created_by,
             "host_player_id": session.host_player_id,
             "created_at": session.created_at.isoformat() if session.created_at else None,
@@ -175,9 +269,9 @@ class GameSessionService:
     def list_sessions(self, status: str = None) -> List[Dict[str, Any]]:
         """获取游戏会话列表"""
         if status:
-            sessions = self.repository.get_by_status(status)
+            sessions = self.repository.list_by_status([status])
         else:
-            sessions = self.repository.get_all()
+            sessions = self.repository.list_all()
 
         result = []
         for session in sessions:
@@ -193,48 +287,277 @@ class GameSessionService:
 
         return result
 
+    @with_session_lock
     def execute_action(self, session_id: str, action_type: ActionType, action_data: Dict[str, Any]) -> Dict[str, Any]:
         """执行游戏行动"""
         session = self.repository.get_by_id(session_id)
         if not session:
             raise ValueError("游戏会话不存在")
 
-        game_state = GameState.from_json(session.game_state)
-
-        # 根据行动类型创建行动实例
-        if action_type == ActionType.MOVE:
-            from src.core.actions.move import MoveAction
-            action = MoveAction(action_data)
-        elif action_type == ActionType.BUILD:
-            from src.core.actions.build import BuildAction
-            action = BuildAction(action_data)
-        elif action_type == ActionType.HIRE_WORKER:
-            from src.core.actions.hire_worker import HireWorkerAction
-            action = HireWorkerAction(action_data)
-        elif action_type == ActionType.BUY_CATTLE:
-            from src.core.actions.buy_cattle import BuyCattleAction
-            action = BuyCattleAction(action_data)
-        elif action_type == ActionType.SELL_CATTLE:
-            from src.core.actions.sell_cattle import SellCattleAction
-            action = SellCattleAction(action_data)
-        elif action_type == ActionType.USE_ABILITY:
-            from src.core.actions.use_ability import UseAbilityAction
-            action = UseAbilityAction(action_data)
-        # ... 其他行动类型
-
-        # 执行行动
+        game_state = self._load_game_state(session)
+        previous_player_index = game_state.current_player_index
+
+        # 根据行动类型创建行动实例并执行
+        action = self._create_action(action_type, action_data)
         result = action.execute(game_state)
         if result["success"]:
             # 更新游戏状态
-            session.game_state = game_state.to_json()
-            self.repository.update(session)
+            self._persist(session, game_state, previous_player_index)
+
+        return result
 
-            # 检查是否需要推进阶段
-            flow_controller = GameFlowController(game_state)
-            flow_controller.next_phase()
+    @with_session_lock
+    def execute_turn(self, session_id: str,
+                     actions: List[Tuple[ActionType, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        原子地执行一个回合内的多个行动（例如移动后执行若干建筑物动作）
+
+        所有行动按顺序在同一个内存状态上执行，全部成功后只持久化一次；
+        任一行动失败则整批回滚，数据库中的状态保持不变。
+
+        Args:
+            session_id: 游戏会话ID
+            actions: 按顺序排列的 (行动类型, 行动数据) 列表
+
+        Returns:
+            执行结果，包含每个行动的结果
+        """
+        session = self.repository.get_by_id(session_id)
+        if not session:
+            return {"success": False, "message": "游戏会话不存在"}
+
+        if not actions:
+            return {"success": False, "message": "回合中没有行动"}
+
+        game_state = self._load_game_state(session)
+        previous_player_index = game_state.current_player_index
+        checkpoint = game_state.journal.checkpoint()
+
+        results = []
+        for index, (action_type, action_data) in enumerate(actions):
+            result = self._apply_action(game_state, action_type, action_data)
+            results.append(result)
+            if not result["success"]:
+                # 撤销本回合已执行的行动，不写回数据库
+                game_state.journal.rollback(checkpoint)
+                return {
+                    "success": False,
+                    "message": f"第{index + 1}个行动失败，整个回合已回滚: {result['message']}",
+                    "failed_index": index,
+                    "results": results
+                }
+
+        # 全部成功，只持久化一次
+        self._persist(session, game_state, previous_player_index)
+
+        return {
+            "success": True,
+            "message": f"回合执行成功，共{len(results)}个行动",
+            "session_id": session_id,
+            "version": game_state.version,
+            "results": results
+        }
+
+    def preview_action(self, session_id: str, action_type: ActionType,
+                       action_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        预览行动结果（不修改游戏状态，不持久化）
+
+        在从数据库解码的草稿副本上执行，不访问会话缓存中的正式状态，也不获取会话锁，
+        因此预览不会与同一会话的行动排队。
+        """
+        session = self.repository.get_by_id(session_id)
+        if not session:
+            return {"success": False, "message": "游戏会话不存在"}
+
+        scratch = GameState.from_json(session.game_state)
+        return RuleEngine(scratch).preview_action(action_type, action_data, scratch=True)
+
+    @with_session_lock
+    def auto_pass(self, session_id: str, turn_key: str) -> Dict[str, Any]:
+        """
+        回合超时后自动跳过当前玩家的回合（由回合计时调度器调用）
+
+        Args:
+            session_id: 游戏会话ID
+            turn_key: 设置计时器时的回合标识，与当前回合不一致说明回合已经结束
+
+        Returns:
+            执行结果
+        """
+        session = self.repository.get_by_id(session_id)
+        if not session:
+            return {"success": False, "message": "游戏会话不存在"}
+
+        game_state = self._load_game_state(session)
+        if game_state.current_phase != GamePhase.PLAYER_TURN or game_state.game_finished:
+            return {"success": False, "message": "游戏不在玩家回合阶段"}
+
+        # 玩家已在超时前完成回合
+        if self._turn_key(game_state) != turn_key:
+            return {"success": False, "message": "回合已结束，无需自动跳过"}
+
+        previous_player_index = game_state.current_player_index
+        result = self._apply_action(game_state, ActionType.PASS, {
+            "player_id": game_state.current_player.player_id,
+            "auto": True
+        })
+        if result["success"]:
+            self._persist(session, game_state, previous_player_index)
 
         return result
 
+    @with_session_lock
+    def undo_last_action(self, session_id: str, player_id: str) -> Dict[str, Any]:
+        """
+        撤销当前玩家在本回合内执行的最近一个行动
+
+        撤销记录只保存在内存中的变更日志里：轮到下一个玩家、服务重启或会话被休眠后不能再撤销。
+
+        Args:
+            session_id: 游戏会话ID
+            player_id: 请求撤销的玩家ID（必须是当前玩家）
+
+        Returns:
+            执行结果
+        """
+        session = self.repository.get_by_id(session_id)
+        if not session:
+            return {"success": False, "message": "游戏会话不存在"}
+
+        game_state = self._load_game_state(session)
+        current_player = game_state.current_player
+        if current_player is None or current_player.player_id != player_id:
+            return {"success": False, "message": "只能在自己的回合内撤销行动"}
+
+        version = game_state.version
+        if not game_state.journal.undo():
+            return {"success": False, "message": "本回合没有可撤销的行动"}
+
+        # 撤销会恢复旧的版本号，这里直接设置为新版本（不记录在日志中），保证视图版本单调递增
+        game_state.version = version + 1
+        game_state.last_updated = datetime.now()
+        self._save_game_state(session, game_state, keep_undo=True)
+
+        return {
+            "success": True,
+            "message": "已撤销上一个行动",
+            "session_id": session_id,
+            "version": game_state.version,
+            "can_undo": game_state.journal.can_undo()
+        }
+
+    def _create_action(self, action_type: ActionType, action_data: Dict[str, Any]) -> GameAction:
+        """根据行动类型创建行动实例"""
+        return create_action(action_type, action_data)
+
+    def _apply_action(self, game_state: GameState, action_type: ActionType,
+                      action_data: Dict[str, Any]) -> Dict[str, Any]:
+        """在内存中的游戏状态上执行一个行动（不持久化）"""
+        try:
+            action = self._create_action(action_type, action_data)
+            return action.execute(game_state)
+        except Exception as e:
+            return {"success": False, "message": f"行动执行失败: {str(e)}"}
+
+    def _load_game_state(self, session: GameSessionModel) -> GameState:
+        """获取会话的游戏状态，优先使用内存中的缓存"""
+        fingerprint = session.game_state_fingerprint
+        game_state = self.session_cache.get(session.id, fingerprint)
+        if game_state is None:
+            game_state = GameState.from_json(session.game_state)
+            self.session_cache.put(session.id, game_state, fingerprint, len(session.game_state))
+        return game_state
+
+    def _save_game_state(self, session: GameSessionModel, game_state: GameState,
+                         keep_undo: bool = False) -> None:
+        """
+        将游戏状态写回数据库并更新缓存
+
+        Args:
+            session: 游戏会话
+            game_state: 游戏状态
+            keep_undo: 是否保留变更日志，允许之后撤销本回合内的行动
+                       （不经过日志的修改，例如加入玩家、开局布置版图，保存后不能再撤销到之前）
+        """
+        try:
+            # 只序列化一次：同一个字典既写入数据库，也用于刷新视图
+            state_dict = game_state.to_dict()
+            game_state_json = json.dumps(state_dict)
+            session.game_state = game_state_json
+            self.repository.update(session)
+        except Exception:
+            # 内存中的状态已被修改但没有持久化，不能再作为数据库状态使用
+            self.session_cache.discard(session.id)
+            raise
+
+        if not keep_undo:
+            game_state.journal.clear()
+        self.session_cache.put(session.id, game_state, session.game_state_fingerprint, len(game_state_json))
+
+        # 先刷新视图，推送连接收到事件时视图已经就绪
+        view_hub.update(session, game_state, state_dict)
+        broker.publish(session_topic(session.id), "state_changed", {
+            "session_id": session.id,
+            "version": game_state.version,
+            "current_phase": game_state.current_phase.value,
+            "current_player_index": game_state.current_player_index,
+        })
+
+    def _persist(self, session: GameSessionModel, game_state: GameState,
+                 previous_player_index: int) -> None:
+        """
+        保存游戏状态，如果轮到了下一个玩家则重新开始回合计时
+
+        撤销记录只保留在当前回合内：轮到下一个玩家时清空变更日志。
+        """
+        turn_changed = game_state.current_player_index != previous_player_index
+        if turn_changed:
+            game_state.turn_start_time = datetime.now()
+
+        self._save_game_state(session, game_state, keep_undo=not turn_changed)
+
+        if turn_changed:
+            self._arm_turn_timer(session, game_state)
+
+    def _arm_turn_timer(self, session: GameSessionModel, game_state: GameState) -> None:
+        """根据会话配置为当前回合设置超时计时器（从回合开始时间起计算剩余时间）"""
+        config = {**DEFAULT_GAME_CONFIG, **(session.game_config or {})}
+        if not config["enable_auto_pass"] or game_state.game_finished:
+            turn_scheduler.disarm_turn(game_state.session_id)
+            return
+
+        elapsed = 0.0
+        if game_state.turn_start_time:
+            elapsed = max(0.0, (datetime.now() - game_state.turn_start_time).total_seconds())
+        turn_scheduler.arm_turn(game_state.session_id, self._turn_key(game_state),
+                                max(0.0, config["turn_time_limit"] - elapsed))
+
+    @with_session_lock
+    def rearm_turn_timer(self, session_id: str) -> bool:
+        """
+        按保存的回合开始时间恢复会话的回合计时（服务重启或本进程获得会话租约后，之前的计时已不存在）
+
+        Returns:
+            是否设置了计时器
+        """
+        session = self.repository.get_by_id(session_id)
+        if not session or session.session_status != "playing":
+            return False
+
+        game_state = self._load_game_state(session)
+        if game_state.current_phase != GamePhase.PLAYER_TURN or game_state.game_finished:
+            return False
+
+        self._arm_turn_timer(session, game_state)
+        return session_id in turn_scheduler.wheel
+
+    @staticmethod
+    def _turn_key(game_state: GameState) -> Optional[str]:
+        """当前回合的标识（回合开始时间）"""
+        return game_state.turn_start_time.isoformat() if game_state.turn_start_time else None
+
+    @with_session_lock
     def execute_building_action(self, session_id: str, location_id: int,
                                 action_index: int, player_id: str) -> Dict[str, Any]:
         """执行建筑物动作"""
@@ -242,7 +565,8 @@ class GameSessionService:
         if not session:
             return {"success": False, "message": "游戏会话不存在"}
 
-        game_state = GameState.from_json(session.game_state)
+        game_state = self._load_game_state(session)
+        previous_player_index = game_state.current_player_index
 
         # 1. 验证玩家是否可以访问该建筑物
         building = game_state.board_state.get_building_at_location(location_id)
@@ -253,9 +577,12 @@ class GameSessionService:
         if building.owner_id and building.owner_id != player_id:
             return {"success": False, "message": "您不是该建筑物的拥有者"}
 
+        if not building.is_usable:
+            return {"success": False, "message": f"{building.name}不能使用"}
+
         # 3. 检查玩家是否有足够工人
         player = game_state.get_player_by_id(player_id)
-        if player.resources.workers < building.worker_cost:
+        if player.resources.builders < building.worker_cost:
             return {"success": False, "message": f"工人不足，需要{building.worker_cost}个工人"}
 
         # 4. 获取建筑物可用的动作
@@ -263,20 +590,25 @@ class GameSessionService:
         if action_index >= len(available_actions):
             return {"success": False, "message": "无效的动作索引"}
 
-        # 5. 扣除工人成本
-        player.resources.workers -= building.worker_cost
-
-        # 6. 执行选定的动作
+        # 5. 在同一个内存状态上执行选定的动作，不再重新加载会话
         action_config = available_actions[action_index]
         action_type = action_config["action_type"]
         action_data = action_config["params"]
 
-        # 使用现有的 execute_action 方法
-        result = self.execute_action(session_id, action_type, action_data)
+        result = self._apply_action(game_state, action_type, action_data)
+        if not result["success"]:
+            # 行动已自行回滚，工人尚未扣除
+            return {
+                "success": False,
+                "message": f"建筑物动作执行失败: {result['message']}",
+                "action_result": result
+            }
 
-        # 7. 更新游戏状态
-        session.game_state = game_state.to_json()
-        self.repository.update(session)
+        # 6. 扣除工人成本（记录在该行动的撤销步骤内，撤销时一并恢复）
+        game_state.journal.add(player.resources, "builders", -building.worker_cost)
+
+        # 7. 更新游戏状态（只保存一次）
+        self._persist(session, game_state, previous_player_index)
 
         return {
             "success": True,
@@ -284,7 +616,7 @@ class GameSessionService:
             "building_use": {
                 "building_type": building.building_type.value,
                 "worker_cost": building.worker_cost,
-                "remaining_workers": player.resources.workers
+                "remaining_workers": player.resources.builders
             },
             "action_result": result
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,329 @@
+"""
+匹配模块
+按积分把排队的玩家分到 2-4 人的对局：
+
+- 玩家按积分分桶（每桶 MATCHMAKING_BUCKET_WIDTH 分），为一名玩家找对手时从其所在的桶向两侧逐桶查找，
+  只访问积分范围内的桶，排队人数增加时单次匹配的开销基本只与成桌数量有关
+- 每名玩家可接受的积分差随等待时间扩大（有上限），同一桌的任意两名玩家都必须在彼此的范围内
+- 优先凑满一桌；等待超过 MATCHMAKING_SMALL_TABLE_WAIT 的玩家可以直接开不满员的桌
+- 后台任务定期匹配，一轮形成的所有对局一次提交创建，并由本进程持有会话租约
+- 入队时发放匹配票据，查询和取消都需要票据，匹配结果（玩家ID和座位令牌）只返回给票据持有者
+
+队列保存在进程内，多进程部署时匹配请求应固定发往同一个进程。
+"""
+
+import asyncio
+import math
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import (
+    DEFAULT_RATING,
+    MATCHMAKING_BASE_WINDOW,
+    MATCHMAKING_BUCKET_WIDTH,
+    MATCHMAKING_INTERVAL,
+    MATCHMAKING_MAX_WINDOW,
+    MATCHMAKING_MIN_TABLE_SIZE,
+    MATCHMAKING_SMALL_TABLE_WAIT,
+    MATCHMAKING_TABLE_SIZE,
+    MATCHMAKING_WINDOW_GROWTH,
+)
+from src.utils.logging import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+tables_formed = metrics.counter("matchmaking_tables_total", "匹配形成的对局数量")
+queued_players = metrics.gauge("matchmaking_queued_players", "匹配队列中的玩家数量")
+match_duration = metrics.histogram("matchmaking_round_seconds", "一轮匹配（不含创建会话）的耗时")
+
+# 保留的匹配结果数量上限（超过时移除最早的结果）
+RESULT_LIMIT = 10000
+
+
+@dataclass
+class QueuedPlayer:
+    """排队中的玩家"""
+    user_id: str
+    display_name: str
+    rating: int
+    enqueued_at: float  # 单调时钟时间
+    bucket: int
+
+
+class MatchQueue:
+    """
+    匹配队列 - 按入队顺序保存玩家，并按积分分桶索引
+
+    非线程安全，由 MatchmakingService 加锁调用。
+    """
+
+    def __init__(self, table_size: int = MATCHMAKING_TABLE_SIZE,
+                 min_table_size: int = MATCHMAKING_MIN_TABLE_SIZE,
+                 small_table_wait: float = MATCHMAKING_SMALL_TABLE_WAIT,
+                 bucket_width: int = MATCHMAKING_BUCKET_WIDTH,
+                 base_window: float = MATCHMAKING_BASE_WINDOW,
+                 window_growth: float = MATCHMAKING_WINDOW_GROWTH,
+                 max_window: float = MATCHMAKING_MAX_WINDOW,
+                 clock: Callable[[], float] = time.monotonic):
+        self.table_size = table_size
+        self.min_table_size = min_table_size
+        self.small_table_wait = small_table_wait
+        self.bucket_width = bucket_width
+        self.base_window = base_window
+        self.window_growth = window_growth
+        self.max_window = max_window
+        self.clock = clock
+        self._players: "OrderedDict[str, QueuedPlayer]" = OrderedDict()
+        self._buckets: Dict[int, "OrderedDict[str, QueuedPlayer]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._players
+
+    def get(self, user_id: str) -> Optional[QueuedPlayer]:
+        return self._players.get(user_id)
+
+    def add(self, user_id: str, display_name: str, rating: int) -> QueuedPlayer:
+        """玩家入队（已在队列中时保持原来的排队时间）"""
+        player = self._players.get(user_id)
+        if player is not None:
+            return player
+        player = QueuedPlayer(user_id=user_id, display_name=display_name, rating=rating,
+                              enqueued_at=self.clock(), bucket=rating // self.bucket_width)
+        self._insert(player)
+        return player
+
+    def remove(self, user_id: str) -> Optional[QueuedPlayer]:
+        """玩家出队，不在队列中时返回 None"""
+        player = self._players.pop(user_id, None)
+        if player is not None:
+            bucket = self._buckets[player.bucket]
+            del bucket[user_id]
+            if not bucket:
+                del self._buckets[player.bucket]
+        return player
+
+    def requeue(self, players: List[QueuedPlayer]) -> None:
+        """把匹配后未能创建对局的玩家放回队首（保留原来的排队时间）"""
+        for player in sorted(players, key=lambda p: p.enqueued_at, reverse=True):
+            if player.user_id not in self._players:
+                self._insert(player)
+                self._players.move_to_end(player.user_id, last=False)
+
+    def window(self, player: QueuedPlayer, now: float) -> float:
+        """玩家当前可接受的积分差"""
+        return min(self.base_window + self.window_growth * (now - player.enqueued_at), self.max_window)
+
+    def match(self, now: Optional[float] = None) -> List[List[QueuedPlayer]]:
+        """
+        进行一轮匹配，形成的桌从队列中移除
+
+        按排队时间从早到晚为每名玩家找同桌的对手，每桌的第一位是等待最久的玩家。
+        """
+        now = self.clock() if now is None else now
+        tables = []
+        for anchor in list(self._players.values()):
+            if anchor.user_id not in self._players:
+                continue  # 本轮已经入桌
+            group = self._gather(anchor, now)
+            if len(group) == self.table_size or (
+                    len(group) >= self.min_table_size and now - anchor.enqueued_at >= self.small_table_wait):
+                for player in group:
+                    self.remove(player.user_id)
+                tables.append(group)
+        return tables
+
+    def _gather(self, anchor: QueuedPlayer, now: float) -> List[QueuedPlayer]:
+        """从玩家所在的桶向两侧查找积分相近且互相接受的对手，最多凑满一桌"""
+        group = [anchor]
+        windows = [self.window(anchor, now)]
+        reach = math.ceil(windows[0] / self.bucket_width)
+        for distance in range(reach + 1):
+            indexes = (anchor.bucket,) if distance == 0 else (anchor.bucket - distance, anchor.bucket + distance)
+            for bucket_index in indexes:
+                for candidate in self._buckets.get(bucket_index, {}).values():
+                    if candidate is anchor:
+                        continue
+                    window = self.window(candidate, now)
+                    if all(abs(candidate.rating - member.rating) <= min(window, member_window)
+                           for member, member_window in zip(group, windows)):
+                        group.append(candidate)
+                        windows.append(window)
+                        if len(group) == self.table_size:
+                            return group
+        return group
+
+    def _insert(self, player: QueuedPlayer) -> None:
+        self._players[player.user_id] = player
+        self._buckets.setdefault(player.bucket, OrderedDict())[player.user_id] = player
+
+
+class MatchmakingService:
+    """
+    匹配服务 - 玩家排队、后台定期匹配并批量创建对局
+
+    入队、取消和查询在请求线程中进行，匹配和创建对局由后台任务在线程池中完成。
+    """
+
+    def __init__(self, interval: float = MATCHMAKING_INTERVAL, queue: Optional[MatchQueue] = None):
+        self.interval = interval
+        self.queue = queue or MatchQueue()
+        self._tickets: Dict[str, str] = {}  # 排队中的用户ID -> 匹配票据
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # 匹配票据 -> 匹配结果
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, db, user_id: str, display_name: Optional[str] = None) -> Dict[str, Any]:
+        """加入匹配队列（积分取玩家记录中的积分），返回查询和取消时使用的匹配票据"""
+        from src.storage.repositories import PlayerRepository
+
+        rating = PlayerRepository(db).get_ratings([user_id]).get(user_id, DEFAULT_RATING)
+        with self._lock:
+            if user_id in self.queue:
+                return {"success": False, "message": "玩家已在匹配队列中"}
+            player = self.queue.add(user_id, display_name or f"玩家_{user_id[:8]}", rating)
+            ticket = self._tickets[user_id] = secrets.token_urlsafe(16)
+            queued_players.set(len(self.queue))
+        return {"success": True, "status": "waiting", "user_id": user_id, "rating": player.rating,
+                "ticket": ticket}
+
+    def cancel(self, user_id: str, ticket: Optional[str]) -> Dict[str, Any]:
+        """退出匹配队列"""
+        with self._lock:
+            if not self._owns(user_id, ticket):
+                return {"success": False, "message": "匹配队列中不存在该票据"}
+            self.queue.remove(user_id)
+            del self._tickets[user_id]
+            queued_players.set(len(self.queue))
+        return {"success": True, "message": "已退出匹配队列"}
+
+    def status(self, user_id: str, ticket: Optional[str]) -> Dict[str, Any]:
+        """查询匹配状态，匹配成功时返回会话ID、玩家ID和座位令牌"""
+        with self._lock:
+            result = self._results.get(ticket) if ticket else None
+            if result is not None and result["user_id"] == user_id:
+                return {"success": True, "status": "matched", **result}
+            if not self._owns(user_id, ticket):
+                return {"success": False, "message": "匹配队列中不存在该票据"}
+            player = self.queue.get(user_id)
+            now = self.queue.clock()
+            return {
+                "success": True,
+                "status": "waiting",
+                "user_id": user_id,
+                "rating": player.rating,
+                "waited_seconds": round(now - player.enqueued_at, 1),
+                "rating_window": self.queue.window(player, now),
+            }
+
+    def run_once(self, db) -> int:
+        """进行一轮匹配并创建对局，返回创建的对局数量"""
+        from src.services.broker import LOBBY_TOPIC, broker
+        from src.services.game_session import GameSessionService
+        from src.services.session_lease import lease_manager
+        from src.services.views import seat_token
+
+        with self._lock:
+            started = time.perf_counter()
+            tables = self.queue.match()
+            match_duration.observe(time.perf_counter() - started)
+            queued_players.set(len(self.queue))
+        if not tables:
+            return 0
+
+        try:
+            results = GameSessionService(db).create_matched_sessions(
+                [[(player.user_id, player.display_name) for player in table] for table in tables])
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self.queue.requeue([player for table in tables for player in table])
+                queued_players.set(len(self.queue))
+            logger.error(f"❌ 创建匹配对局失败，玩家已放回队列: {e}")
+            return 0
+
+        for result in results:
+            lease_manager.check_owner(db, result["session_id"])
+            tables_formed.inc(players=str(len(result["players"])))
+            broker.publish(LOBBY_TOPIC, "match_found", {
+                "session_id": result["session_id"],
+                "user_ids": list(result["players"]),
+            })
+
+        with self._lock:
+            for result in results:
+                for user_id, player_id in result["players"].items():
+                    ticket = self._tickets.pop(user_id, None)
+                    if ticket is None:
+                        continue
+                    self._results[ticket] = {
+                        "user_id": user_id,
+                        "session_id": result["session_id"],
+                        "player_id": player_id,
+                        "seat_token": seat_token(result["session_id"], player_id),
+                    }
+            while len(self._results) > RESULT_LIMIT:
+                self._results.popitem(last=False)
+
+        logger.info(f"🎲 匹配形成 {len(results)} 桌，队列剩余 {len(self.queue)} 人")
+        return len(results)
+
+    def _owns(self, user_id: str, ticket: Optional[str]) -> bool:
+        """票据是否属于排队中的该玩家"""
+        expected = self._tickets.get(user_id)
+        return bool(ticket) and expected is not None and secrets.compare_digest(expected, ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        """匹配统计"""
+        return {
+            "queued_players": len(self.queue),
+            "buckets": len(self.queue._buckets),
+            "matched_players": len(self._results),
+        }
+
+    async def start(self) -> None:
+        """启动后台匹配任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("✅ 匹配服务已启动")
+
+    async def stop(self) -> None:
+        """停止后台匹配任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 匹配服务已停止")
+
+    def _run_with_session(self) -> int:
+        from src.storage.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return self.run_once(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        """定期匹配"""
+        while True:
+            try:
+                if len(self.queue) >= self.queue.min_table_size:
+                    await asyncio.to_thread(self._run_with_session)
+            except Exception as e:
+                logger.error(f"❌ 匹配失败: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# 进程内唯一的匹配服务
+matchmaking = MatchmakingService()
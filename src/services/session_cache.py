@@ -0,0 +1,280 @@
+"""
+会话缓存模块
+在内存中保留活跃会话的 GameState，空闲或内存超出预算时休眠为压缩快照，再次访问时自动恢复
+"""
+
+import asyncio
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import SESSION_IDLE_SECONDS, SESSION_MEMORY_BUDGET, SESSION_SNAPSHOT_TTL
+from src.core.game_state import GameState
+from src.core.models.enums import GamePhase
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ResidentSession:
+    """常驻内存的会话"""
+    game_state: GameState
+    fingerprint: int  # 对应的数据库状态指纹，用于识别其他进程写入的新状态
+    size: int  # 内存占用估算（序列化后的字节数）
+    last_access: float
+
+
+@dataclass
+class HibernatedSession:
+    """休眠的会话（zlib 压缩的 JSON 快照）"""
+    snapshot: bytes
+    fingerprint: int
+    size: int  # 恢复后的内存占用估算
+    hibernated_at: float
+
+
+class SessionCache:
+    """
+    会话缓存 - 管理常驻内存的游戏状态
+
+    - 空闲超过 idle_seconds 的会话被序列化为压缩快照，释放对象
+    - 常驻内存估算超过 memory_budget 时，优先休眠非进行中的会话，再按最近最少使用休眠
+    - 休眠快照超过 snapshot_ttl 后丢弃，之后从数据库重新加载
+    休眠不会丢失状态，进行中的游戏被休眠后在下一次访问时恢复。
+
+    同一会话的 GameState 被所有请求共享，加载、执行和保存必须在 lock(session_id) 内进行；
+    持有会话锁的会话不会被休眠。
+    """
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS,
+                 memory_budget: int = SESSION_MEMORY_BUDGET,
+                 snapshot_ttl: float = SESSION_SNAPSHOT_TTL,
+                 sweep_interval: float = 30.0):
+        self.idle_seconds = idle_seconds
+        self.memory_budget = memory_budget
+        self.snapshot_ttl = snapshot_ttl
+        self.sweep_interval = sweep_interval
+
+        self._resident: "OrderedDict[str, ResidentSession]" = OrderedDict()  # 按访问时间排序
+        self._hibernated: Dict[str, HibernatedSession] = {}
+        self._resident_bytes = 0
+        self._lock = threading.RLock()  # 超时回调在线程中访问缓存
+        self._session_locks: Dict[str, List] = {}  # 会话ID -> [锁, 持有和等待的请求数]
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def resident_count(self) -> int:
+        """常驻内存的会话数量"""
+        return len(self._resident)
+
+    @property
+    def resident_bytes(self) -> int:
+        """常驻会话的内存占用估算"""
+        return self._resident_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        with self._lock:
+            return {
+                "resident_sessions": len(self._resident),
+                "resident_bytes": self._resident_bytes,
+                "hibernated_sessions": len(self._hibernated),
+                "hibernated_bytes": sum(len(entry.snapshot) for entry in self._hibernated.values()),
+                "memory_budget": self.memory_budget
+            }
+
+    def get(self, session_id: str, fingerprint: int) -> Optional[GameState]:
+        """
+        获取会话的游戏状态，休眠的会话会被恢复
+
+        Args:
+            session_id: 游戏会话ID
+            fingerprint: 数据库中当前状态的指纹，不一致时缓存视为过期
+
+        Returns:
+            游戏状态，未缓存或已过期时返回None
+        """
+        with self._lock:
+            entry = self._resident.get(session_id)
+            if entry:
+                if entry.fingerprint != fingerprint:
+                    self.discard(session_id)
+                    return None
+                entry.last_access = time.monotonic()
+                self._resident.move_to_end(session_id)
+                return entry.game_state
+
+            hibernated = self._hibernated.pop(session_id, None)
+            if not hibernated or hibernated.fingerprint != fingerprint:
+                return None
+
+            game_state = GameState.from_json(zlib.decompress(hibernated.snapshot).decode("utf-8"))
+            self._add_resident(session_id, game_state, fingerprint, hibernated.size)
+            return game_state
+
+    def put(self, session_id: str, game_state: GameState, fingerprint: int, size: int) -> None:
+        """
+        放入或更新常驻会话
+
+        Args:
+            session_id: 游戏会话ID
+            game_state: 游戏状态
+            fingerprint: 对应的数据库状态指纹
+            size: 内存占用估算（通常为序列化后的长度）
+        """
+        with self._lock:
+            self._hibernated.pop(session_id, None)
+            self._remove_resident(session_id)
+            self._add_resident(session_id, game_state, fingerprint, size)
+
+    def discard(self, session_id: str) -> None:
+        """移除会话（内存中的状态不再可信时调用）"""
+        with self._lock:
+            self._remove_resident(session_id)
+            self._hibernated.pop(session_id, None)
+
+    @contextmanager
+    def lock(self, session_id: str) -> Iterator[None]:
+        """
+        会话锁 - 同一会话的请求串行修改共享的游戏状态（可重入）
+
+        锁在没有请求持有或等待时移除，锁的数量只与并发处理中的会话数量有关。
+        """
+        with self._lock:
+            entry = self._session_locks.get(session_id)
+            if entry is None:
+                entry = self._session_locks[session_id] = [threading.RLock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._session_locks[session_id]
+
+    def locked(self, session_id: str) -> bool:
+        """会话是否正在被请求处理"""
+        return session_id in self._session_locks
+
+    def on_broker_event(self, event) -> None:
+        """其他进程修改了会话状态时移除本进程的副本（注册为消息代理的事件回调）"""
+        if event.remote and event.event_type == "state_changed":
+            self.discard(event.data.get("session_id", ""))
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._resident.clear()
+            self._hibernated.clear()
+            self._resident_bytes = 0
+
+    def hibernate(self, session_id: str) -> bool:
+        """将常驻会话休眠为压缩快照"""
+        with self._lock:
+            entry = self._remove_resident(session_id)
+            if not entry:
+                return False
+
+            snapshot = zlib.compress(entry.game_state.to_json().encode("utf-8"))
+            self._hibernated[session_id] = HibernatedSession(
+                snapshot=snapshot,
+                fingerprint=entry.fingerprint,
+                size=entry.size,
+                hibernated_at=time.monotonic()
+            )
+            return True
+
+    def sweep(self, now: Optional[float] = None) -> List[str]:
+        """
+        休眠空闲会话并清理过期快照
+
+        Returns:
+            本次休眠的会话ID列表
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [session_id for session_id, entry in self._resident.items()
+                    if now - entry.last_access >= self.idle_seconds and not self.locked(session_id)]
+            for session_id in idle:
+                self.hibernate(session_id)
+
+            expired = [session_id for session_id, entry in self._hibernated.items()
+                       if now - entry.hibernated_at >= self.snapshot_ttl]
+            for session_id in expired:
+                del self._hibernated[session_id]
+
+        if idle or expired:
+            logger.info(f"💤 休眠 {len(idle)} 个空闲会话，丢弃 {len(expired)} 个过期快照")
+        return idle
+
+    async def start(self) -> None:
+        """启动后台清理任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("✅ 会话缓存清理任务已启动")
+
+    async def stop(self) -> None:
+        """停止后台清理任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 会话缓存清理任务已停止")
+
+    async def _run(self) -> None:
+        """定期休眠空闲会话"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            await asyncio.to_thread(self.sweep)
+
+    def _add_resident(self, session_id: str, game_state: GameState, fingerprint: int, size: int) -> None:
+        """加入常驻会话并在超出内存预算时休眠其他会话"""
+        self._resident[session_id] = ResidentSession(
+            game_state=game_state,
+            fingerprint=fingerprint,
+            size=size,
+            last_access=time.monotonic()
+        )
+        self._resident_bytes += size
+        self._enforce_budget(keep=session_id)
+
+    def _remove_resident(self, session_id: str) -> Optional[ResidentSession]:
+        """移除常驻会话"""
+        entry = self._resident.pop(session_id, None)
+        if entry:
+            self._resident_bytes -= entry.size
+        return entry
+
+    def _enforce_budget(self, keep: str) -> None:
+        """内存超出预算时休眠会话，刚访问的会话除外"""
+        while self._resident_bytes > self.memory_budget and len(self._resident) > 1:
+            victim = self._pick_victim(keep)
+            if victim is None:
+                break
+            self.hibernate(victim)
+
+    def _pick_victim(self, keep: str) -> Optional[str]:
+        """选择要休眠的会话：优先最久未访问的非进行中会话，其次最久未访问的会话"""
+        fallback = None
+        for session_id, entry in self._resident.items():
+            if session_id == keep or self.locked(session_id):
+                continue  # 处理中的会话可能处于修改的中间状态
+            if entry.game_state.current_phase != GamePhase.PLAYER_TURN:
+                return session_id
+            if fallback is None:
+                fallback = session_id
+        return fallback
+
+
+# 进程内唯一的会话缓存
+session_cache = SessionCache()
@@ -0,0 +1,247 @@
+"""
+会话租约模块
+多进程部署时每个会话由持有租约的进程唯一写入，进程内的会话缓存和回合计时因此不会与其他进程冲突。
+租约记录在数据库的 session_leases 表中，落到非持有者的请求由接口层重定向到持有者。
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from config.settings import (SESSION_IDLE_SECONDS, SESSION_LEASE_MODE, SESSION_LEASE_TTL,
+                             WORKER_ADDRESS, WORKER_ID)
+from src.storage.repositories import SessionLeaseRepository
+from src.utils.logging import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+LEASE_MODES = ("local", "db")
+
+lease_checks = metrics.counter("session_lease_checks_total", "会话租约检查次数")
+lease_lost = metrics.counter("session_lease_lost_total", "被其他进程接管或过期的会话租约数量")
+
+
+@dataclass
+class LeaseOwner:
+    """其他进程持有的会话租约"""
+    owner_id: str
+    address: str
+    expires_at: datetime
+
+    def retry_after(self) -> int:
+        """租约剩余秒数（至少1秒）"""
+        return max(1, int((self.expires_at - datetime.utcnow()).total_seconds()) + 1)
+
+
+class LeaseManager:
+    """
+    会话租约管理 - 本进程持有的会话租约
+
+    - local 模式：单进程或测试使用，本进程拥有全部会话，不访问数据库
+    - db 模式：第一次处理会话时获取租约，后台按 ttl/3 间隔续约最近使用过的会话和设置了回合计时的会话；
+      空闲超过 idle_seconds 的会话不再续约，过期后可以由其他进程获取
+    获得租约时恢复会话的回合计时，失去租约的会话立即从会话缓存中移除并取消回合计时。
+    """
+
+    def __init__(self, mode: str = SESSION_LEASE_MODE, ttl: float = SESSION_LEASE_TTL,
+                 worker_id: str = WORKER_ID, address: str = WORKER_ADDRESS,
+                 idle_seconds: float = SESSION_IDLE_SECONDS):
+        if mode not in LEASE_MODES:
+            raise ValueError(f"未知的会话租约模式: {mode}")
+        self.mode = mode
+        self.ttl = ttl
+        self.worker_id = worker_id
+        self.address = address
+        self.idle_seconds = idle_seconds
+
+        self._expires: Dict[str, float] = {}  # 本进程持有的会话 -> 租约到期时间（monotonic）
+        self._last_used: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def local(self) -> bool:
+        """是否为本地模式"""
+        return self.mode == "local"
+
+    @property
+    def renew_interval(self) -> float:
+        """续约间隔"""
+        return self.ttl / 3
+
+    def owns(self, session_id: str) -> bool:
+        """本进程当前是否持有会话租约（不访问数据库）"""
+        return self.local or self._expires.get(session_id, 0.0) > time.monotonic()
+
+    def check_owner(self, db: Session, session_id: str) -> Optional[LeaseOwner]:
+        """
+        确保本进程持有会话租约
+
+        本地记录的租约剩余时间超过一个续约间隔时直接返回，否则到数据库获取或续约。
+
+        Returns:
+            本进程持有租约时返回 None，否则返回当前持有者
+        """
+        if self.local:
+            return None
+
+        now = time.monotonic()
+        held = session_id in self._expires
+        if held:
+            self._last_used[session_id] = now
+            if self._expires[session_id] - now > self.renew_interval:
+                lease_checks.inc(result="cached")
+                return None
+
+        lease = SessionLeaseRepository(db).acquire(session_id, self.worker_id, self.address, self.ttl)
+        if lease is not None and lease.owner_id == self.worker_id:
+            lease_checks.inc(result="acquired")
+            self._expires[session_id] = now + self.ttl
+            self._last_used[session_id] = now
+            if not held:
+                self._on_acquired(db, session_id)
+            return None
+
+        lease_checks.inc(result="foreign")
+        self._drop(session_id)
+        if lease is None:
+            # 租约在读取前被删除（持有者刚好释放），由调用方重试
+            return LeaseOwner(owner_id="", address="", expires_at=datetime.utcnow())
+        return LeaseOwner(owner_id=lease.owner_id, address=lease.owner_address or "", expires_at=lease.expires_at)
+
+    def handoff(self, db: Session, session_id: str, new_owner_id: str, new_owner_address: str = "") -> bool:
+        """
+        将本进程持有的会话租约转交给其他进程（例如下线前迁移会话）
+
+        Returns:
+            是否转交成功
+        """
+        if self.local:
+            return False
+        if not SessionLeaseRepository(db).handoff(session_id, self.worker_id, new_owner_id,
+                                                  new_owner_address, self.ttl):
+            return False
+        self._drop(session_id)
+        logger.info(f"🤝 会话 {session_id} 的租约已转交给 {new_owner_id}")
+        return True
+
+    def release(self, db: Session, session_id: str) -> bool:
+        """释放本进程持有的会话租约"""
+        if self.local:
+            return False
+        self._drop(session_id)
+        return SessionLeaseRepository(db).release(session_id, self.worker_id)
+
+    def renew_once(self, db: Session) -> Dict[str, Any]:
+        """
+        续约最近使用过的会话，放弃空闲的会话，清理过期的租约记录
+
+        设置了回合计时的会话即使没有请求也不算空闲：玩家都不在线时由计时器自动跳过回合，需要保留租约。
+        """
+        from src.services.turn_timer import turn_scheduler
+
+        if self.local:
+            return {"success": True, "renewed": 0, "lost": 0}
+
+        now = time.monotonic()
+        active = [sid for sid in list(self._expires)
+                  if sid in turn_scheduler.wheel or now - self._last_used.get(sid, 0.0) <= self.idle_seconds]
+        for session_id in set(self._expires) - set(active):
+            self._drop(session_id)
+
+        repository = SessionLeaseRepository(db)
+        held = repository.renew(self.worker_id, active, self.ttl) if active else set()
+        lost = [sid for sid in active if sid not in held]
+        for session_id in lost:
+            lease_lost.inc()
+            self._drop(session_id)
+            logger.warning(f"⚠️ 会话 {session_id} 的租约已失效")
+        for session_id in held:
+            self._expires[session_id] = now + self.ttl
+
+        repository.delete_expired(datetime.utcnow() - timedelta(seconds=self.ttl))
+        return {"success": True, "renewed": len(held), "lost": len(lost)}
+
+    def stats(self) -> Dict[str, Any]:
+        """租约统计"""
+        return {
+            "mode": self.mode,
+            "worker_id": self.worker_id,
+            "address": self.address,
+            "owned_sessions": len(self._expires),
+        }
+
+    async def start(self) -> None:
+        """启动后台续约任务"""
+        if not self.local and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"✅ 会话租约续约已启动（{self.worker_id}，有效期 {self.ttl} 秒）")
+
+    async def stop(self) -> None:
+        """停止后台续约任务并释放本进程持有的全部租约"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await asyncio.to_thread(self._release_all)
+            except Exception as e:
+                logger.error(f"❌ 释放会话租约失败: {e}")
+            logger.info("🛑 会话租约续约已停止")
+
+    async def _run(self) -> None:
+        """定期续约"""
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            try:
+                await asyncio.to_thread(self._with_db, self.renew_once)
+            except Exception as e:
+                logger.error(f"❌ 会话租约续约失败: {e}")
+
+    def _release_all(self) -> int:
+        """释放本进程持有的全部租约"""
+        for session_id in list(self._expires):
+            self._drop(session_id)
+        return self._with_db(lambda db: SessionLeaseRepository(db).release_all(self.worker_id))
+
+    @staticmethod
+    def _with_db(func):
+        """在独立的数据库会话中执行"""
+        from src.storage.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return func(db)
+        finally:
+            db.close()
+
+    def _on_acquired(self, db: Session, session_id: str) -> None:
+        """获得会话租约：按保存的回合开始时间恢复回合计时（之前持有者的计时随租约一起失效）"""
+        from src.services.game_session import GameSessionService
+
+        try:
+            GameSessionService(db).rearm_turn_timer(session_id)
+        except Exception as e:
+            logger.error(f"❌ 恢复会话 {session_id} 的回合计时失败: {e}")
+
+    def _drop(self, session_id: str) -> None:
+        """不再持有会话：移除内存中的状态和回合计时（之后由新持有者负责）"""
+        from src.services.session_cache import session_cache
+        from src.services.turn_timer import turn_scheduler
+
+        was_owned = self._expires.pop(session_id, None) is not None
+        self._last_used.pop(session_id, None)
+        if was_owned:
+            session_cache.discard(session_id)
+            turn_scheduler.disarm_turn(session_id)
+
+
+# 进程内唯一的会话租约管理
+lease_manager = LeaseManager()
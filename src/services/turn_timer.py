@@ -0,0 +1,206 @@
+"""
+回合计时模块
+用一个进程内的时间轮统一管理所有会话的回合截止时间，超时后自动跳过回合
+"""
+
+import asyncio
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TimerWheel:
+    """
+    哈希时间轮 - 管理大量定时器
+
+    时间被划分为固定长度的刻度，每个槽保存到期落在该槽的定时器。
+    设置和取消定时器都是 O(1)，每次前进一格只处理当前槽；
+    超过一圈的定时器记录剩余圈数。
+    设置和取消在请求线程和回调线程中进行，前进在事件循环中进行，均在锁内修改时间轮。
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 512):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self._wheel: List[Dict[str, List[Any]]] = [{} for _ in range(slots)]  # 每个槽: key -> [剩余圈数, 数据]
+        self._slot_of: Dict[str, int] = {}  # key -> 所在槽
+        self._cursor = 0
+        self.ticks = 0  # 已前进的刻度数
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def arm(self, key: str, delay_seconds: float, payload: Any = None) -> None:
+        """设置定时器（同一个key已有定时器时先取消）"""
+        ticks = max(1, math.ceil(delay_seconds / self.tick_seconds))
+        rounds = (ticks - 1) // self.slots
+
+        with self._lock:
+            self._disarm(key)
+            slot = (self._cursor + ticks) % self.slots
+            self._wheel[slot][key] = [rounds, payload]
+            self._slot_of[key] = slot
+
+    def disarm(self, key: str) -> bool:
+        """取消定时器，定时器不存在时返回False"""
+        with self._lock:
+            return self._disarm(key)
+
+    def tick(self) -> List[Tuple[str, Any]]:
+        """前进一个刻度，返回到期的 (key, 数据) 列表"""
+        with self._lock:
+            self._cursor = (self._cursor + 1) % self.slots
+            self.ticks += 1
+
+            bucket = self._wheel[self._cursor]
+            expired = []
+            for key, entry in list(bucket.items()):
+                if entry[0] > 0:
+                    entry[0] -= 1
+                else:
+                    del bucket[key]
+                    del self._slot_of[key]
+                    expired.append((key, entry[1]))
+            return expired
+
+    def _disarm(self, key: str) -> bool:
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._wheel[slot][key]
+        return True
+
+
+def auto_pass_session(session_id: str, turn_key: str) -> None:
+    """回合超时回调：通过正常的行动流程为当前玩家跳过回合"""
+    from src.storage.database import SessionLocal
+    from src.services.game_session import GameSessionService
+
+    db = SessionLocal()
+    try:
+        result = GameSessionService(db).auto_pass(session_id, turn_key)
+        logger.info(f"⏰ 会话 {session_id} 回合超时: {result['message']}")
+    except Exception as e:
+        logger.error(f"❌ 会话 {session_id} 自动跳过回合失败: {e}")
+    finally:
+        db.close()
+
+
+def restore_turn_timers() -> int:
+    """
+    启动时恢复进行中会话的回合计时（计时只保存在内存中，重启后需要按回合开始时间重新设置）
+
+    db 租约模式下只恢复本进程能获取租约的会话（获取租约时会重新设置计时），其他进程持有的会话由持有者负责。
+
+    Returns:
+        恢复计时的会话数量
+    """
+    from src.storage.database import SessionLocal
+    from src.storage.repositories import GameSessionRepository
+    from src.services.game_session import GameSessionService
+    from src.services.session_lease import lease_manager
+
+    db = SessionLocal()
+    restored = 0
+    try:
+        service = GameSessionService(db)
+        session_ids = [session.id for session in GameSessionRepository(db).list_by_status(["playing"], limit=None)]
+        for session_id in session_ids:
+            try:
+                if lease_manager.check_owner(db, session_id) is None and service.rearm_turn_timer(session_id):
+                    restored += 1
+            except Exception as e:
+                logger.error(f"❌ 恢复会话 {session_id} 的回合计时失败: {e}")
+    finally:
+        db.close()
+
+    logger.info(f"⏰ 已恢复 {restored} 个会话的回合计时")
+    return restored
+
+
+class TurnScheduler:
+    """
+    回合计时调度器
+
+    所有会话共享一个时间轮和一个后台任务，不为每个会话创建任务或轮询。
+    每个到期的会话分别在线程中执行回调，避免阻塞事件循环，一个会话保存缓慢也不会推迟其他会话。
+    """
+
+    def __init__(self, on_expire: Optional[Callable[[str, Any], None]] = None,
+                 tick_seconds: float = 1.0, slots: int = 512):
+        self.wheel = TimerWheel(tick_seconds, slots)
+        self.on_expire = on_expire or auto_pass_session
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()  # 执行中的到期回调
+
+    @property
+    def armed_count(self) -> int:
+        """已设置定时器的会话数量"""
+        return len(self.wheel)
+
+    def arm_turn(self, session_id: str, turn_key: str, time_limit: float) -> None:
+        """为会话的当前回合设置截止时间，turn_key 用于识别过期的回合"""
+        self.wheel.arm(session_id, time_limit, turn_key)
+
+    def disarm_turn(self, session_id: str) -> bool:
+        """取消会话的回合计时"""
+        return self.wheel.disarm(session_id)
+
+    async def start(self) -> None:
+        """启动后台计时任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("✅ 回合计时调度器已启动")
+
+    async def stop(self) -> None:
+        """停止后台计时任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 回合计时调度器已停止")
+
+    async def _run(self) -> None:
+        """按刻度推进时间轮（根据实际经过的时间补齐刻度，避免漂移）"""
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        start_ticks = self.wheel.ticks
+
+        while True:
+            next_tick_at = started_at + (self.wheel.ticks - start_ticks + 1) * self.wheel.tick_seconds
+            await asyncio.sleep(max(0.0, next_tick_at - loop.time()))
+
+            expired = []
+            due_ticks = int((loop.time() - started_at) / self.wheel.tick_seconds) - (self.wheel.ticks - start_ticks)
+            for _ in range(due_ticks):
+                expired.extend(self.wheel.tick())
+
+            for session_id, turn_key in expired:
+                self._dispatch(session_id, turn_key)
+
+    def _dispatch(self, session_id: str, turn_key: Any) -> None:
+        """在线程中执行一个会话的到期回调，不等待完成"""
+        task = asyncio.create_task(asyncio.to_thread(self.on_expire, session_id, turn_key))
+        self._running.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        """到期回调完成"""
+        self._running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ 回合超时回调失败: {task.exception()}")
+
+
+# 进程内唯一的回合计时调度器
+turn_scheduler = TurnScheduler()
@@ -0,0 +1,300 @@
+"""
+游戏视图模块
+每个会话每个版本（GameState.version）只遍历一次游戏状态，同时生成每名玩家的视图和观战视图：
+
+- 公共部分（精简的版图、隐藏顺序的牌堆、各玩家的公开信息）只编码一次，所有视图共享
+- 玩家视图只把自己的条目换成包含手牌的私有条目，其余文本直接拼接
+- 牌堆顺序和抽牌堆对所有人隐藏，手牌只对本人可见，玩家账号和玩家ID只对本人可见（公开条目用座位号）
+- 玩家视图只提供给持有该座位令牌的调用方（加入会话或匹配成功时发放），玩家ID本身不是凭证
+视图编码为 JSON 文本后由所有连接共享引用，观战人数和玩家人数增加不会增加数据库访问和序列化。
+
+- 持有会话的进程在保存游戏状态时直接用内存中的状态刷新有人查看的会话
+- 其他进程收到 state_changed 事件后标记视图过期，下一次请求时每个版本只从数据库加载一次
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+from config.settings import GAME_VIEW_LIMIT, SEAT_TOKEN_SECRET
+from src.core.game_state import GameState
+from src.services.catalog import static_catalog
+from src.utils.logging import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+views_built = metrics.counter("game_views_built_total", "生成的会话视图数量（每次包含全部玩家视图和观战视图）")
+view_requests = metrics.counter("game_view_requests_total", "会话视图请求次数")
+
+# 只对玩家本人可见的字段
+PRIVATE_PLAYER_FIELDS = ("user_id", "player_id")
+
+
+def seat_token(session_id: str, player_id: str) -> str:
+    """生成座位令牌（会话ID和玩家ID的签名），持有者可以获取该玩家的视图"""
+    message = f"{session_id}:{player_id}".encode("utf-8")
+    return hmac.new(SEAT_TOKEN_SECRET.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def verify_seat_token(session_id: str, player_id: str, token: Optional[str]) -> bool:
+    """检查座位令牌"""
+    return bool(token) and hmac.compare_digest(seat_token(session_id, player_id), token)
+
+
+def redact_card_manager(card_manager: Dict[str, Any]) -> Dict[str, Any]:
+    """隐藏玩家的抽牌堆和手牌（只保留数量），弃牌堆和已打出的牌公开"""
+    return {
+        "draw_pile_count": len(card_manager.get("draw_pile", [])),
+        "hand_count": len(card_manager.get("hand_cards", [])),
+        "discard_pile": card_manager.get("discard_pile", []),
+        "played_objectives": card_manager.get("played_objectives", []),
+        "acquired_cards": card_manager.get("acquired_cards", []),
+    }
+
+
+def redact_decks(deck_manager: Dict[str, Any]) -> Dict[str, Any]:
+    """隐藏公共牌堆的顺序（只保留剩余数量），弃牌公开"""
+    return {"decks": {
+        card_type: {"remaining": len(deck.get("cards", [])), "discarded": deck.get("discarded", [])}
+        for card_type, deck in deck_manager.get("decks", {}).items()
+    }}
+
+
+def public_player(player: Dict[str, Any], seat: int) -> Dict[str, Any]:
+    """玩家的公开信息（其他玩家和观战者看到的），用座位号代替玩家ID"""
+    public = {key: value for key, value in player.items() if key not in PRIVATE_PLAYER_FIELDS}
+    public["seat"] = seat
+    public["card_manager"] = redact_card_manager(player.get("card_manager", {}))
+    return public
+
+
+def private_player(player: Dict[str, Any], public: Dict[str, Any]) -> Dict[str, Any]:
+    """玩家本人看到的信息：公开信息加上账号、玩家ID和手牌（抽牌堆顺序对本人同样隐藏）"""
+    card_manager = {**public["card_manager"], "hand_cards": player.get("card_manager", {}).get("hand_cards", [])}
+    return {**public, **{key: player[key] for key in PRIVATE_PLAYER_FIELDS if key in player},
+            "card_manager": card_manager}
+
+
+def session_metadata(session) -> Dict[str, Any]:
+    """视图中附带的会话信息"""
+    return {
+        "session_id": session.id,
+        "session_name": session.session_name,
+        "max_players": session.max_players,
+        "current_players": session.current_players,
+        "created_by": session.created_by,
+        "host_player_id": session.host_player_id,
+        "created_at": session.created_at.isoformat() if session.created_at else None,
+        "started_at": session.started_at.isoformat() if session.started_at else None,
+    }
+
+
+def _encode(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _object_body(data: Dict[str, Any]) -> str:
+    """编码为不带外层花括号的 JSON 对象内容（用于拼接）"""
+    return _encode(data)[1:-1]
+
+
+@dataclass(frozen=True)
+class ViewSnapshot:
+    """一个视图的编码结果（不可变，所有连接共享）"""
+    text: str  # 编码后的 JSON，WebSocket 直接发送
+    body: bytes  # 同一内容的 UTF-8 字节，HTTP 直接返回
+    etag: str
+
+    @classmethod
+    def from_text(cls, text: str, etag: str) -> "ViewSnapshot":
+        return cls(text=text, body=text.encode("utf-8"), etag=etag)
+
+
+@dataclass(frozen=True)
+class SessionViews:
+    """会话某个版本的全部视图"""
+    session_id: str
+    version: int
+    spectator: ViewSnapshot
+    players: Mapping[str, ViewSnapshot]  # 玩家ID -> 该玩家的视图
+
+    def for_viewer(self, player_id: Optional[str] = None) -> Optional[ViewSnapshot]:
+        """获取玩家视图，不指定玩家时返回观战视图；玩家不在会话中时返回 None"""
+        if player_id is None:
+            return self.spectator
+        return self.players.get(player_id)
+
+
+def build_session_views(session_id: str, game_state: Dict[str, Any],
+                        metadata: Optional[Dict[str, Any]] = None) -> SessionViews:
+    """
+    一次遍历生成会话的全部视图
+
+    Args:
+        session_id: 游戏会话ID
+        game_state: GameState.to_dict() 的结果（不会被修改）
+        metadata: 视图中附带的会话信息
+    """
+    version = game_state.get("version", 1)
+    players: List[Dict[str, Any]] = game_state.get("players", [])
+
+    # 公共部分：只编码一次
+    base = static_catalog.compact_game_state(game_state)
+    base.pop("players", None)
+    if "deck_manager" in game_state:
+        base["deck_manager"] = redact_decks(game_state["deck_manager"])
+    head = _object_body({**(metadata or {"session_id": session_id}), "version": version})
+    base_body = _object_body(base)
+
+    publics = [public_player(player, seat) for seat, player in enumerate(players)]
+    public_entries = [_encode(public) for public in publics]
+
+    def compose(viewer: Optional[str], entries: List[str]) -> str:
+        return (f'{{"viewer": {_encode(viewer)}, {head}, '
+                f'"game_state": {{{base_body}, "players": [{", ".join(entries)}]}}}}')
+
+    spectator = ViewSnapshot.from_text(compose(None, public_entries), f'"{session_id}-{version}"')
+
+    player_views = {}
+    for index, (player, public) in enumerate(zip(players, publics)):
+        entries = list(public_entries)
+        entries[index] = _encode(private_player(player, public))
+        player_id = player["player_id"]
+        player_views[player_id] = ViewSnapshot.from_text(compose(player_id, entries),
+                                                         f'"{session_id}-{version}-{player_id}"')
+
+    views_built.inc()
+    return SessionViews(session_id=session_id, version=version, spectator=spectator,
+                        players=MappingProxyType(player_views))
+
+
+class ViewHub:
+    """
+    会话视图缓存 - 最近被查看的会话的最新视图
+
+    按最近访问保留至多 limit 个会话；只有缓存中的会话（有人在查看）才会在保存时刷新视图。
+    """
+
+    def __init__(self, limit: int = GAME_VIEW_LIMIT):
+        self.limit = limit
+        self._views: "OrderedDict[str, SessionViews]" = OrderedDict()
+        self._latest: Dict[str, int] = {}  # 已知的最新版本（来自 state_changed 事件）
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def watched(self, session_id: str) -> bool:
+        """会话是否有人查看"""
+        return session_id in self._views
+
+    def peek(self, session_id: str) -> Optional[SessionViews]:
+        """获取最新的视图，视图不存在或已过期时返回 None（不访问数据库）"""
+        with self._lock:
+            views = self._views.get(session_id)
+            if views is None or views.version < self._latest.get(session_id, 0):
+                return None
+            self._views.move_to_end(session_id)
+        view_requests.inc(result="hit")
+        return views
+
+    def get(self, session_id: str) -> Optional[SessionViews]:
+        """获取最新的视图，需要时从数据库加载（同一会话并发请求只加载一次），会话不存在时返回 None"""
+        views = self.peek(session_id)
+        if views is not None:
+            return views
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(session_id, threading.Lock())
+        with load_lock:
+            # 等待期间其他请求可能已经加载
+            views = self.peek(session_id)
+            if views is not None:
+                return views
+            view_requests.inc(result="miss")
+            views = self._load(session_id)
+            if views is not None:
+                self._store(views)
+        with self._lock:
+            self._load_locks.pop(session_id, None)
+        return views
+
+    def update(self, session, game_state: GameState,
+               state_dict: Optional[Dict[str, Any]] = None) -> Optional[SessionViews]:
+        """
+        保存游戏状态后刷新视图（只刷新有人查看的会话，使用内存中的状态）
+
+        state_dict 是保存时已经生成的 game_state.to_dict()，提供时不再重复序列化。
+        """
+        session_id = game_state.session_id
+        self.mark_version(session_id, game_state.version)
+        if not self.watched(session_id):
+            return None
+        if state_dict is None:
+            state_dict = game_state.to_dict()
+        views = build_session_views(session_id, state_dict, session_metadata(session))
+        self._store(views)
+        return views
+
+    def mark_version(self, session_id: str, version: int) -> None:
+        """记录会话的最新版本，旧视图在下一次请求时重新生成"""
+        with self._lock:
+            if session_id in self._views and version > self._latest.get(session_id, 0):
+                self._latest[session_id] = version
+
+    def on_broker_event(self, event) -> None:
+        """其他进程修改了会话状态时标记视图过期（注册为消息代理的事件回调）"""
+        if event.remote and event.event_type == "state_changed" and "version" in event.data:
+            self.mark_version(event.data["session_id"], event.data["version"])
+
+    def discard(self, session_id: str) -> None:
+        """移除会话的视图"""
+        with self._lock:
+            self._views.pop(session_id, None)
+            self._latest.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """视图缓存统计"""
+        return {
+            "watched_sessions": len(self._views),
+            "hits": view_requests.value(result="hit"),
+            "misses": view_requests.value(result="miss"),
+        }
+
+    def _store(self, views: SessionViews) -> None:
+        """保存视图（不覆盖更新的版本），超过上限时移除最久未访问的会话"""
+        with self._lock:
+            current = self._views.get(views.session_id)
+            if current is None or current.version <= views.version:
+                self._views[views.session_id] = views
+            self._views.move_to_end(views.session_id)
+            self._latest[views.session_id] = max(views.version, self._latest.get(views.session_id, 0))
+            while len(self._views) > self.limit:
+                evicted, _ = self._views.popitem(last=False)
+                self._latest.pop(evicted, None)
+
+    @staticmethod
+    def _load(session_id: str) -> Optional[SessionViews]:
+        """从数据库加载会话状态并生成视图（直接使用存储的 JSON，不重建 GameState）"""
+        from src.storage.database import SessionLocal
+        from src.storage.repositories import GameSessionRepository
+
+        db = SessionLocal()
+        try:
+            session = GameSessionRepository(db).get_by_id(session_id)
+            if session is None or not session.game_state:
+                return None
+            return build_session_views(session_id, json.loads(session.game_state), session_metadata(session))
+        finally:
+            db.close()
+
+
+# 进程内唯一的会话视图缓存
+view_hub = ViewHub()
@@ -0,0 +1,241 @@
+"""
+游戏归档模块
+将已结束的游戏会话追加写入分段归档文件，通过 mmap 按会话ID随机读取或顺序扫描
+
+目录结构：
+- segment_000001.dat: 追加写入的记录，每条记录为
+  [元数据长度 uint32][数据长度 uint32][元数据 JSON][游戏状态数据（保持数据库中的编码）]
+- segment_000001.idx: 追加写入的定长索引项 [会话ID 64字节][偏移 uint64][记录长度 uint32]
+- archive.lock: 进程间写入锁（多个工作进程共享同一个归档目录）
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # 非 POSIX 平台没有文件锁，只支持单进程写入
+    fcntl = None
+
+from config.settings import ARCHIVE_DIR, ARCHIVE_SEGMENT_SIZE
+from src.storage.compression import game_state_codec
+
+RECORD_HEADER = struct.Struct("<II")
+INDEX_ENTRY = struct.Struct("<64sQI")
+LOCK_FILE = "archive.lock"
+
+
+class ArchiveSegment:
+    """归档分段 - 一个数据文件和对应的索引文件"""
+
+    def __init__(self, directory: Path, number: int):
+        self.number = number
+        self.data_path = directory / f"segment_{number:06d}.dat"
+        self.index_path = directory / f"segment_{number:06d}.idx"
+        self._mmap: Optional[mmap.mmap] = None
+
+    @property
+    def size(self) -> int:
+        """数据文件大小"""
+        return self.data_path.stat().st_size if self.data_path.exists() else 0
+
+    def load_index(self) -> Dict[str, Tuple[int, int]]:
+        """读取索引，忽略指向数据文件之外的索引项（写入中断）"""
+        entries, _ = self.read_index(0)
+        return dict(entries)
+
+    def read_index(self, start: int) -> Tuple[List[Tuple[str, Tuple[int, int]]], int]:
+        """
+        从 start 位置读取完整的索引项（其他进程可能正在追加，不完整的索引项留到下次读取）
+
+        Returns:
+            ([(会话ID, (偏移, 长度))], 已读取到的位置)
+        """
+        if not self.index_path.exists():
+            return [], start
+
+        with open(self.index_path, "rb") as f:
+            f.seek(start)
+            raw = f.read()
+        data_size = self.size
+        entries = []
+        complete = len(raw) - len(raw) % INDEX_ENTRY.size
+        for position in range(0, complete, INDEX_ENTRY.size):
+            session_id, offset, length = INDEX_ENTRY.unpack_from(raw, position)
+            if offset + length <= data_size:
+                entries.append((session_id.rstrip(b"\0").decode("utf-8"), (offset, length)))
+        return entries, start + complete
+
+    def view(self, end: int) -> mmap.mmap:
+        """获取覆盖到 end 位置的只读映射（分段增长后重新映射）"""
+        if self._mmap is None or len(self._mmap) < end:
+            self.close()
+            with open(self.data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def close(self) -> None:
+        """关闭映射"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class SessionArchive:
+    """
+    会话归档 - 追加写入、按会话ID随机读取
+
+    归档只追加不修改，写满 segment_size 后开启新的分段。
+    数据先写入并同步到磁盘，再写入索引，因此索引项总是指向完整的记录。
+    多个工作进程共享归档目录：追加在文件锁内进行，写入前先读取其他进程追加的索引项，
+    写入偏移和分段选择都以磁盘上的最新状态为准。
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR, segment_size: int = ARCHIVE_SEGMENT_SIZE):
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._segments: Dict[int, ArchiveSegment] = {}
+        self._index: Dict[str, Tuple[int, int, int]] = {}  # 会话ID -> (分段号, 偏移, 长度)
+        self._index_positions: Dict[int, int] = {}  # 分段号 -> 已读取的索引文件位置
+        self._lock = threading.Lock()
+        self._lock_path = self.directory / LOCK_FILE
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._index
+
+    def append(self, session_id: str, metadata: Dict[str, Any], data: bytes) -> bool:
+        """
+        追加一个会话
+
+        Args:
+            session_id: 游戏会话ID
+            metadata: 会话元数据（状态、时间、编码器等）
+            data: 游戏状态数据
+
+        Returns:
+            是否写入（已归档的会话不会重复写入）
+        """
+        if len(session_id.encode("utf-8")) > 64:
+            raise ValueError(f"会话ID过长: {session_id}")
+
+        with self._exclusive():
+            # 其他进程可能已经追加了记录或开启了新分段
+            self._refresh()
+            if session_id in self._index:
+                return False
+
+            segment = self._active_segment()
+            meta = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+            record = RECORD_HEADER.pack(len(meta), len(data)) + meta + data
+
+            with open(segment.data_path, "ab") as f:
+                offset = os.fstat(f.fileno()).st_size
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            with open(segment.index_path, "ab") as f:
+                f.write(INDEX_ENTRY.pack(session_id.encode("utf-8"), offset, len(record)))
+
+            self._index[session_id] = (segment.number, offset, len(record))
+            return True
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """按会话ID读取归档，返回元数据和解码后的游戏状态"""
+        location = self._index.get(session_id)
+        if not location:
+            # 可能由其他进程归档
+            with self._lock:
+                self._refresh()
+            location = self._index.get(session_id)
+            if not location:
+                return None
+
+        number, offset, length = location
+        with self._lock:
+            view = self._segments[number].view(offset + length)
+            return self._decode_record(view, offset)
+
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        """按写入顺序扫描所有归档"""
+        for number in sorted(self._segments):
+            segment = self._segments[number]
+            end = segment.size
+            if end == 0:
+                continue
+
+            offset = 0
+            while offset + RECORD_HEADER.size <= end:
+                with self._lock:
+                    view = segment.view(end)
+                    meta_length, data_length = RECORD_HEADER.unpack_from(view, offset)
+                    record_end = offset + RECORD_HEADER.size + meta_length + data_length
+                    if record_end > end:
+                        break  # 写入中断的不完整记录
+                    record = self._decode_record(view, offset)
+                yield record
+                offset = record_end
+
+    def close(self) -> None:
+        """关闭所有映射"""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """写入锁：进程内的线程锁加进程间的文件锁"""
+        with self._lock:
+            with open(self._lock_path, "ab") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """加载新出现的分段和索引项（只读取上次之后追加的部分）"""
+        for path in sorted(self.directory.glob("segment_*.dat")):
+            number = int(path.stem.split("_")[1])
+            if number not in self._segments:
+                self._segments[number] = ArchiveSegment(self.directory, number)
+
+        for number, segment in self._segments.items():
+            entries, position = segment.read_index(self._index_positions.get(number, 0))
+            self._index_positions[number] = position
+            for session_id, (offset, length) in entries:
+                self._index[session_id] = (number, offset, length)
+
+    def _active_segment(self) -> ArchiveSegment:
+        """获取当前写入的分段，写满时开启新分段"""
+        number = max(self._segments, default=0)
+        if number == 0 or self._segments[number].size >= self.segment_size:
+            number += 1
+            self._segments[number] = ArchiveSegment(self.directory, number)
+        return self._segments[number]
+
+    @staticmethod
+    def _decode_record(view: mmap.mmap, offset: int) -> Dict[str, Any]:
+        """解析一条记录"""
+        meta_length, data_length = RECORD_HEADER.unpack_from(view, offset)
+        start = offset + RECORD_HEADER.size
+        metadata = json.loads(view[start:start + meta_length].decode("utf-8"))
+        data = view[start + meta_length:start + meta_length + data_length]
+
+        return {
+            **metadata,
+            "game_state": game_state_codec.decode(data, metadata.get("game_state_codec"))
+        }
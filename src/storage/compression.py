@@ -0,0 +1,148 @@
+"""
+游戏状态压缩模块
+负责 game_sessions.game_state 的压缩存储，支持 zlib 和可选的 zstd 字典压缩
+
+每一行记录都保存编码器标识（game_state_codec）：
+- None / "json": 未压缩的 JSON（旧数据）
+- "zlib": zlib 压缩
+- "zstd:<字典ID>": 使用训练字典的 zstd 压缩
+"""
+
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import GAME_STATE_CODEC, GAME_STATE_ZLIB_LEVEL, GAME_STATE_ZSTD_DICT
+from src.utils.logging import get_logger
+
+try:
+    import zstandard
+except ImportError:  # zstd 为可选依赖，未安装时只使用 zlib
+    zstandard = None
+
+logger = get_logger(__name__)
+
+CODEC_JSON = "json"
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD_PREFIX = "zstd:"
+
+
+class GameStateCodec:
+    """游戏状态编解码器"""
+
+    def __init__(self, codec: str = GAME_STATE_CODEC, zlib_level: int = GAME_STATE_ZLIB_LEVEL,
+                 zstd_dict_path: str = GAME_STATE_ZSTD_DICT):
+        self.codec = codec
+        self.zlib_level = zlib_level
+        self._zstd_dicts: Dict[str, "zstandard.ZstdCompressionDict"] = {}  # 字典ID -> 字典
+        self._zstd_codec: Optional[str] = None  # 写入时使用的 zstd 编码器标识
+
+        if codec == "zstd":
+            self._load_default_dictionary(zstd_dict_path)
+
+    def encode(self, game_state_json: str) -> Tuple[bytes, str]:
+        """
+        编码游戏状态
+
+        Args:
+            game_state_json: 序列化后的游戏状态
+
+        Returns:
+            (存储的数据, 编码器标识)
+        """
+        data = game_state_json.encode("utf-8")
+
+        if self._zstd_codec:
+            dictionary = self._zstd_dicts[self._zstd_codec]
+            return zstandard.ZstdCompressor(dict_data=dictionary).compress(data), self._zstd_codec
+
+        if self.codec == CODEC_JSON:
+            return data, CODEC_JSON
+
+        return zlib.compress(data, self.zlib_level), CODEC_ZLIB
+
+    def decode(self, data: Optional[bytes], codec: Optional[str]) -> Optional[str]:
+        """
+        解码游戏状态（兼容未压缩的旧数据）
+
+        Args:
+            data: 存储的数据
+            codec: 编码器标识，旧数据为None
+
+        Returns:
+            序列化的游戏状态
+        """
+        if data is None:
+            return None
+        if isinstance(data, str):
+            return data
+
+        if codec in (None, CODEC_JSON):
+            return data.decode("utf-8")
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(data).decode("utf-8")
+        if codec.startswith(CODEC_ZSTD_PREFIX):
+            dictionary = self._get_zstd_dictionary(codec)
+            return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(data).decode("utf-8")
+
+        raise ValueError(f"未知的游戏状态编码器: {codec}")
+
+    def _load_default_dictionary(self, dict_path: str) -> None:
+        """加载写入时使用的 zstd 字典，不可用时回退到 zlib"""
+        if zstandard is None:
+            logger.warning("⚠️ 未安装 zstandard，游戏状态使用 zlib 压缩")
+            return
+        if not dict_path or not Path(dict_path).exists():
+            logger.warning(f"⚠️ zstd 字典不存在: {dict_path}，游戏状态使用 zlib 压缩")
+            return
+
+        dictionary = zstandard.ZstdCompressionDict(Path(dict_path).read_bytes())
+        self._zstd_codec = f"{CODEC_ZSTD_PREFIX}{dictionary.dict_id()}"
+        self._zstd_dicts[self._zstd_codec] = dictionary
+        logger.info(f"✅ 已加载 zstd 字典: {dict_path} ({self._zstd_codec})")
+
+    def _get_zstd_dictionary(self, codec: str) -> "zstandard.ZstdCompressionDict":
+        """获取解码所需的 zstd 字典（字典文件与默认字典放在同一目录，以字典ID命名）"""
+        if zstandard is None:
+            raise RuntimeError("读取 zstd 压缩的游戏状态需要安装 zstandard")
+
+        dictionary = self._zstd_dicts.get(codec)
+        if dictionary is None:
+            dict_id = codec[len(CODEC_ZSTD_PREFIX):]
+            dict_file = Path(GAME_STATE_ZSTD_DICT).parent / f"{dict_id}.dict"
+            if not dict_file.exists():
+                raise ValueError(f"找不到 zstd 字典: {dict_file}")
+            dictionary = zstandard.ZstdCompressionDict(dict_file.read_bytes())
+            self._zstd_dicts[codec] = dictionary
+        return dictionary
+
+
+def train_zstd_dictionary(samples: List[str], output_path: str, dict_size: int = 112 * 1024) -> str:
+    """
+    用游戏状态样本训练 zstd 字典
+
+    字典同时保存到 output_path 和同目录下以字典ID命名的文件，
+    更换默认字典后旧数据仍可按ID找到原字典解码。
+
+    Args:
+        samples: 序列化的游戏状态样本
+        output_path: 默认字典路径（对应 GAME_STATE_ZSTD_DICT）
+        dict_size: 字典大小（字节）
+
+    Returns:
+        编码器标识
+    """
+    if zstandard is None:
+        raise RuntimeError("训练字典需要安装 zstandard")
+
+    dictionary = zstandard.train_dictionary(dict_size, [sample.encode("utf-8") for sample in samples])
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(dictionary.as_bytes())
+    (output.parent / f"{dictionary.dict_id()}.dict").write_bytes(dictionary.as_bytes())
+
+    return f"{CODEC_ZSTD_PREFIX}{dictionary.dict_id()}"
+
+
+# 进程内共用的编解码器
+game_state_codec = GameStateCodec()
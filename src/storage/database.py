@@ -9,7 +9,7 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
-from config.settings import DATABASE_URL, DEBUG
+from config.settings import DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_SIZE, DEBUG
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -23,8 +23,8 @@ try:
         # 开发环境显示SQL语句
         echo=DEBUG,
         # 连接池配置
-        pool_size=10,
-        max_overflow=20,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
         pool_pre_ping=True,
         pool_recycle=3600,
     )
@@ -55,6 +55,9 @@ def get_db():
         logger.debug("✅ 数据库会话使用完成")
     except SQLAlchemyError as e:
         db.rollback()
+        if "database is locked" in str(e):
+            from src.utils.metrics import metrics
+            metrics.counter("database_lock_errors_total", "数据库锁等待超时次数").inc()
         logger.error(f"❌ 数据库会话错误: {e}")
         raise
     finally:
@@ -71,6 +74,7 @@ def init_db():
 
         # 创建所有表
         Base.metadata.create_all(bind=engine)
+        _upgrade_schema()
         logger.info("✅ 数据库表结构初始化成功")
 
         # 检查表是否创建成功
@@ -84,6 +88,53 @@ def init_db():
         logger.error(f"❌ 数据库初始化失败: {e}")
         return False
 
+# 将旧的文本 game_state 列改为二进制列（按数据库方言）
+_GAME_STATE_TO_BINARY = {
+    "postgresql": "ALTER TABLE game_sessions ALTER COLUMN game_state TYPE BYTEA USING convert_to(game_state, 'UTF8')",
+    "mysql": "ALTER TABLE game_sessions MODIFY game_state LONGBLOB",
+}
+
+def _upgrade_schema(bind=None):
+    """
+    升级已存在的表（create_all 不会修改已存在的表）
+
+    - 补充新增的列 game_sessions.game_state_codec
+    - game_sessions.game_state 由文本改为二进制（存储压缩后的游戏状态）：
+      PostgreSQL 和 MySQL 修改列类型；SQLite 按值而不是按列保存类型，
+      声明为 TEXT 的旧列可以直接存入二进制数据，不需要迁移；
+      其他数据库无法自动迁移，抛出异常
+    """
+    from sqlalchemy import inspect
+
+    bind = bind or engine
+    inspector = inspect(bind)
+    if "game_sessions" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"]: column for column in inspector.get_columns("game_sessions")}
+    if "game_state_codec" not in columns:
+        with bind.begin() as conn:
+            conn.execute(text("ALTER TABLE game_sessions ADD COLUMN game_state_codec VARCHAR(32)"))
+        logger.info("✅ 已添加列: game_sessions.game_state_codec")
+
+    dialect = bind.dialect.name
+    if dialect == "sqlite" or _is_binary(columns["game_state"]["type"]):
+        return
+
+    statement = _GAME_STATE_TO_BINARY.get(dialect)
+    if statement is None:
+        raise RuntimeError(f"无法自动将 {dialect} 数据库的 game_sessions.game_state 列迁移为二进制类型，请手动迁移")
+    with bind.begin() as conn:
+        conn.execute(text(statement))
+    logger.info("✅ 已将列 game_sessions.game_state 改为二进制类型")
+
+def _is_binary(column_type) -> bool:
+    """数据库中的列类型是否为二进制类型"""
+    try:
+        return column_type.python_type is bytes
+    except NotImplementedError:
+        return False
+
 def check_db_connection():
     """
     检查数据库连接是否正常
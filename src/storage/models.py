@@ -1,6 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from src.storage.database import Base
+from src.storage.compression import game_state_codec
+
+
+class StoredGameState(TypeDecorator):
+    """游戏状态存储类型（二进制，兼容以文本存储的旧数据）"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if isinstance(value, str):
+                return value.encode("utf-8")
+            return bytes(value) if value is not None else None
+        return process
 
 
 class GameSession(Base):
@@ -13,7 +28,8 @@ class GameSession(Base):
     session_type = Column(String(20))  # public, private, ranked, friendly
     max_players = Column(Integer, default=4)
     current_players = Column(Integer, default=1)
-    game_state = Column(Text)  # 存储序列化的GameState JSON
+    game_state_data = Column("game_state", StoredGameState)  # 编码后的GameState JSON
+    game_state_codec = Column(String(32))  # 编码器标识，旧数据为空（未压缩的JSON）
     game_config = Column(JSON)
     session_status = Column(String(20))  # waiting, playing, paused, finished, aborted
     created_by = Column(String(64))
@@ -25,6 +41,28 @@ class GameSession(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     version = Column(Integer, default=1)
 
+    @property
+    def game_state(self) -> str:
+        """序列化的GameState JSON（读写时自动解压和压缩）"""
+        data = self.game_state_data
+        cached = self.__dict__.get("_game_state_cache")
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        game_state_json = game_state_codec.decode(data, self.game_state_codec)
+        self.__dict__["_game_state_cache"] = (data, game_state_json)
+        return game_state_json
+
+    @game_state.setter
+    def game_state(self, game_state_json: str):
+        self.game_state_data, self.game_state_codec = game_state_codec.encode(game_state_json)
+        self.__dict__["_game_state_cache"] = (self.game_state_data, game_state_json)
+
+    @property
+    def game_state_fingerprint(self) -> int:
+        """存储状态的指纹（不需要解压）"""
+        return hash((self.game_state_codec, self.game_state_data))
+
 
 class Player(Base):
     """玩家数据库模型"""
@@ -40,3 +78,14 @@ class Player(Base):
     last_played = Column(DateTime)
 
 
+
+
+class SessionLease(Base):
+    """会话租约数据库模型（会话的唯一写入进程）"""
+    __tablename__ = "session_leases"
+
+    session_id = Column(String(64), primary_key=True)
+    owner_id = Column(String(128), index=True)  # 持有租约的进程ID
+    owner_address = Column(String(256))  # 持有者地址，非持有者据此重定向请求
+    expires_at = Column(DateTime, index=True)
+    acquired_at = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,13 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from .models import GameSession as GameSessionModel
+from .models import GameSession as GameSessionModel, Player, SessionLease
+from ..utils.metrics import timed
+
+LEASE_BATCH_SIZE = 500  # 每条续约语句包含的会话数量上限
+LEASE_EXECUTION_OPTIONS = {"synchronize_session": False}  # 条件更新不需要同步会话中的对象
 
 
 class GameSessionRepository:
@@ -8,6 +16,7 @@ class GameSessionRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @timed("repository_operation_seconds", "存储库操作耗时", operation="get_by_id")
     def get_by_id(self, session_id: str) -> GameSessionModel:
         """根据ID获取游戏会话"""
         return self.db.query(GameSessionModel).filter(GameSessionModel.id == session_id).first()
@@ -20,6 +29,15 @@ class GameSessionRepository:
         self.db.refresh(session)
         return session
 
+    @timed("repository_operation_seconds", "存储库操作耗时", operation="create_many")
+    def create_many(self, sessions_data: List[dict]) -> List[GameSessionModel]:
+        """批量创建游戏会话（一次提交）"""
+        sessions = [GameSessionModel(**session_data) for session_data in sessions_data]
+        self.db.add_all(sessions)
+        self.db.commit()
+        return sessions
+
+    @timed("repository_operation_seconds", "存储库操作耗时", operation="update")
     def update(self, session: GameSessionModel) -> GameSessionModel:
         """更新游戏会话"""
         self.db.commit()
@@ -36,3 +54,134 @@ class GameSessionRepository:
     def list_all(self):
         """获取所有游戏会话"""
         return self.db.query(GameSessionModel).all()
+
+    def list_by_status(self, statuses: List[str], limit: Optional[int] = 100) -> List[GameSessionModel]:
+        """获取指定状态的游戏会话（limit 为 None 时不限数量）"""
+        return (self.db.query(GameSessionModel)
+                .filter(GameSessionModel.session_status.in_(statuses))
+                .order_by(GameSessionModel.created_at)
+                .limit(limit)
+                .all())
+
+    def delete_many(self, sessions: List[GameSessionModel]):
+        """批量删除游戏会话"""
+        for session in sessions:
+            self.db.delete(session)
+        self.db.commit()
+
+
+class PlayerRepository:
+    """玩家存储库"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_ratings(self, user_ids: List[str]) -> Dict[str, int]:
+        """批量获取玩家积分（没有玩家记录的用户不在结果中）"""
+        rows = self.db.query(Player.user_id, Player.elo_rating).filter(Player.user_id.in_(user_ids)).all()
+        return {row.user_id: row.elo_rating for row in rows}
+
+
+class SessionLeaseRepository:
+    """
+    会话租约存储库
+
+    所有写操作都是带条件的单条 UPDATE/INSERT，由数据库保证同一时刻只有一个持有者。
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, session_id: str) -> Optional[SessionLease]:
+        """获取会话租约（从数据库重新读取）"""
+        return (self.db.query(SessionLease)
+                .populate_existing()
+                .filter(SessionLease.session_id == session_id)
+                .first())
+
+    @timed("repository_operation_seconds", "存储库操作耗时", operation="lease_acquire")
+    def acquire(self, session_id: str, owner_id: str, owner_address: str, ttl: float) -> SessionLease:
+        """
+        获取或续约会话租约
+
+        租约不存在、已过期或本来就属于 owner_id 时获得租约；否则保持原持有者不变。
+        返回当前的租约，调用方比较 owner_id 判断是否获得。
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl)
+        result = self.db.execute(
+            update(SessionLease)
+            .where(SessionLease.session_id == session_id,
+                   or_(SessionLease.owner_id == owner_id, SessionLease.expires_at < now))
+            .values(owner_id=owner_id, owner_address=owner_address, expires_at=expires_at, acquired_at=now),
+            execution_options=LEASE_EXECUTION_OPTIONS
+        )
+        if result.rowcount:
+            self.db.commit()
+        else:
+            try:
+                self.db.add(SessionLease(session_id=session_id, owner_id=owner_id, owner_address=owner_address,
+                                         expires_at=expires_at, acquired_at=now))
+                self.db.commit()
+            except IntegrityError:
+                # 其他进程持有未过期的租约
+                self.db.rollback()
+        return self.get(session_id)
+
+    @timed("repository_operation_seconds", "存储库操作耗时", operation="lease_renew")
+    def renew(self, owner_id: str, session_ids: Iterable[str], ttl: float) -> Set[str]:
+        """续约 owner_id 持有的指定租约，返回仍然持有的会话ID"""
+        session_ids = list(session_ids)
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+        held = set()
+        for start in range(0, len(session_ids), LEASE_BATCH_SIZE):
+            batch = session_ids[start:start + LEASE_BATCH_SIZE]
+            self.db.execute(
+                update(SessionLease)
+                .where(SessionLease.owner_id == owner_id, SessionLease.session_id.in_(batch))
+                .values(expires_at=expires_at),
+                execution_options=LEASE_EXECUTION_OPTIONS
+            )
+            rows = (self.db.query(SessionLease.session_id)
+                    .filter(SessionLease.owner_id == owner_id, SessionLease.session_id.in_(batch))
+                    .all())
+            held.update(row.session_id for row in rows)
+        self.db.commit()
+        return held
+
+    def handoff(self, session_id: str, owner_id: str, new_owner_id: str, new_owner_address: str,
+                ttl: float) -> bool:
+        """将 owner_id 持有的租约直接转交给新持有者，返回是否转交成功"""
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(SessionLease)
+            .where(SessionLease.session_id == session_id, SessionLease.owner_id == owner_id)
+            .values(owner_id=new_owner_id, owner_address=new_owner_address,
+                    expires_at=now + timedelta(seconds=ttl), acquired_at=now),
+            execution_options=LEASE_EXECUTION_OPTIONS
+        )
+        self.db.commit()
+        return result.rowcount > 0
+
+    def release(self, session_id: str, owner_id: str) -> bool:
+        """释放 owner_id 持有的会话租约"""
+        result = self.db.execute(
+            delete(SessionLease).where(SessionLease.session_id == session_id, SessionLease.owner_id == owner_id),
+            execution_options=LEASE_EXECUTION_OPTIONS
+        )
+        self.db.commit()
+        return result.rowcount > 0
+
+    def release_all(self, owner_id: str) -> int:
+        """释放 owner_id 持有的全部租约（进程退出时调用）"""
+        result = self.db.execute(delete(SessionLease).where(SessionLease.owner_id == owner_id),
+                                 execution_options=LEASE_EXECUTION_OPTIONS)
+        self.db.commit()
+        return result.rowcount
+
+    def delete_expired(self, before: datetime) -> int:
+        """删除在指定时间前过期的租约"""
+        result = self.db.execute(delete(SessionLease).where(SessionLease.expires_at < before),
+                                 execution_options=LEASE_EXECUTION_OPTIONS)
+        self.db.commit()
+        return result.rowcount
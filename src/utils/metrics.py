@@ -0,0 +1,225 @@
+"""
+性能指标模块
+提供计数器、直方图以及计时装饰器/上下文管理器，并输出 Prometheus 文本格式
+"""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from config.settings import SLOW_OPERATION_MS
+from .logging import LogManager
+
+# 默认直方图分桶（秒）
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+log_manager = LogManager()
+
+
+class Counter:
+    """计数器"""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """增加计数"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """获取计数"""
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        """输出 Prometheus 文本格式"""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """仪表（可任意设置的当前值）"""
+
+    def set(self, value: float, **labels) -> None:
+        """设置当前值"""
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+    def render(self) -> List[str]:
+        """输出 Prometheus 文本格式"""
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class HistogramSeries:
+    """一组标签对应的直方图数据"""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 最后一个为 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """记录一个观测值"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+
+class Histogram:
+    """直方图"""
+
+    def __init__(self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self._series: Dict[LabelKey, HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels) -> HistogramSeries:
+        """获取指定标签的直方图数据（可缓存后重复使用）"""
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, HistogramSeries(self.buckets))
+        return series
+
+    def observe(self, value: float, **labels) -> None:
+        """记录一个观测值"""
+        self.labels(**labels).observe(value)
+
+    def render(self) -> List[str]:
+        """输出 Prometheus 文本格式"""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series.sum}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """获取或创建计数器"""
+        return self._get_or_create(name, lambda: Counter(name, description))
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """获取或创建仪表"""
+        return self._get_or_create(name, lambda: Gauge(name, description))
+
+    def histogram(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """获取或创建直方图"""
+        return self._get_or_create(name, lambda: Histogram(name, description, buckets))
+
+    def render(self) -> str:
+        """输出所有指标的 Prometheus 文本格式"""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, name: str, factory: Callable):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory())
+        return metric
+
+
+# 进程内唯一的指标注册表
+metrics = MetricsRegistry()
+
+
+class timer:
+    """
+    计时上下文管理器，将耗时记录到直方图，超过 SLOW_OPERATION_MS 时写入性能日志
+
+    用法:
+        with timer("operation_seconds", operation="load"):
+            ...
+    """
+
+    __slots__ = ("name", "labels", "series", "start")
+
+    def __init__(self, name: str, **labels):
+        self.name = name
+        self.labels = labels
+        self.series = metrics.histogram(name).labels(**labels)
+
+    def __enter__(self) -> "timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _record(self.series, time.perf_counter() - self.start, self.name, self.labels)
+
+
+def timed(name: str, description: str = "", **labels):
+    """
+    计时装饰器，标签固定时直方图在装饰时创建，调用时只有计时开销
+
+    用法:
+        @timed("game_state_to_json_seconds", "GameState序列化耗时")
+        def to_json(self): ...
+    """
+    series = metrics.histogram(name, description).labels(**labels)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(series, time.perf_counter() - start, name, labels)
+        return wrapper
+    return decorator
+
+
+def _record(series: HistogramSeries, duration: float, name: str, labels: Dict[str, str]) -> None:
+    """记录耗时，慢操作写入性能日志"""
+    series.observe(duration)
+    duration_ms = duration * 1000
+    if duration_ms >= SLOW_OPERATION_MS:
+        log_manager.log_performance(name, duration_ms, **labels)
+
+
+def _format_labels(key: LabelKey) -> str:
+    """格式化标签"""
+    if not key:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in key)
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
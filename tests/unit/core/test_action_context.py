@@ -0,0 +1,107 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.actions.build import BuildAction
+from src.core.rules.engine import RuleEngine
+from src.core.rules.validator import ActionValidator, get_building_cost
+from src.core.models.enums import ActionType, GamePhase, PlayerColor
+from src.core.models.player import PlayerState, ResourceSet
+
+
+@pytest.fixture
+def game_state():
+    """创建处于玩家回合阶段的游戏状态"""
+    game_state = GameState(session_id="test_session")
+    game_state.current_phase = GamePhase.PLAYER_TURN
+    game_state.board_state.initialize_nodes()
+
+    player = PlayerState(
+        player_id="player_001",
+        user_id="user_123",
+        player_color=PlayerColor.RED,
+        display_name="测试玩家",
+        position=5,
+        resources=ResourceSet(money=10)
+    )
+    game_state.players = [player]
+    game_state.player_order = [0]
+    game_state.current_player_index = 0
+    return game_state
+
+
+class TestActionContext:
+    """测试行动上下文"""
+
+    def test_resolve_move_context(self, game_state):
+        """测试移动行动解析出玩家和目标节点"""
+        validator = ActionValidator(game_state)
+        context = validator.resolve_action(ActionType.MOVE, {
+            "player_id": "player_001",
+            "steps": 3,
+            "target_location": 8
+        })
+
+        assert context.is_valid
+        assert context.player is game_state.players[0]
+        assert context.target_node is game_state.board_state.nodes[8]
+
+    def test_resolve_build_context_cost(self, game_state):
+        """测试建造行动解析出建筑成本"""
+        validator = ActionValidator(game_state)
+        context = validator.resolve_action(ActionType.BUILD, {
+            "player_id": "player_001",
+            "location_id": 5,
+            "building_type": "telegraph"
+        })
+
+        assert context.is_valid
+        assert context.cost == get_building_cost("telegraph")
+
+    def test_resolve_build_insufficient_money(self, game_state):
+        """测试资源不足时上下文不合法"""
+        game_state.players[0].resources.money = 1
+        validator = ActionValidator(game_state)
+        context = validator.resolve_action(ActionType.BUILD, {
+            "player_id": "player_001",
+            "location_id": 5,
+            "building_type": "station"
+        })
+
+        assert not context.is_valid
+        assert "资源不足" in context.message
+
+    def test_action_executes_with_given_context(self, game_state):
+        """测试行动使用传入的上下文执行，不再重新查找玩家"""
+        action = BuildAction({
+            "player_id": "player_001",
+            "location_id": 5,
+            "building_type": "station"
+        })
+        game_state.board_state.available_locations = [5]
+        context = action.validate(game_state)
+        game_state.get_player_by_id = None  # 执行阶段不应再查找玩家
+
+        result = action.execute(game_state, context)
+
+        assert result["success"]
+        assert result["cost"] == 3
+        assert game_state.players[0].resources.money == 7
+
+    def test_engine_uses_resolved_context(self, game_state):
+        """测试规则引擎执行建造行动"""
+        engine = RuleEngine(game_state)
+        result = engine.execute_action(ActionType.BUILD, {
+            "player_id": "player_001",
+            "location_id": 5,
+            "building_type": "ranch"
+        })
+
+        assert result["success"]
+        assert result["cost"] == 2
+        assert game_state.players[0].resources.money == 8
@@ -0,0 +1,98 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.journal import MutationJournal
+from src.core.models.board import BoardState, BuildingType, MapNode, NodeAction
+
+
+@pytest.fixture
+def board():
+    """创建两个节点的版图"""
+    board = BoardState()
+    board.nodes = {1: MapNode(node_id=1), 2: MapNode(node_id=2)}
+    board.nodes[1].add_action("buy_cattle")
+    board.nodes[1].add_action(NodeAction.HIRE_WORKER)
+    board.nodes[2].add_action("buy_cattle")
+    return board
+
+
+class TestNodeActions:
+    """测试节点动作位标志"""
+
+    def test_add_and_remove_action(self, board):
+        """测试添加、重复添加和移除动作"""
+        node = board.nodes[1]
+        node.add_action("buy_cattle")
+        assert node.actions == ["buy_cattle", "hire_worker"]
+
+        node.remove_action("buy_cattle")
+        assert node.action_flags == NodeAction.HIRE_WORKER
+        assert not node.has_action("buy_cattle")
+
+    def test_unknown_action_rejected(self, board):
+        """测试未知动作名称报错"""
+        with pytest.raises(ValueError):
+            board.nodes[1].add_action("fly")
+
+    def test_nodes_with_action(self, board):
+        """测试按动作查询节点"""
+        assert board.nodes_with_action("buy_cattle") == [1, 2]
+        assert board.nodes_with_action(NodeAction.BUY_CATTLE | NodeAction.HIRE_WORKER) == [1]
+
+    def test_from_dict_accepts_flags_and_names(self):
+        """测试从位值和旧的动作名称列表恢复节点"""
+        flags = int(NodeAction.REST | NodeAction.TRADE)
+        assert MapNode.from_dict({"node_id": 1, "actions": flags}).actions == ["rest", "trade"]
+        assert MapNode.from_dict({"node_id": 1, "actions": ["rest", "trade"]}).action_flags == flags
+
+    def test_node_has_no_instance_dict(self, board):
+        """测试节点使用 __slots__ 存储"""
+        assert not hasattr(board.nodes[1], "__dict__")
+
+
+class TestBuildingIndexes:
+    """测试建筑物索引"""
+
+    def test_place_and_replace_building(self, board):
+        """测试放置和替换建筑时索引保持一致"""
+        board.place_building(1, BuildingType.STATION, owner_id="player_001")
+        board.place_building(2, BuildingType.STATION)
+        assert board.get_building_at_location(1).owner_id == "player_001"
+        assert [b.location_id for b in board.get_buildings_by_type(BuildingType.STATION)] == [1, 2]
+
+        board.place_building(1, BuildingType.CHURCH, owner_id="player_002")
+        assert board.get_player_buildings("player_001") == []
+        assert [b.location_id for b in board.get_player_buildings("player_002")] == [1]
+        assert [b.location_id for b in board.neutral_buildings] == [2]
+        assert board.type_locations == {BuildingType.STATION: {2}, BuildingType.CHURCH: {1}}
+        assert board.nodes[1].building_type == BuildingType.CHURCH
+
+    def test_rollback_restores_indexes(self, board):
+        """测试通过变更日志回滚放置"""
+        board.place_building(1, BuildingType.STATION)
+        journal = MutationJournal()
+
+        board.place_building(1, BuildingType.RANCH, owner_id="player_001", journal=journal)
+        journal.rollback()
+
+        assert board.get_building_at_location(1).building_type == BuildingType.STATION
+        assert board.player_buildings == {}
+        assert board.type_locations == {BuildingType.STATION: {1}}
+        assert board.nodes[1].building_type == BuildingType.STATION
+
+    def test_from_dict_rebuilds_indexes(self):
+        """测试从字典恢复时重建索引（兼容旧的玩家建筑列表）"""
+        board = BoardState.from_dict({
+            "nodes": {"3": {"node_id": 3}},
+            "buildings": {"3": {"building_type": "ranch", "location_id": 3, "is_neutral": True}},
+            "player_buildings": {"player_001": [{"location_id": 4, "building_type": "station", "built_by": "player_001"}]}
+        })
+
+        assert board.get_building_at_location(3).is_neutral
+        assert [b.location_id for b in board.get_player_buildings("player_001")] == [4]
+        assert board.type_locations == {BuildingType.RANCH: {3}, BuildingType.STATION: {4}}
@@ -0,0 +1,68 @@
+import pytest
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.journal import MutationJournal
+from src.core.models.card import Card
+from src.core.models.deck_manager import Deck
+from src.core.models.enums import CardType
+
+
+def new_deck(size=10, seed=None):
+    """创建抽牌时洗牌模式的牌堆"""
+    cards = [Card(card_id=f"card_{i}", card_type=CardType.CATTLE, name=f"牛{i}") for i in range(size)]
+    rng = random.Random(seed) if seed is not None else None
+    return Deck(card_type=CardType.CATTLE, cards=cards, shuffle_on_draw=True, rng=rng)
+
+
+class TestShuffleOnDraw:
+    """测试抽牌时洗牌模式"""
+
+    def test_draw_is_deterministic_with_seed(self):
+        """测试固定种子时抽牌结果可复现"""
+        draws_a = [card.card_id for card in new_deck(seed=42).draw(5)]
+        draws_b = [card.card_id for card in new_deck(seed=42).draw(5)]
+        assert draws_a == draws_b
+
+    def test_draw_without_replacement(self):
+        """测试抽完所有牌不重复"""
+        deck = new_deck()
+        drawn = [card.card_id for card in deck.draw(10)]
+        assert sorted(drawn) == sorted(f"card_{i}" for i in range(10))
+        assert deck.get_remaining_count() == 0
+
+    def test_first_card_is_uniform(self):
+        """测试每张牌成为第一张的概率相同"""
+        rng = random.Random(7)
+        counts = Counter()
+        for _ in range(4000):
+            deck = new_deck(size=4)
+            deck.rng = rng
+            counts[deck.draw(1)[0].card_id] += 1
+
+        assert all(800 < count < 1200 for count in counts.values())
+
+    def test_journal_rollback_restores_deck(self):
+        """测试抽牌可以通过变更日志回滚"""
+        deck = new_deck(seed=1)
+        before = list(deck.cards)
+        journal = MutationJournal()
+
+        deck.draw(3, journal)
+        journal.rollback()
+        assert deck.cards == before
+
+    def test_round_trip_keeps_mode(self):
+        """测试序列化往返保留抽牌模式"""
+        deck = new_deck(seed=1)
+        deck.draw(2)
+
+        restored = Deck.from_dict(deck.to_dict())
+        assert restored.shuffle_on_draw
+        assert restored.get_remaining_count() == 8
@@ -0,0 +1,167 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.journal import MutationJournal
+from src.core.actions.build import BuildAction
+from src.core.actions.hire_worker import HireWorkerAction
+from src.core.rules.engine import RuleEngine
+from src.core.models.enums import ActionType, CardType, GamePhase, PlayerColor, WorkerType
+from src.core.models.player import PlayerState, ResourceSet
+
+
+@pytest.fixture
+def game_state():
+    """创建两名玩家的游戏状态"""
+    game_state = GameState(session_id="test_session")
+    game_state.current_phase = GamePhase.PLAYER_TURN
+    game_state.players = [
+        PlayerState(
+            player_id=f"player_00{i}",
+            user_id=f"user_{i}",
+            player_color=color,
+            display_name=f"玩家{i}",
+            resources=ResourceSet(money=10)
+        )
+        for i, color in [(1, PlayerColor.RED), (2, PlayerColor.BLUE)]
+    ]
+    return game_state
+
+
+class TestMutationJournal:
+    """测试变更日志"""
+
+    def test_rollback_restores_in_reverse_order(self):
+        """测试回滚按倒序恢复所有修改"""
+        resources = ResourceSet(money=10)
+        items = [1, 2, 3]
+        mapping = {"a": 1}
+        journal = MutationJournal()
+
+        journal.add(resources, "money", -4)
+        journal.append(items, 4)
+        journal.remove(items, 2)
+        journal.set_item(mapping, "a", 2)
+        journal.set_item(mapping, "b", 3)
+        journal.rollback()
+
+        assert resources.money == 10
+        assert items == [1, 2, 3]
+        assert mapping == {"a": 1}
+        assert len(journal) == 0
+
+    def test_undo_steps(self):
+        """测试按步骤撤销"""
+        resources = ResourceSet(money=10)
+        journal = MutationJournal()
+
+        journal.begin()
+        journal.add(resources, "money", 1)
+        journal.begin()
+        journal.add(resources, "money", 2)
+
+        assert journal.undo()
+        assert resources.money == 11
+        assert journal.undo()
+        assert resources.money == 10
+        assert not journal.undo()
+
+    def test_deck_draw_rollback(self, game_state):
+        """测试抽牌可以回滚"""
+        deck = game_state.deck_manager.get_deck(CardType.CATTLE)
+        cards_before = list(deck.cards)
+
+        checkpoint = game_state.journal.checkpoint()
+        drawn = game_state.draw_cards(CardType.CATTLE, 3)
+        assert drawn == cards_before[:3]
+
+        game_state.journal.rollback(checkpoint)
+        assert deck.cards == cards_before
+
+
+class TestActionRollback:
+    """测试行动的回滚与撤销"""
+
+    def test_failed_action_rolls_back(self, game_state):
+        """测试执行中途失败时状态恢复"""
+        game_state.board_state.available_locations = [5]
+        action = BuildAction({"player_id": "player_001", "location_id": 5, "building_type": "station"})
+        context = action.validate(game_state)
+        # 让奖励阶段抛出异常，此时金钱和建筑记录已经被修改
+        action._apply_building_bonus = lambda *args: 1 / 0
+
+        with pytest.raises(ZeroDivisionError):
+            action.execute(game_state, context)
+
+        player = game_state.players[0]
+        assert player.resources.money == 10
+        assert player.buildings_built_count == 0
+        assert game_state.board_state.player_buildings == {}
+        assert game_state.board_state.available_locations == [5]
+
+    def test_engine_rolls_back_on_exception(self, game_state):
+        """测试规则引擎在执行异常时回滚"""
+        engine = RuleEngine(game_state)
+        engine._update_game_state = lambda *args: 1 / 0
+
+        result = engine.execute_action(ActionType.MOVE, {
+            "player_id": "player_001", "steps": 3, "target_location": 3
+        })
+
+        assert not result["success"]
+        assert game_state.players[0].position == 0
+        assert game_state.players[0].previous_position is None
+
+    def test_undo_within_turn(self, game_state):
+        """测试撤销当前回合内的行动"""
+        engine = RuleEngine(game_state)
+        engine._should_end_turn = lambda action_type: False
+
+        engine.execute_action(ActionType.MOVE, {"player_id": "player_001", "steps": 2, "target_location": 2})
+        engine.execute_action(ActionType.MOVE, {"player_id": "player_001", "steps": 2, "target_location": 4})
+
+        assert engine.undo_last_action()["success"]
+        assert game_state.players[0].position == 2
+        assert game_state.version == 2
+        assert len(game_state.action_history) == 1
+
+    def test_turn_end_clears_undo(self, game_state):
+        """测试回合结束后不能撤销"""
+        engine = RuleEngine(game_state)
+        engine.execute_action(ActionType.MOVE, {"player_id": "player_001", "steps": 2, "target_location": 2})
+
+        assert game_state.current_player_index == 1
+        assert not engine.undo_last_action()["success"]
+
+    def test_hire_takes_worker_from_market(self, game_state):
+        """测试雇佣从人才市场取走最便宜的工人，撤销时放回"""
+        market = game_state.labor_market
+        market.workers_matrix[0][1] = WorkerType.COWBOY
+        market.workers_matrix[1][2] = WorkerType.BUILDER
+        market.workers_matrix[3][0] = WorkerType.BUILDER
+
+        result = HireWorkerAction({"player_id": "player_001", "worker_type": "craftsman"}).execute(game_state)
+
+        assert result["success"], result["message"]
+        assert result["market_slot"] == [1, 2]
+        assert market.get_worker(1, 2) is None
+        assert market.find_worker(WorkerType.BUILDER) == (3, 0)
+        assert game_state.players[0].resources.builders == 1
+
+        assert game_state.journal.undo()
+        assert market.get_worker(1, 2) == WorkerType.BUILDER
+        assert game_state.players[0].resources.builders == 0
+        assert game_state.players[0].resources.money == 10
+
+    def test_hire_requires_worker_in_market(self, game_state):
+        """测试人才市场中没有该类型工人时不能雇佣"""
+        result = HireWorkerAction({"player_id": "player_001", "worker_type": "engineer"}).execute(game_state)
+
+        assert not result["success"]
+        assert result["message"] == "人才市场中没有可雇佣的engineer"
+        assert game_state.players[0].resources.money == 10
@@ -0,0 +1,70 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.actions.move import MoveAction
+from src.core.models.enums import GamePhase, PlayerColor
+from src.core.models.player import PlayerState, ResourceSet
+from src.utils.metrics import MetricsRegistry, metrics
+
+
+class TestMetricsRegistry:
+    """测试指标注册表"""
+
+    def test_histogram_render(self):
+        """测试直方图输出累计分桶"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("op_seconds", "操作耗时", buckets=(0.1, 1.0))
+        histogram.observe(0.05, operation="load")
+        histogram.observe(0.5, operation="load")
+        histogram.observe(2.0, operation="load")
+
+        text = registry.render()
+        assert "# TYPE op_seconds histogram" in text
+        assert 'op_seconds_bucket{operation="load",le="0.1"} 1' in text
+        assert 'op_seconds_bucket{operation="load",le="1.0"} 2' in text
+        assert 'op_seconds_bucket{operation="load",le="+Inf"} 3' in text
+        assert 'op_seconds_count{operation="load"} 3' in text
+
+    def test_counter_and_gauge(self):
+        """测试计数器和仪表"""
+        registry = MetricsRegistry()
+        registry.counter("requests_total").inc(result="ok")
+        registry.counter("requests_total").inc(result="ok")
+        registry.gauge("sessions").set(5)
+
+        text = registry.render()
+        assert 'requests_total{result="ok"} 2' in text
+        assert "# TYPE sessions gauge" in text
+        assert "sessions 5" in text
+
+
+class TestInstrumentation:
+    """测试热点路径的埋点"""
+
+    def test_action_and_serialization_recorded(self):
+        """测试行动执行和序列化被记录"""
+        game_state = GameState(session_id="test_session")
+        game_state.current_phase = GamePhase.PLAYER_TURN
+        game_state.board_state.initialize_nodes()
+        game_state.players = [PlayerState(
+            player_id="player_001",
+            user_id="user_123",
+            player_color=PlayerColor.RED,
+            display_name="测试玩家",
+            resources=ResourceSet(money=10)
+        )]
+        moves_before = metrics.counter("game_actions_total").value(action_type="move", result="success")
+        to_json_before = metrics.histogram("game_state_to_json_seconds").labels().count
+
+        MoveAction({"player_id": "player_001", "steps": 2, "target_location": 2}).execute(game_state)
+        game_state.to_json()
+
+        assert metrics.counter("game_actions_total").value(action_type="move", result="success") == moves_before + 1
+        assert metrics.histogram("game_state_to_json_seconds").labels().count == to_json_before + 1
+        assert 'game_action_execute_seconds_count{action_type="move"}' in metrics.render()
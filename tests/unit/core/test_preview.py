@@ -0,0 +1,130 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.rules.engine import RuleEngine
+from src.core.models.enums import ActionType, GamePhase, PlayerColor, WorkerType
+from src.core.models.player import PlayerState, ResourceSet
+
+
+@pytest.fixture
+def rule_engine():
+    """创建带地图的规则引擎"""
+    game_state = GameState(session_id="test_session")
+    game_state.current_phase = GamePhase.PLAYER_TURN
+    game_state.board_state.initialize_nodes()
+    game_state.board_state.connect_nodes(8, 9)
+    game_state.board_state.available_locations = [8]
+    game_state.cattle_market = [{"card_id": "cattle_1", "cost": 3}]
+    game_state.labor_market.workers_matrix[0][0] = WorkerType.BUILDER
+    player = PlayerState(
+        player_id="player_001",
+        user_id="user_123",
+        player_color=PlayerColor.RED,
+        display_name="测试玩家",
+        position=5,
+        resources=ResourceSet(money=10)
+    )
+    player.hand_cards.extend([
+        {"card_id": "cattle_2", "base_value": 4},
+        {"card_id": "cattle_3", "special_ability": "extra_build"},
+    ])
+    game_state.players = [player, PlayerState(
+        player_id="player_002",
+        user_id="user_456",
+        player_color=PlayerColor.BLUE,
+        display_name="玩家二",
+        resources=ResourceSet(money=10)
+    )]
+    return RuleEngine(game_state)
+
+
+def assert_unchanged(game_state, before_json):
+    """预览结束后状态与预览前完全一致"""
+    assert game_state.to_json() == before_json
+    assert len(game_state.journal) == 0 and not game_state.journal.can_undo()
+
+
+class TestPreviewAction:
+    """测试行动预览"""
+
+    def test_preview_move_does_not_mutate_state(self, rule_engine):
+        """测试预览移动不修改原状态"""
+        result = rule_engine.preview_action(ActionType.MOVE, {
+            "player_id": "player_001",
+            "steps": 3,
+            "target_location": 8
+        })
+
+        assert result["success"]
+        assert result["preview"]
+        assert result["changes"]["position"] == {"before": 5, "after": 8}
+        assert result["reachable_nodes"] == [9]
+
+        game_state = rule_engine.game_state
+        assert game_state.players[0].position == 5
+        assert game_state.version == 1
+        assert game_state.action_history == []
+
+    def test_preview_build_runs_action(self, rule_engine):
+        """测试预览建造执行正式的建造行动（含奖励），版图和可建造位置不变"""
+        before = rule_engine.game_state.to_json()
+        result = rule_engine.preview_action(ActionType.BUILD, {
+            "player_id": "player_001",
+            "location_id": 8,
+            "building_type": "telegraph"
+        })
+
+        assert result["success"]
+        assert result["cost"] == 4
+        assert result["money"] == 8  # 成本4，电报站奖励2
+        assert result["changes"]["money"] == {"before": 10, "after": 8}
+        assert result["changes"]["buildings_built_count"] == {"before": 0, "after": 1}
+        assert_unchanged(rule_engine.game_state, before)
+
+    def test_preview_build_checks_location(self, rule_engine):
+        """测试预览建造与正式执行一样检查位置是否可建造"""
+        result = rule_engine.preview_action(ActionType.BUILD, {
+            "player_id": "player_001",
+            "location_id": 9,
+            "building_type": "station"
+        })
+
+        assert not result["success"]
+        assert result["message"] == "该位置不可建造"
+
+    @pytest.mark.parametrize("action_type, action_data, expected", [
+        (ActionType.HIRE_WORKER, {"worker_type": "craftsman"},
+         {"money": {"before": 10, "after": 8}, "builders": {"before": 0, "after": 1}}),
+        (ActionType.BUY_CATTLE, {"card_id": "cattle_1"}, {"money": {"before": 10, "after": 7}}),
+        (ActionType.SELL_CATTLE, {"card_id": "cattle_2"},
+         {"money": {"before": 10, "after": 14}, "victory_points": {"before": 0, "after": 4},
+          "cattle_sold_count": {"before": 0, "after": 1}}),
+        (ActionType.USE_ABILITY, {"card_id": "cattle_3"}, {"money": {"before": 10, "after": 12}}),
+        (ActionType.PASS, {}, {}),
+    ])
+    def test_preview_every_action_type(self, rule_engine, action_type, action_data, expected):
+        """测试每种行动都能预览，且预览后状态不变"""
+        before = rule_engine.game_state.to_json()
+        result = rule_engine.preview_action(action_type, {"player_id": "player_001", **action_data})
+
+        assert result["success"], result["message"]
+        assert result["changes"] == expected
+        assert_unchanged(rule_engine.game_state, before)
+
+    def test_preview_keeps_undo_history(self, rule_engine):
+        """测试预览不影响已执行行动的撤销记录"""
+        game_state = rule_engine.game_state
+        checkpoint = game_state.journal.begin()
+        game_state.journal.add(game_state.players[0].resources, "money", -1)
+
+        rule_engine.preview_action(ActionType.PASS, {"player_id": "player_001"})
+
+        assert game_state.journal.can_undo()
+        game_state.journal.rollback(checkpoint)
+        assert game_state.players[0].resources.money == 10
@@ -0,0 +1,119 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.cards import DECK_CONFIGS
+from src.core.game_state import GameState
+from src.core.models.board import LocationType
+from src.core.models.card import Card
+from src.core.models.enums import CardType
+from src.core.setup_template import MAP_EDGES, get_setup_template
+
+
+@pytest.fixture
+def template():
+    """获取开局模板"""
+    return get_setup_template()
+
+
+class TestSetupTemplate:
+    """测试开局模板"""
+
+    def test_template_is_shared(self, template):
+        """测试模板在进程内只构建一次"""
+        assert get_setup_template() is template
+
+    def test_topology(self, template):
+        """测试地图连线和特殊地点"""
+        nodes = template.new_nodes()
+        for from_id, to_id in MAP_EDGES:
+            if from_id not in nodes or to_id not in nodes:
+                continue  # connect_nodes 跳过不存在的节点
+            assert to_id in nodes[from_id].next_nodes
+            assert from_id in nodes[to_id].previous_nodes
+
+        assert nodes[10].next_nodes == [11, 104, 243]
+        assert nodes[0].location_type == LocationType.START
+        assert nodes[29].location_type == LocationType.KANSAS_CITY
+
+    def test_new_decks_match_config(self, template):
+        """测试牌堆数量与配置一致，牌ID唯一"""
+        decks = template.new_decks()
+        for card_type_str, config in DECK_CONFIGS.items():
+            assert len(decks[CardType(card_type_str)].cards) == config["total_count"]
+
+        card_ids = [card.card_id for deck in decks.values() for card in deck.cards]
+        assert len(card_ids) == len(set(card_ids))
+
+    def test_games_do_not_share_objects(self):
+        """测试两局游戏不共享节点和牌对象"""
+        game_a = GameState(session_id="game_a")
+        game_b = GameState(session_id="game_b")
+        game_a.initialize_map()
+        game_b.initialize_map()
+
+        node_a, node_b = game_a.board_state.nodes[10], game_b.board_state.nodes[10]
+        assert node_a is not node_b
+        assert node_a.next_nodes is not node_b.next_nodes
+        node_a.next_nodes.append(999)
+        assert 999 not in node_b.next_nodes
+
+        card_a = game_a.deck_manager.get_deck(CardType.CATTLE).cards[0]
+        card_a.metadata["marked"] = True
+        ids_b = {card.card_id for card in game_b.deck_manager.get_deck(CardType.CATTLE).cards}
+        assert card_a.card_id not in ids_b
+        assert all("marked" not in card.metadata for card in game_b.deck_manager.get_deck(CardType.CATTLE).cards)
+
+
+class TestLazyDecks:
+    """测试按需创建的牌堆"""
+
+    def test_decks_created_on_first_use(self):
+        """测试牌堆在第一次使用时才创建，未创建的牌堆仍报告牌数"""
+        game_state = GameState(session_id="lazy")
+        assert dict.__len__(game_state.deck_manager.decks) == 0
+
+        game_state.draw_cards(CardType.CATTLE, 2)
+        status = game_state.get_deck_status()
+        assert status[CardType.CATTLE]["remaining"] == DECK_CONFIGS["cattle"]["total_count"] - 2
+        assert status[CardType.MISSION]["remaining"] == DECK_CONFIGS["mission"]["total_count"]
+        assert list(game_state.deck_manager.to_dict()["decks"]) == ["cattle"]
+
+    def test_round_trip_keeps_drawn_decks(self):
+        """测试序列化往返后已使用的牌堆保持原样，其余牌堆仍可按需创建"""
+        game_state = GameState(session_id="lazy")
+        game_state.draw_cards(CardType.CATTLE, 2)
+        remaining = [card.card_id for card in game_state.deck_manager.get_deck(CardType.CATTLE).cards]
+
+        restored = GameState.from_json(game_state.to_json())
+        assert [card.card_id for card in restored.deck_manager.get_deck(CardType.CATTLE).cards] == remaining
+        assert len(restored.draw_cards(CardType.MISSION, 3)) == 3
+
+
+class TestActionACardPlacement:
+    """测试动作A牌按事件牌类别放置"""
+
+    def test_cards_fill_branch_slots_in_order(self, template):
+        """测试按类别依次占用支路空位，支路已满或不是事件牌时丢弃"""
+        game_state = GameState(session_id="placement")
+        game_state.board_state.nodes = template.new_nodes()
+        cards = [Card(name="水灾", metadata={"category": "flood"}) for _ in range(5)]
+        cards += [Card(name="绿帐篷", metadata={"category": "tent"}), Card(name="其他")]
+        game_state.deck_manager.get_deck(CardType.ACTION_A).cards = cards
+
+        game_state.place_action_a_cards()
+
+        nodes = game_state.board_state.nodes
+        assert [nodes[i].event_type for i in (51, 52, 53, 54)] == ["水灾"] * 4
+        assert nodes[101].event_type == "帐篷" and nodes[101].has_action("rest")
+        assert nodes[102].event_type is None
+        assert game_state.board_state.nodes_with_action("pay_toll") == [51, 52, 53, 54]
+
+    def test_all_action_a_prototypes_have_category(self, template):
+        """测试所有动作A牌都配置了事件牌类别"""
+        categories = {prototype["metadata"]["category"] for prototype in template.deck_prototypes[CardType.ACTION_A]}
+        assert categories == {"flood", "drought", "rockfall", "tent"}
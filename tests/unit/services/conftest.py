@@ -0,0 +1,65 @@
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.models.enums import GamePhase, PlayerColor
+from src.core.models.player import PlayerState, ResourceSet
+from src.services import game_session
+from src.services.game_session import GameSessionService
+from src.services.session_cache import SessionCache
+from src.services.turn_timer import turn_scheduler
+
+
+class FakeRepository:
+    """内存中的会话存储库，记录读写次数"""
+
+    def __init__(self, session):
+        self.session = session
+        self.get_count = 0
+        self.update_count = 0
+
+    def get_by_id(self, session_id):
+        self.get_count += 1
+        return self.session if self.session.id == session_id else None
+
+    def update(self, session):
+        self.update_count += 1
+        return session
+
+
+@pytest.fixture
+def game_state():
+    """创建处于玩家回合阶段的游戏状态"""
+    game_state = GameState(session_id="test_session")
+    game_state.current_phase = GamePhase.PLAYER_TURN
+    game_state.board_state.initialize_nodes()
+    game_state.board_state.available_locations = [8]
+    game_state.players = [PlayerState(
+        player_id="player_001",
+        user_id="user_123",
+        player_color=PlayerColor.RED,
+        display_name="测试玩家",
+        position=5,
+        resources=ResourceSet(money=10)
+    )]
+    return game_state
+
+
+@pytest.fixture
+def service(game_state, monkeypatch):
+    """创建使用内存存储库的会话服务"""
+    session = SimpleNamespace(id="test_session", game_state="{}", game_state_fingerprint=0,
+                              game_config={"turn_time_limit": 30})
+    service = GameSessionService(db=None)
+    service.repository = FakeRepository(session)
+    service.session_cache = SessionCache()
+    # 直接返回内存中的状态，方便检查执行结果
+    monkeypatch.setattr(game_session.GameState, "from_json", classmethod(lambda cls, _: game_state))
+    yield service
+    turn_scheduler.disarm_turn("test_session")
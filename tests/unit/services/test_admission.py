@@ -0,0 +1,61 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.admission import AdmissionController, LoadLevel, Priority
+
+
+@pytest.fixture
+def pool():
+    """可调节的数据库连接池占用比例"""
+    return {"usage": 0.0}
+
+
+@pytest.fixture
+def controller(pool):
+    """使用模拟连接池占用的准入控制"""
+    return AdmissionController(lag_soft=0.05, lag_hard=0.25, pool_soft=0.7, pool_hard=0.9,
+                               session_queue=2, pool_usage=lambda: pool["usage"])
+
+
+class TestAdmissionController:
+    """测试准入控制"""
+
+    def test_shed_by_priority(self, controller, pool):
+        """测试负载升高时先拒绝可延后的请求，过载时只接受玩家行动"""
+        assert controller.admit(Priority.DEFERRABLE) is None
+
+        pool["usage"] = 0.75
+        assert controller.load_level() == LoadLevel.ELEVATED
+        assert controller.admit(Priority.DEFERRABLE).status_code == 503
+        assert controller.admit(Priority.NORMAL) is None
+
+        controller.record_lag(0.3)
+        assert controller.load_level() == LoadLevel.OVERLOADED
+        rejection = controller.admit(Priority.NORMAL)
+        assert (rejection.status_code, rejection.retry_after) == (503, 2)
+        assert controller.admit(Priority.CRITICAL) is None
+
+    def test_lag_decays(self, controller):
+        """测试事件循环延迟峰值立即生效，之后逐渐回落"""
+        controller.record_lag(0.3)
+        for _ in range(20):
+            controller.record_lag(0.0)
+        assert controller.load_level() == LoadLevel.NORMAL
+
+    def test_session_queue_limit(self, controller):
+        """测试单个会话处理中的请求超过上限时返回429，完成后恢复"""
+        assert controller.admit(Priority.CRITICAL, "s1") is None
+        assert controller.admit(Priority.CRITICAL, "s1") is None
+        assert controller.admit(Priority.CRITICAL, "s1").status_code == 429
+        assert controller.admit(Priority.CRITICAL, "s2") is None
+
+        controller.release("s1")
+        assert controller.admit(Priority.CRITICAL, "s1") is None
+        controller.release("s1")
+        controller.release("s1")
+        assert controller.queue_depth("s1") == 0
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.broker import InMemoryBroker, LOBBY_TOPIC, SqliteBroker, session_topic
+
+
+@pytest.fixture
+def sqlite_brokers(tmp_path):
+    """两个进程共用同一个事件表的SQLite消息代理"""
+    path = str(tmp_path / "broker.db")
+    brokers = (SqliteBroker(path, worker_id="worker_a"), SqliteBroker(path, worker_id="worker_b"))
+    for b in brokers:
+        b.connect()
+    yield brokers
+    for b in brokers:
+        b.close()
+
+
+class TestInMemoryBroker:
+    """测试进程内消息代理"""
+
+    def test_subscribers_receive_topic_events(self):
+        """测试订阅方只收到所订阅主题的事件"""
+        async def scenario():
+            broker = InMemoryBroker()
+            await broker.start()
+            lobby = broker.subscribe(LOBBY_TOPIC)
+            session = broker.subscribe(session_topic("s1"))
+
+            broker.publish(session_topic("s1"), "state_changed", {"session_id": "s1"})
+            await asyncio.to_thread(broker.publish, LOBBY_TOPIC, "session_created", {"session_id": "s2"})
+
+            event = await asyncio.wait_for(lobby.get(), 1)
+            assert (event.event_type, event.data) == ("session_created", {"session_id": "s2"})
+            assert (await session.get()).event_type == "state_changed"
+            assert lobby._queue.empty() and session._queue.empty()
+
+            lobby.close()
+            assert broker.subscriber_count() == 1
+
+        asyncio.run(scenario())
+
+    def test_slow_subscriber_drops_oldest(self):
+        """测试订阅队列已满时丢弃最旧的事件"""
+        broker = InMemoryBroker()
+        subscription = broker.subscribe(LOBBY_TOPIC)
+        subscription._queue = asyncio.Queue(maxsize=2)
+        for i in range(3):
+            broker.publish(LOBBY_TOPIC, "tick", {"i": i})
+
+        assert [subscription._queue.get_nowait().data["i"] for _ in range(2)] == [1, 2]
+
+
+class TestSqliteBroker:
+    """测试SQLite消息代理"""
+
+    def test_events_cross_processes(self, sqlite_brokers):
+        """测试其他进程发布的事件被轮询到并标记为远程事件，自己发布的事件不重复接收"""
+        broker_a, broker_b = sqlite_brokers
+        received = []
+        broker_b.add_handler(received.append)
+
+        broker_a.publish(session_topic("s1"), "state_changed", {"session_id": "s1"})
+        broker_b.publish(LOBBY_TOPIC, "session_created", {"session_id": "s2"})
+        assert [event.remote for event in received] == [False]
+
+        assert broker_b.poll_once() == 1
+        assert received[-1].remote
+        assert (received[-1].origin, received[-1].data) == ("worker_a", {"session_id": "s1"})
+        assert broker_b.poll_once() == 0
+        assert [event.event_type for event in broker_a.poll()] == ["session_created"]
@@ -0,0 +1,61 @@
+import pytest
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.models.enums import CardType
+from src.services.catalog import StaticCatalog
+
+
+@pytest.fixture
+def catalog():
+    """创建已编码的静态目录"""
+    catalog = StaticCatalog()
+    catalog.build()
+    return catalog
+
+
+class TestStaticCatalog:
+    """测试静态目录"""
+
+    def test_version_depends_on_content(self, catalog):
+        """测试内容不变时版本号不变，版本不匹配时取不到资源"""
+        other = StaticCatalog()
+        other.build()
+        assert other.version == catalog.version
+        assert catalog.get("board", catalog.version) == other.payloads["board"]
+        assert catalog.get("board", "stale") is None
+        assert catalog.get("unknown", catalog.version) is None
+
+    def test_card_id_resolves_to_prototype(self, catalog):
+        """测试通过牌ID序号在牌目录中找到牌原型"""
+        cards_catalog = json.loads(catalog.payloads["cards"])
+        prototypes = cards_catalog["decks"]["action_a"]["prototypes"]
+        digits = cards_catalog["card_id_serial_digits"]
+
+        for card in GameState(session_id="catalog").deck_manager.get_deck(CardType.ACTION_A).cards:
+            serial = int(card.card_id[-digits:], 16)
+            prototype = next(p for p in prototypes if p["serial_start"] <= serial < p["serial_start"] + p["count"])
+            assert prototype["name"] == card.name
+
+    def test_compact_game_state(self, catalog):
+        """测试精简游戏状态只保留与目录不同的节点字段，牌只保留ID"""
+        game_state = GameState(session_id="catalog")
+        game_state.initialize_map()
+        game_state.draw_cards(CardType.CATTLE, 1)
+        full = game_state.to_dict()
+
+        compact = catalog.compact_game_state(full)
+
+        changed_nodes = compact["board_state"]["nodes"]
+        assert 0 < len(changed_nodes) < len(full["board_state"]["nodes"])
+        assert all("x" not in node for node in changed_nodes.values())
+        cattle = compact["deck_manager"]["decks"]["cattle"]["cards"]
+        assert cattle == [card["card_id"] for card in full["deck_manager"]["decks"]["cattle"]["cards"]]
+        assert compact["catalog_version"] == catalog.version
+        assert isinstance(full["board_state"]["nodes"][0]["x"], (int, float))
@@ -0,0 +1,50 @@
+import pytest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models.enums import CardType
+from src.services.game_pool import GamePool
+
+
+@pytest.fixture
+def pool():
+    """创建目标数量为2的开局池"""
+    pool = GamePool(size=2)
+    pool.refill()
+    return pool
+
+
+class TestGamePool:
+    """测试开局池"""
+
+    def test_refill_to_size(self, pool):
+        """测试补充到目标数量"""
+        assert len(pool) == 2
+        assert pool.refill() == 0
+
+    def test_acquired_game_is_ready(self, pool):
+        """测试取出的游戏已布置好版图并分配会话ID"""
+        game_state = pool.acquire("session_001")
+
+        assert game_state.session_id == "session_001"
+        assert game_state.board_ready
+        assert game_state.labor_market.next_fill_index > 0
+        assert game_state.future_area.grid[0][0] is not None
+        assert len(pool) == 1
+
+    def test_acquired_games_are_independent(self, pool):
+        """测试取出的游戏各自洗牌，不共享牌对象"""
+        game_a = pool.acquire("a")
+        game_b = pool.acquire("b")
+
+        cards_a = game_a.deck_manager.get_deck(CardType.CATTLE).cards
+        cards_b = game_b.deck_manager.get_deck(CardType.CATTLE).cards
+        assert not {card.card_id for card in cards_a} & {card.card_id for card in cards_b}
+
+    def test_empty_pool_returns_none(self):
+        """测试池为空时返回 None，由调用方自行创建"""
+        assert GamePool(size=0).acquire("session_001") is None
@@ -0,0 +1,186 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models.board import BuildingType
+from src.core.models.enums import ActionType, PlayerColor
+from src.core.models.player import PlayerState
+from src.services import game_session
+
+
+class TestExecuteTurn:
+    """测试回合批量提交"""
+
+    def test_turn_persists_once(self, service, game_state):
+        """测试多个行动只加载和保存一次"""
+        result = service.execute_turn("test_session", [
+            (ActionType.MOVE, {"player_id": "player_001", "steps": 3, "target_location": 8}),
+            (ActionType.BUILD, {"player_id": "player_001", "location_id": 8, "building_type": "station"}),
+        ])
+
+        assert result["success"]
+        assert len(result["results"]) == 2
+        assert service.repository.get_count == 1
+        assert service.repository.update_count == 1
+        assert game_state.players[0].position == 8
+        assert game_state.players[0].resources.money == 7
+
+    def test_failed_step_rolls_back_batch(self, service):
+        """测试任一行动失败时整批不持久化"""
+        result = service.execute_turn("test_session", [
+            (ActionType.MOVE, {"player_id": "player_001", "steps": 3, "target_location": 8}),
+            (ActionType.BUILD, {"player_id": "player_001", "location_id": 8, "building_type": "telegraph"}),
+            (ActionType.BUILD, {"player_id": "player_001", "location_id": 9, "building_type": "station"}),
+        ])
+
+        assert not result["success"]
+        assert result["failed_index"] == 2
+        assert service.repository.update_count == 0
+        assert service.repository.session.game_state == "{}"
+
+
+class TestSaveFailure:
+    """测试保存失败时的缓存处理"""
+
+    def test_failed_save_discards_cached_state(self, service, monkeypatch):
+        """测试写入数据库失败时丢弃内存中已修改的状态"""
+        def fail(session):
+            raise RuntimeError("数据库不可用")
+
+        monkeypatch.setattr(service.repository, "update", fail)
+        with pytest.raises(RuntimeError):
+            service.execute_action("test_session", ActionType.MOVE,
+                                   {"player_id": "player_001", "steps": 3, "target_location": 8})
+
+        assert service.session_cache.resident_count == 0
+        assert not service.session_cache.locked("test_session")
+
+
+MOVE = {"player_id": "player_001", "steps": 3, "target_location": 8}
+
+
+class TestUndo:
+    """测试回合内撤销"""
+
+    def test_undo_survives_save(self, service, game_state):
+        """测试保存后仍可撤销本回合内的行动，版本号继续递增"""
+        assert service.execute_action("test_session", ActionType.MOVE, MOVE)["success"]
+        version = game_state.version
+
+        result = service.undo_last_action("test_session", "player_001")
+
+        assert result["success"]
+        assert not result["can_undo"]
+        assert game_state.players[0].position == 5
+        assert game_state.version == version + 1
+        assert service.repository.update_count == 2
+        assert not service.undo_last_action("test_session", "player_001")["success"]
+
+    def test_undo_bounded_to_current_turn(self, service, game_state):
+        """测试轮到下一个玩家后不能再撤销"""
+        game_state.players.append(PlayerState(
+            player_id="player_002",
+            user_id="user_456",
+            player_color=PlayerColor.BLUE,
+            display_name="测试玩家2",
+            position=5
+        ))
+        assert service.execute_action("test_session", ActionType.MOVE, MOVE)["success"]
+        assert service.execute_action("test_session", ActionType.PASS, {"player_id": "player_001"})["success"]
+
+        assert len(game_state.journal) == 0
+        assert not service.undo_last_action("test_session", "player_001")["success"]
+        assert not service.undo_last_action("test_session", "player_002")["success"]
+        assert game_state.players[0].position == 8
+
+    def test_only_current_player_can_undo(self, service, game_state):
+        """测试不是当前玩家时不能撤销"""
+        assert service.execute_action("test_session", ActionType.MOVE, MOVE)["success"]
+
+        result = service.undo_last_action("test_session", "player_002")
+
+        assert not result["success"]
+        assert game_state.players[0].position == 8
+
+
+class TestBuildingAction:
+    """测试建筑物动作"""
+
+    @pytest.fixture
+    def building_state(self, game_state, monkeypatch):
+        """在玩家所在位置放置车站，并让建筑物提供一个移动动作"""
+        game_state.board_state.place_building(5, BuildingType.STATION, owner_id="player_001")
+        game_state.players[0].resources.builders = 3
+        monkeypatch.setattr(game_state, "get_available_building_actions", lambda location_id, player_id: [
+            {"action_type": ActionType.MOVE, "params": dict(MOVE)},
+            {"action_type": ActionType.MOVE, "params": {"player_id": "player_001", "steps": 3, "target_location": 99}},
+        ])
+        return game_state
+
+    def test_worker_cost_undone_with_action(self, service, building_state):
+        """测试工人扣除记录在变更日志中，撤销时与行动一起恢复"""
+        result = service.execute_building_action("test_session", 5, 0, "player_001")
+
+        assert result["success"]
+        assert building_state.players[0].resources.builders == 0
+        assert building_state.players[0].position == 8
+
+        assert service.undo_last_action("test_session", "player_001")["success"]
+        assert building_state.players[0].resources.builders == 3
+        assert building_state.players[0].position == 5
+
+    def test_failed_action_keeps_workers(self, service, building_state):
+        """测试动作失败时不扣除工人，内存中的状态仍可继续使用"""
+        result = service.execute_building_action("test_session", 5, 1, "player_001")
+
+        assert not result["success"]
+        assert building_state.players[0].resources.builders == 3
+        assert service.repository.update_count == 0
+        assert service.session_cache.resident_count == 1
+
+    def test_unconfigured_building_rejected(self, service, building_state):
+        """测试没有配置的公有建筑（如教堂）不能使用，也不扣除工人"""
+        building_state.board_state.place_building(5, BuildingType.CHURCH)
+
+        result = service.execute_building_action("test_session", 5, 0, "player_001")
+
+        assert not result["success"]
+        assert result["message"] == "church不能使用"
+        assert building_state.players[0].resources.builders == 3
+        assert building_state.players[0].position == 5
+        assert not building_state.can_use_building(5, "player_001")
+        assert not building_state.use_building(5, "player_001")["success"]
+
+
+class TestPreview:
+    """测试行动预览"""
+
+    def test_preview_runs_on_scratch_without_session_lock(self, service, game_state, monkeypatch):
+        """测试预览在解码出的草稿副本上执行，不等待会话锁，也不修改正式状态"""
+        monkeypatch.setattr(game_session.GameState, "from_json", classmethod(lambda cls, _: game_state.clone()))
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with service.session_cache.lock("test_session"):
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        held.wait(5)
+        try:
+            result = service.preview_action("test_session", ActionType.MOVE, MOVE)
+        finally:
+            release.set()
+            thread.join()
+
+        assert result["success"]
+        assert result["changes"]["position"] == {"before": 5, "after": 8}
+        assert game_state.players[0].position == 5
+        assert service.session_cache.resident_count == 0
@@ -0,0 +1,79 @@
+import pytest
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.matchmaking import MatchQueue
+
+
+@pytest.fixture
+def clock():
+    """可调节的时钟"""
+    return {"now": 0.0}
+
+
+@pytest.fixture
+def queue(clock):
+    """使用模拟时钟的匹配队列"""
+    return MatchQueue(table_size=4, min_table_size=2, small_table_wait=30, bucket_width=50,
+                      base_window=100, window_growth=10, max_window=600, clock=lambda: clock["now"])
+
+
+def add_players(queue, ratings):
+    for index, rating in enumerate(ratings):
+        queue.add(f"u{index}", f"玩家{index}", rating)
+
+
+class TestMatchQueue:
+    """测试按积分分桶的匹配队列"""
+
+    def test_groups_nearest_ratings(self, queue):
+        """测试积分相近的玩家凑满一桌，积分差超出范围的玩家继续等待"""
+        add_players(queue, [1200, 1650, 1210, 1190, 1260, 1660])
+        tables = queue.match()
+
+        assert [[player.user_id for player in table] for table in tables] == [["u0", "u2", "u3", "u4"]]
+        assert len(queue) == 2 and "u1" in queue and "u0" not in queue
+
+    def test_window_widens_and_small_tables(self, queue, clock):
+        """测试等待时间增加后扩大积分差范围，等待足够久时开不满员的桌"""
+        add_players(queue, [1200, 1380])
+        assert queue.match() == []
+
+        clock["now"] = 10  # 范围扩大到 200，但还不能开两人桌
+        assert queue.match() == []
+
+        clock["now"] = 30
+        tables = queue.match()
+        assert [[player.rating for player in table] for table in tables] == [[1200, 1380]]
+        assert len(queue) == 0
+
+    def test_requeue_keeps_wait_time(self, queue, clock):
+        """测试创建对局失败后玩家放回队列并保留排队时间"""
+        add_players(queue, [1200, 1210, 1220, 1230])
+        clock["now"] = 5
+        table = queue.match()[0]
+        queue.requeue(table)
+
+        assert len(queue) == 4
+        assert queue.get("u0").enqueued_at == 0
+        assert queue.window(queue.get("u0"), 5) == 150
+
+    def test_thousands_of_players(self, queue):
+        """测试数千名排队玩家在一秒内完成一轮匹配"""
+        rng = random.Random(7)
+        add_players(queue, [int(rng.gauss(1200, 200)) for _ in range(5000)])
+
+        started = time.perf_counter()
+        tables = queue.match()
+        assert time.perf_counter() - started < 1.0
+
+        assert len(tables) > 1000
+        for table in tables:
+            ratings = [player.rating for player in table]
+            assert len(table) == 4 and max(ratings) - min(ratings) <= 100
@@ -0,0 +1,95 @@
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.models.enums import GamePhase, PlayerColor
+from src.core.models.player import PlayerState, ResourceSet
+from src.services.session_cache import SessionCache
+
+
+def make_game_state(session_id, phase=GamePhase.PLAYER_TURN):
+    """创建包含一名玩家的游戏状态"""
+    game_state = GameState(session_id=session_id)
+    game_state.current_phase = phase
+    game_state.players = [PlayerState(
+        player_id="player_001",
+        user_id="user_123",
+        player_color=PlayerColor.RED,
+        display_name="测试玩家",
+        resources=ResourceSet(money=10)
+    )]
+    return game_state
+
+
+class TestSessionCache:
+    """测试会话缓存的休眠与恢复"""
+
+    def test_idle_session_hibernates_and_rehydrates(self):
+        """测试空闲会话休眠后访问时恢复"""
+        cache = SessionCache(idle_seconds=60)
+        game_state = make_game_state("s1")
+        game_state.players[0].position = 7
+        cache.put("s1", game_state, fingerprint=1, size=1000)
+
+        assert cache.sweep(now=time.monotonic() + 61) == ["s1"]
+        assert cache.resident_count == 0
+        assert cache.resident_bytes == 0
+        assert cache.stats()["hibernated_sessions"] == 1
+
+        restored = cache.get("s1", fingerprint=1)
+        assert restored is not game_state
+        assert restored.players[0].position == 7
+        assert cache.resident_count == 1
+        assert cache.resident_bytes == 1000
+
+    def test_stale_fingerprint_is_ignored(self):
+        """测试数据库状态已变化时不使用缓存"""
+        cache = SessionCache()
+        cache.put("s1", make_game_state("s1"), fingerprint=1, size=100)
+
+        assert cache.get("s1", fingerprint=2) is None
+        assert cache.resident_count == 0
+
+    def test_budget_prefers_idle_lobbies(self):
+        """测试超出内存预算时优先休眠未进行中的会话"""
+        cache = SessionCache(memory_budget=2500)
+        cache.put("playing", make_game_state("playing"), fingerprint=1, size=1000)
+        cache.put("lobby", make_game_state("lobby", GamePhase.SETUP), fingerprint=1, size=1000)
+        cache.put("new", make_game_state("new"), fingerprint=1, size=1000)
+
+        assert cache.resident_count == 2
+        assert cache.resident_bytes == 2000
+        assert cache.get("playing", fingerprint=1) is not None
+        assert cache.stats()["hibernated_sessions"] == 1
+        assert cache.get("lobby", fingerprint=1) is not None
+
+    def test_session_lock_serializes_requests(self):
+        """测试会话锁使同一会话的读-改-写串行进行，处理中的会话不会被休眠"""
+        cache = SessionCache(idle_seconds=0)
+        game_state = make_game_state("s1")
+        cache.put("s1", game_state, fingerprint=1, size=100)
+
+        def request():
+            with cache.lock("s1"):
+                money = game_state.players[0].resources.money
+                time.sleep(0.001)
+                game_state.players[0].resources.money = money + 1
+
+        threads = [threading.Thread(target=request) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert game_state.players[0].resources.money == 30
+
+        with cache.lock("s1"):
+            assert cache.sweep(now=time.monotonic() + 1) == []
+        assert not cache.locked("s1")
+        assert cache.sweep(now=time.monotonic() + 1) == ["s1"]
@@ -0,0 +1,109 @@
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.session_lease import LeaseManager
+from src.storage.database import Base
+from src.storage.models import SessionLease
+
+
+@pytest.fixture
+def make_db(tmp_path):
+    """两个进程共用的SQLite数据库，每次调用返回一个新的数据库会话"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'lease.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    sessions = []
+
+    def make():
+        sessions.append(factory())
+        return sessions[-1]
+
+    yield make
+    for db in sessions:
+        db.close()
+
+
+@pytest.fixture
+def workers():
+    """两个使用数据库租约的服务进程"""
+    return (LeaseManager(mode="db", ttl=30, worker_id="worker_a", address="http://a:8001"),
+            LeaseManager(mode="db", ttl=30, worker_id="worker_b", address="http://b:8002"))
+
+
+class TestLeaseManager:
+    """测试会话租约"""
+
+    def test_local_mode_owns_everything(self):
+        """测试本地模式不访问数据库，本进程拥有全部会话"""
+        manager = LeaseManager(mode="local")
+        assert manager.check_owner(None, "session_001") is None
+        assert manager.owns("session_001")
+
+    def test_single_writer(self, make_db, workers):
+        """测试会话只由第一个获取租约的进程持有，其他进程得到持有者地址"""
+        worker_a, worker_b = workers
+        assert worker_a.check_owner(make_db(), "session_001") is None
+
+        owner = worker_b.check_owner(make_db(), "session_001")
+        assert owner.owner_id == "worker_a"
+        assert owner.address == "http://a:8001"
+        assert not worker_b.owns("session_001")
+
+    def test_expired_lease_taken_over(self, make_db, workers):
+        """测试租约过期后由其他进程接管，原持有者续约时发现失去租约"""
+        worker_a, worker_b = workers
+        db = make_db()
+        worker_a.check_owner(db, "session_001")
+        db.get(SessionLease, "session_001").expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+        assert worker_b.check_owner(make_db(), "session_001") is None
+        assert worker_a.renew_once(make_db()) == {"success": True, "renewed": 0, "lost": 1}
+        assert not worker_a.owns("session_001")
+
+    def test_handoff(self, make_db, workers):
+        """测试持有者将租约直接转交给其他进程"""
+        worker_a, worker_b = workers
+        worker_a.check_owner(make_db(), "session_001")
+
+        assert worker_a.handoff(make_db(), "session_001", "worker_b", "http://b:8002")
+        assert worker_b.check_owner(make_db(), "session_001") is None
+        assert worker_a.check_owner(make_db(), "session_001").owner_id == "worker_b"
+
+    def test_acquired_lease_rearms_turn_timer(self, make_db, workers, monkeypatch):
+        """测试获得租约时恢复回合计时，已持有的租约不再重复恢复"""
+        from src.services.game_session import GameSessionService
+
+        rearmed = []
+        monkeypatch.setattr(GameSessionService, "rearm_turn_timer",
+                            lambda self, session_id: rearmed.append(session_id))
+        worker_a, worker_b = workers
+
+        worker_a.check_owner(make_db(), "session_001")
+        worker_a.check_owner(make_db(), "session_001")
+        worker_b.check_owner(make_db(), "session_001")
+
+        assert rearmed == ["session_001"]
+
+    def test_session_with_turn_timer_kept(self, make_db):
+        """测试设置了回合计时的会话没有请求时也继续续约，没有计时的空闲会话被放弃"""
+        from src.services.turn_timer import turn_scheduler
+
+        worker = LeaseManager(mode="db", ttl=30, worker_id="worker_a", idle_seconds=0)
+        worker.check_owner(make_db(), "session_001")
+        worker.check_owner(make_db(), "session_002")
+        turn_scheduler.arm_turn("session_001", "turn", 60)
+        try:
+            assert worker.renew_once(make_db()) == {"success": True, "renewed": 1, "lost": 0}
+            assert worker.owns("session_001")
+            assert not worker.owns("session_002")
+        finally:
+            turn_scheduler.disarm_turn("session_001")
@@ -0,0 +1,176 @@
+import asyncio
+import pytest
+import sys
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models.enums import PlayerColor
+from src.core.models.player import PlayerState, ResourceSet
+from src.services.turn_timer import TimerWheel, TurnScheduler, turn_scheduler
+
+
+@pytest.fixture
+def game_state(game_state):
+    """在公共的游戏状态上增加第二名玩家并设置回合开始时间"""
+    game_state.turn_start_time = datetime(2024, 1, 1, 12, 0, 0)
+    game_state.players.append(PlayerState(
+        player_id="player_002",
+        user_id="user_2",
+        player_color=PlayerColor.BLUE,
+        display_name="玩家2",
+        resources=ResourceSet(money=10)
+    ))
+    return game_state
+
+
+class TestTimerWheel:
+    """测试时间轮"""
+
+    def test_expires_after_delay(self):
+        """测试定时器在到期刻度触发"""
+        wheel = TimerWheel(tick_seconds=1.0, slots=8)
+        wheel.arm("a", 3, "turn_a")
+
+        assert wheel.tick() == []
+        assert wheel.tick() == []
+        assert wheel.tick() == [("a", "turn_a")]
+        assert len(wheel) == 0
+
+    def test_delay_longer_than_one_round(self):
+        """测试超过一圈的定时器"""
+        wheel = TimerWheel(tick_seconds=1.0, slots=4)
+        wheel.arm("a", 10)
+
+        fired = [tick for tick in range(1, 13) if wheel.tick()]
+        assert fired == [10]
+
+    def test_disarm_and_rearm(self):
+        """测试取消和重新设置定时器"""
+        wheel = TimerWheel(tick_seconds=1.0, slots=8)
+        wheel.arm("a", 1)
+        wheel.arm("b", 1)
+        assert wheel.disarm("a")
+        assert not wheel.disarm("a")
+
+        wheel.arm("b", 2, "new_turn")
+        assert wheel.tick() == []
+        assert wheel.tick() == [("b", "new_turn")]
+
+    def test_concurrent_arm_and_tick(self):
+        """测试请求线程设置和取消定时器与时间轮前进同时进行时不丢失定时器"""
+        wheel = TimerWheel(tick_seconds=1.0, slots=8)
+
+        def worker(prefix):
+            for index in range(500):
+                wheel.arm(f"{prefix}_{index}", 10 ** 6)
+                wheel.disarm(f"{prefix}_{index - 1}")
+
+        threads = [threading.Thread(target=worker, args=(prefix,)) for prefix in "abcd"]
+        for thread in threads:
+            thread.start()
+        expired = []
+        while any(thread.is_alive() for thread in threads):
+            expired.extend(wheel.tick())
+        for thread in threads:
+            thread.join()
+
+        assert expired == []
+        assert sorted(wheel._slot_of) == sorted(f"{prefix}_499" for prefix in "abcd")
+        assert sum(len(slot) for slot in wheel._wheel) == 4
+
+
+class TestAutoPass:
+    """测试回合超时自动跳过"""
+
+    def test_auto_pass_advances_turn(self, service, game_state):
+        """测试超时后轮到下一个玩家并重新计时"""
+        turn_key = game_state.turn_start_time.isoformat()
+
+        result = service.auto_pass("test_session", turn_key)
+
+        assert result["success"]
+        assert result["auto"]
+        assert game_state.current_player_index == 1
+        assert game_state.turn_start_time.isoformat() != turn_key
+        assert "test_session" in turn_scheduler.wheel
+
+    def test_stale_turn_is_ignored(self, service, game_state):
+        """测试玩家已完成回合时不再自动跳过"""
+        result = service.auto_pass("test_session", "2000-01-01T00:00:00")
+
+        assert not result["success"]
+        assert game_state.current_player_index == 0
+
+    def test_pass_by_other_player_rejected(self, service, game_state):
+        """测试非当前玩家不能跳过回合"""
+        from src.core.models.enums import ActionType
+
+        result = service.execute_action("test_session", ActionType.PASS, {"player_id": "player_002"})
+
+        assert not result["success"]
+        assert game_state.current_player_index == 0
+
+
+class TestRearm:
+    """测试重启或获得租约后恢复回合计时"""
+
+    @staticmethod
+    def remaining_ticks(session_id):
+        """定时器距离触发的刻度数（不超过一圈）"""
+        wheel = turn_scheduler.wheel
+        return (wheel._slot_of[session_id] - wheel._cursor) % wheel.slots
+
+    def test_rearm_counts_from_turn_start(self, service, game_state):
+        """测试按保存的回合开始时间计算剩余时间"""
+        service.repository.session.session_status = "playing"
+        game_state.turn_start_time = datetime.now() - timedelta(seconds=20)
+
+        assert service.rearm_turn_timer("test_session")
+        assert self.remaining_ticks("test_session") in (10, 11)
+
+    def test_overdue_turn_fires_next_tick(self, service, game_state):
+        """测试重启期间已经超时的回合在下一个刻度触发"""
+        service.repository.session.session_status = "playing"
+        game_state.turn_start_time = datetime.now() - timedelta(hours=1)
+
+        assert service.rearm_turn_timer("test_session")
+        assert self.remaining_ticks("test_session") == 1
+
+    def test_waiting_session_not_armed(self, service):
+        """测试未开始的会话不设置计时"""
+        service.repository.session.session_status = "waiting"
+
+        assert not service.rearm_turn_timer("test_session")
+        assert "test_session" not in turn_scheduler.wheel
+
+
+class TestDispatch:
+    """测试到期回调的执行"""
+
+    def test_expired_sessions_run_concurrently(self):
+        """测试同一刻度到期的会话分别执行，一个会话阻塞不推迟其他会话"""
+        barrier = threading.Barrier(2, timeout=2)
+        passed = []
+
+        def on_expire(session_id, turn_key):
+            barrier.wait()
+            passed.append(session_id)
+
+        async def scenario():
+            scheduler = TurnScheduler(on_expire=on_expire, tick_seconds=0.01, slots=8)
+            scheduler.wheel.arm("a", 0.01)
+            scheduler.wheel.arm("b", 0.01)
+            await scheduler.start()
+            for _ in range(100):
+                if len(passed) == 2:
+                    break
+                await asyncio.sleep(0.02)
+            await scheduler.stop()
+
+        asyncio.run(scenario())
+        assert sorted(passed) == ["a", "b"]
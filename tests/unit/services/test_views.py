@@ -0,0 +1,113 @@
+import json
+import pytest
+import sys
+from types import SimpleNamespace
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.core.models.enums import CardType, PlayerColor
+from src.core.models.player import PlayerState
+from src.services.views import ViewHub, build_session_views, seat_token, verify_seat_token
+
+
+@pytest.fixture
+def game_state():
+    """两名各持有手牌的玩家的游戏状态"""
+    game_state = GameState(session_id="views")
+    for index, color in enumerate((PlayerColor.RED, PlayerColor.BLUE)):
+        player = PlayerState(player_id=f"p{index}", user_id=f"u{index}", player_color=color,
+                             display_name=f"玩家{index}")
+        player.card_manager.draw_pile = [{"card_id": f"draw_{index}_{i}"} for i in range(2)]
+        player.card_manager.hand_cards = [{"card_id": f"hand_{index}"}]
+        game_state.players.append(player)
+    game_state.draw_cards(CardType.CATTLE, 1)
+    return game_state
+
+
+class TestSessionViews:
+    """测试一次生成的玩家视图和观战视图"""
+
+    def test_spectator_view_redacted(self, game_state):
+        """测试观战视图隐藏手牌、抽牌堆、公共牌堆顺序和玩家账号"""
+        view = json.loads(build_session_views("views", game_state.to_dict()).spectator.text)
+        players = view["game_state"]["players"]
+
+        assert view["viewer"] is None
+        assert [player["card_manager"]["hand_count"] for player in players] == [1, 1]
+        assert "user_id" not in players[0] and "player_id" not in players[0]
+        assert [player["seat"] for player in players] == [0, 1]
+        text = json.dumps(view)
+        assert "hand_0" not in text and "draw_0_0" not in text
+
+        cattle = view["game_state"]["deck_manager"]["decks"]["cattle"]
+        assert cattle["remaining"] == len(game_state.deck_manager.get_deck(CardType.CATTLE).cards)
+        assert "cards" not in cattle
+
+    def test_player_sees_only_own_hand(self, game_state):
+        """测试玩家视图只包含本人的手牌和账号，抽牌堆顺序对本人同样隐藏"""
+        views = build_session_views("views", game_state.to_dict())
+        view = json.loads(views.for_viewer("p1").text)
+        own, other = view["game_state"]["players"][1], view["game_state"]["players"][0]
+
+        assert view["viewer"] == "p1"
+        assert own["user_id"] == "u1" and own["player_id"] == "p1"
+        assert own["card_manager"]["hand_cards"] == [{"card_id": "hand_1"}]
+        assert "hand_cards" not in other["card_manager"] and "user_id" not in other and "player_id" not in other
+        assert "draw_1_0" not in views.for_viewer("p1").text
+        assert views.for_viewer("stranger") is None
+
+        # 公共部分与观战视图一致
+        spectator = json.loads(views.spectator.text)
+        assert view["game_state"]["board_state"] == spectator["game_state"]["board_state"]
+        assert other == spectator["game_state"]["players"][0]
+
+    def test_seat_token_bound_to_session_and_player(self):
+        """测试座位令牌只对签发的会话和玩家有效"""
+        token = seat_token("views", "p1")
+        assert verify_seat_token("views", "p1", token)
+        assert not verify_seat_token("views", "p0", token)
+        assert not verify_seat_token("other", "p1", token)
+        assert not verify_seat_token("views", "p1", None)
+
+
+class TestViewHub:
+    """测试会话视图缓存"""
+
+    def test_views_shared_per_version(self, game_state):
+        """测试同一版本的视图被共享，只刷新有人查看的会话"""
+        hub = ViewHub()
+        assert hub.update(None, game_state) is None  # 无人查看
+
+        hub._store(build_session_views("views", game_state.to_dict()))
+        first = hub.peek("views")
+        assert hub.peek("views") is first
+
+        game_state.increment_version()
+        hub.mark_version("views", game_state.version)
+        assert hub.peek("views") is None
+
+    def test_update_uses_saved_dict(self, game_state, monkeypatch):
+        """测试刷新视图时使用保存时已经生成的字典，不再重复序列化"""
+        hub = ViewHub()
+        state_dict = game_state.to_dict()
+        hub._store(build_session_views("views", state_dict))
+        game_state.increment_version()
+        monkeypatch.setattr(game_state, "to_dict", lambda: pytest.fail("重复序列化"))
+
+        session = SimpleNamespace(id="views", session_name="测试", max_players=4, current_players=1,
+                                  created_by="user_123", host_player_id="player_001",
+                                  created_at=None, started_at=None)
+        views = hub.update(session, game_state, {**state_dict, "version": game_state.version})
+
+        assert views is hub.peek("views")
+
+    def test_evicts_least_recently_viewed(self, game_state):
+        """测试超过上限时移除最久未查看的会话"""
+        hub = ViewHub(limit=1)
+        hub._store(build_session_views("views", game_state.to_dict()))
+        hub._store(build_session_views("other", game_state.to_dict()))
+        assert not hub.watched("views") and hub.watched("other")
@@ -0,0 +1,102 @@
+import pytest
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.archive_job import archive_finished_sessions
+from src.storage.archive import SessionArchive
+from src.storage.database import Base
+from src.storage.models import GameSession as GameSessionModel
+
+
+@pytest.fixture
+def db():
+    """内存中的SQLite数据库"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield db
+    db.close()
+
+
+class TestSessionArchive:
+    """测试会话归档文件"""
+
+    def test_random_access_across_segments(self, tmp_path):
+        """测试跨分段按会话ID读取和顺序扫描"""
+        archive = SessionArchive(str(tmp_path), segment_size=200)
+        for i in range(5):
+            archive.append(f"s{i}", {"session_status": "finished", "game_state_codec": "json"},
+                           f'{{"session_id": "s{i}", "padding": "{"x" * 100}"}}'.encode("utf-8"))
+
+        assert len(list(tmp_path.glob("segment_*.dat"))) > 1
+        assert archive.get("s3")["game_state"].startswith('{"session_id": "s3"')
+        assert [record["game_state"][16:18] for record in archive.scan()] == ["s0", "s1", "s2", "s3", "s4"]
+        assert not archive.append("s3", {}, b"")
+        archive.close()
+
+        # 重新打开后从索引恢复
+        reopened = SessionArchive(str(tmp_path), segment_size=200)
+        assert len(reopened) == 5
+        assert reopened.get("s0")["session_status"] == "finished"
+        assert reopened.get("missing") is None
+        reopened.close()
+
+    def test_torn_index_entry_ignored(self, tmp_path):
+        """测试写入中断时不完整的索引项被忽略"""
+        archive = SessionArchive(str(tmp_path))
+        archive.append("s1", {}, b"{}")
+        archive.close()
+
+        with open(tmp_path / "segment_000001.idx", "ab") as f:
+            f.write(b"partial")
+
+        assert len(SessionArchive(str(tmp_path))) == 1
+
+
+    def test_writers_share_directory(self, tmp_path):
+        """测试两个进程的归档实例共享目录：写入前读取对方追加的记录，不重复归档、不写错偏移"""
+        first = SessionArchive(str(tmp_path), segment_size=200)
+        second = SessionArchive(str(tmp_path), segment_size=200)
+        padding = "x" * 100
+
+        for i in range(3):
+            assert first.append(f"a{i}", {"game_state_codec": "json"}, f'{{"a": "{padding}"}}'.encode("utf-8"))
+            assert second.append(f"b{i}", {"game_state_codec": "json"}, f'{{"b": "{padding}"}}'.encode("utf-8"))
+        assert not second.append("a1", {}, b"")
+
+        assert second.get("a2")["game_state"].startswith('{"a"')
+        assert first.get("b2")["game_state"].startswith('{"b"')
+        first.close()
+        second.close()
+
+        reopened = SessionArchive(str(tmp_path), segment_size=200)
+        assert len(reopened) == 6
+        assert len(list(reopened.scan())) == 6
+        reopened.close()
+
+class TestArchiveJob:
+    """测试归档任务"""
+
+    def test_moves_finished_sessions(self, db, tmp_path):
+        """测试已结束的会话移入归档，进行中的会话保留"""
+        db.add_all([
+            GameSessionModel(id="done", session_status="finished", game_state='{"session_id": "done"}'),
+            GameSessionModel(id="quit", session_status="aborted", game_state='{"session_id": "quit"}'),
+            GameSessionModel(id="live", session_status="playing", game_state='{"session_id": "live"}'),
+        ])
+        db.commit()
+        archive = SessionArchive(str(tmp_path))
+
+        result = archive_finished_sessions(db, archive, batch_size=1)
+
+        assert result["archived"] == 2
+        assert [session.id for session in db.query(GameSessionModel).all()] == ["live"]
+        assert archive.get("done")["game_state"] == '{"session_id": "done"}'
+        assert archive.get("quit")["session_status"] == "aborted"
+        archive.close()
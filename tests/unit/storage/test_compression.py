@@ -0,0 +1,104 @@
+import pytest
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.game_state import GameState
+from src.storage.compression import GameStateCodec
+from src.storage.database import Base, _upgrade_schema
+from src.storage.models import GameSession as GameSessionModel
+
+
+@pytest.fixture
+def game_state_json():
+    """初始化地图后的游戏状态JSON"""
+    game_state = GameState(session_id="test_session")
+    game_state.initialize_map()
+    return game_state.to_json()
+
+
+@pytest.fixture
+def db():
+    """内存中的SQLite数据库"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield db
+    db.close()
+
+
+class TestGameStateCodec:
+    """测试游戏状态编解码"""
+
+    def test_zlib_round_trip(self, game_state_json):
+        """测试zlib压缩后可以还原，且体积明显减小"""
+        codec = GameStateCodec(codec="zlib")
+        data, codec_id = codec.encode(game_state_json)
+
+        assert codec_id == "zlib"
+        assert len(data) * 4 < len(game_state_json.encode("utf-8"))
+        assert codec.decode(data, codec_id) == game_state_json
+
+    def test_unknown_codec_rejected(self):
+        """测试未知编码器"""
+        with pytest.raises(ValueError):
+            GameStateCodec(codec="zlib").decode(b"{}", "lz4")
+
+
+class TestStoredGameState:
+    """测试数据库中的游戏状态存储"""
+
+    def test_compressed_row_round_trip(self, db, game_state_json):
+        """测试写入时压缩、读取时解压"""
+        db.add(GameSessionModel(id="s1", game_state=game_state_json))
+        db.commit()
+        db.expunge_all()
+
+        stored = db.execute(text("SELECT game_state, game_state_codec FROM game_sessions")).one()
+        assert stored.game_state_codec == "zlib"
+        assert len(stored.game_state) < len(game_state_json)
+
+        session = db.query(GameSessionModel).filter(GameSessionModel.id == "s1").first()
+        assert session.game_state == game_state_json
+
+    def test_legacy_plain_json_row(self, db):
+        """测试读取以文本存储的旧数据"""
+        db.execute(text("INSERT INTO game_sessions (id, game_state) VALUES ('old', '{\"session_id\": \"old\"}')"))
+        db.commit()
+
+        session = db.query(GameSessionModel).filter(GameSessionModel.id == "old").first()
+        assert session.game_state_codec is None
+        assert session.game_state == '{"session_id": "old"}'
+
+
+class TestSchemaUpgrade:
+    """测试旧表结构升级"""
+
+    def test_legacy_sqlite_table(self, game_state_json):
+        """测试升级以文本列存储游戏状态、没有编码器列的旧表"""
+        engine = create_engine("sqlite://")
+        ddl = str(CreateTable(GameSessionModel.__table__).compile(engine))
+        ddl = ddl.replace("game_state BLOB", "game_state TEXT").replace("\tgame_state_codec VARCHAR(32), \n", "")
+        with engine.begin() as conn:
+            conn.execute(text(ddl))
+            conn.execute(text("INSERT INTO game_sessions (id, game_state) VALUES ('old', '{\"session_id\": \"old\"}')"))
+
+        _upgrade_schema(engine)
+
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        db.add(GameSessionModel(id="new", game_state=game_state_json))
+        db.commit()
+        db.expunge_all()
+
+        stored = db.execute(text("SELECT typeof(game_state) FROM game_sessions WHERE id = 'new'")).scalar()
+        assert stored == "blob"
+        sessions = {session.id: session for session in db.query(GameSessionModel).all()}
+        assert sessions["old"].game_state == '{"session_id": "old"}'
+        assert sessions["new"].game_state == game_state_json
+        db.close()